@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+import hashlib
 import json
 import time
 
@@ -13,18 +14,81 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.extract import extract_text_from_file  # noqa: E402
+from src.extract import _text_from_bytes  # noqa: E402
 from src.jds import load_jds, get_jd_by_id  # noqa: E402
-from src.score_embed import compute_embed_scores  # noqa: E402
+from src.score_embed import _get_model, compute_embed_scores, readiness, warm_up  # noqa: E402
 from src.score_stub import compute_stub_scores  # noqa: E402
 from src.schema import wrap_result, ScoreWeights  # noqa: E402
-from src.genai.suggest import generate_improvements  # noqa: E402
+from src.genai.suggest import stream_improvements  # noqa: E402
 
 
 st.set_page_config(page_title="Resume ↔ JD Matching Demo", layout="centered")
 
 DATA_DIR = Path("data")
 JDS_PATH = DATA_DIR / "jds.json"
+# Match results shared by all sessions:
+# (resume hash, JD id, JD content hash, backend, max_chars) -> core scores.
+# The JD hash covers the whole record, so editing a JD's text or skills under the same id
+# never serves a stale result.
+MATCH_CACHE_TTL = int(os.getenv("APP_MATCH_CACHE_TTL", "3600"))
+MATCH_CACHE_MAX_ENTRIES = int(os.getenv("APP_MATCH_CACHE_MAX_ENTRIES", "256"))
+
+
+# Everything below the cache decorators is shared by every session in this process;
+# a Streamlit rerun (any widget interaction) only pays a dictionary lookup.
+
+
+@st.cache_resource(show_spinner=False)
+def _start_warm_up() -> None:
+    # Load the encoder (and pre-build the JD index) once per process, off the UI thread,
+    # so the first "Match" after a restart does not pay the model load.
+    warm_up(JDS_PATH, background=True)
+
+
+@st.cache_resource(show_spinner=False)
+def _encoder():
+    return _get_model()
+
+
+@st.cache_resource(show_spinner=False)
+def _catalogue(path: str, mtime: float):
+    """JD catalogue, reloaded only when the file changes (compiled skill matchers are
+    already cached process-wide by skills.get_skill_matcher)."""
+    return load_jds(Path(path))
+
+
+@st.cache_data(show_spinner=False)
+def _read_sample(path: str) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+@st.cache_data(ttl=MATCH_CACHE_TTL, max_entries=MATCH_CACHE_MAX_ENTRIES, show_spinner=False)
+def _parse_upload(digest: str, name: str, max_chars: int, _data: bytes) -> str:
+    # `_data` is excluded from the cache key; the sha256 digest stands in for it
+    return _text_from_bytes(name, _data, max_chars=max_chars)
+
+
+@st.cache_data(ttl=MATCH_CACHE_TTL, max_entries=MATCH_CACHE_MAX_ENTRIES, show_spinner=False)
+def _match(
+    resume_hash: str,
+    jd_id: str,
+    jd_hash: str,
+    backend: str,
+    max_chars: int,
+    _resume: str,
+    _jd: dict,
+):
+    if backend.startswith("embeddings"):
+        _encoder()
+        return compute_embed_scores(_resume, _jd, top_n=3)
+    return compute_stub_scores(_resume, _jd, top_n=3)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+_start_warm_up()
 
 st.title("Resume ↔ JD Matching Demo")
 
@@ -38,7 +102,7 @@ if "last_payload" not in st.session_state:
 
 # Load JDs
 try:
-    jds = load_jds(JDS_PATH)
+    jds = _catalogue(str(JDS_PATH), JDS_PATH.stat().st_mtime)
     jd_options = [f"{jd['id']} — {jd['title']}" for jd in jds]
 except Exception as e:
     st.error(f"Failed to load JDs: {e}")
@@ -65,6 +129,13 @@ backend = st.radio(
     help="Use embeddings for real semantic similarity. Stub is fast but simplistic.",
 )
 
+state = readiness()
+if backend.startswith("Embedding") and not state["ready"]:
+    if state["error"]:
+        st.warning(f"Embedding model failed to warm up: {state['error']}")
+    else:
+        st.caption("Embedding model is warming up — the first match may take a few seconds.")
+
 weights = ScoreWeights(semantic=0.7, skills=0.3)
 
 tabs = st.tabs(["Upload file", "Try a sample"])
@@ -84,7 +155,7 @@ with tabs[1]:
     )
     sample_text = ""
     try:
-        sample_text = sample_path.read_text(encoding="utf-8")
+        sample_text = _read_sample(str(sample_path))
     except Exception:
         sample_text = "Sample file missing. Add examples/ files."
     sample_area = st.text_area("Sample resume text", value=sample_text, height=200)
@@ -103,7 +174,8 @@ if run:
     resume_text = ""
     if uploaded is not None and uploaded.size > 0:
         try:
-            resume_text = extract_text_from_file(uploaded, max_chars=int(max_chars))
+            data = uploaded.getvalue()
+            resume_text = _parse_upload(_sha256(data), uploaded.name, int(max_chars), data)
         except Exception as e:
             st.error(f"Failed to parse uploaded file: {e}")
             st.stop()
@@ -118,12 +190,18 @@ if run:
     with st.spinner("Parsing and scoring..."):
         t0 = time.perf_counter()
 
-        if backend.startswith("Embedding"):
-            core = compute_embed_scores(resume_text, jd, top_n=3)
-            backend_id = "embeddings:minilm-l6-v2"
-        else:
-            core = compute_stub_scores(resume_text, jd, top_n=3)
-            backend_id = "stub:token-overlap"
+        backend_id = (
+            "embeddings:minilm-l6-v2" if backend.startswith("Embedding") else "stub:token-overlap"
+        )
+        core = _match(
+            _sha256(resume_text.encode("utf-8")),
+            jd_id,
+            _sha256(json.dumps(jd, sort_keys=True).encode("utf-8")),  # text, skills, title
+            backend_id,
+            int(max_chars),
+            resume_text,
+            jd,
+        )
 
         elapsed_ms = int((time.perf_counter() - t0) * 1000)
 
@@ -220,14 +298,55 @@ with colB:
 ss_resume = st.session_state.get("last_resume_text")
 ss_jd = st.session_state.get("last_jd")
 
+
+def _render_suggestion(i: int, s: dict) -> None:
+    with st.container(border=True):
+        # Header line
+        top = st.columns([5, 2, 2])
+        with top[0]:
+            st.markdown(
+                f"**{i}. {s['type'].replace('_',' ').title()} → {s['target_section'].title()}**"
+            )
+        with top[1]:
+            st.markdown(
+                ":orange[**needs evidence**]" if s.get("needs_evidence") else ":green[**grounded**]"
+            )
+        with top[2]:
+            lift = s.get("est_lift", {})
+            sem = lift.get("semantic", 0.0)
+            skl = lift.get("skills", 0.0)
+            st.markdown(f"Δ semantic: **{sem:+.2f}**, Δ skills: **{skl:+.2f}**")
+
+        # Proposed rewrite
+        st.markdown("**Proposed:**")
+        st.code(s["proposed"], language="text")
+
+        # Original (optional)
+        if s.get("original"):
+            with st.expander("Original"):
+                st.code(s["original"], language="text")
+
+        # Rationale
+        st.markdown(f"**Why:** {s['rationale']}")
+
+
 # --- Run GenAI suggestion generation ---
 if run_genai:
     if not ss_resume or not ss_jd:
         st.warning("⚠️ Please run **Match** first (upload or use sample resume).")
     else:
+        st.write("### Suggestions")
+        improve_payload = {}
+        n_shown = 0
         with st.spinner("Generating GenAI improvement suggestions..."):
             try:
-                improve_payload = generate_improvements(ss_resume, ss_jd)
+                # cards render as each suggestion arrives (streamed by LocalProvider)
+                for kind, value in stream_improvements(ss_resume, ss_jd):
+                    if kind == "suggestion":
+                        n_shown += 1
+                        _render_suggestion(n_shown, value)
+                    else:
+                        improve_payload = value
             except Exception as e:
                 st.error(str(e))
                 st.info("Tip: If you see a quota or connection error, switch to another provider.")
@@ -243,39 +362,6 @@ if run_genai:
             st.info("No suggestions returned. Try switching provider or using a longer resume.")
         else:
             st.success(f"Received {len(suggestions)} suggestion(s).")
-            st.write("### Suggestions")
-
-            for i, s in enumerate(suggestions, start=1):
-                with st.container(border=True):
-                    # Header line
-                    top = st.columns([5, 2, 2])
-                    with top[0]:
-                        st.markdown(
-                            f"**{i}. {s['type'].replace('_',' ').title()} → {s['target_section'].title()}**"
-                        )
-                    with top[1]:
-                        st.markdown(
-                            ":orange[**needs evidence**]"
-                            if s.get("needs_evidence")
-                            else ":green[**grounded**]"
-                        )
-                    with top[2]:
-                        lift = s.get("est_lift", {})
-                        sem = lift.get("semantic", 0.0)
-                        skl = lift.get("skills", 0.0)
-                        st.markdown(f"Δ semantic: **{sem:+.2f}**, Δ skills: **{skl:+.2f}**")
-
-                    # Proposed rewrite
-                    st.markdown("**Proposed:**")
-                    st.code(s["proposed"], language="text")
-
-                    # Original (optional)
-                    if s.get("original"):
-                        with st.expander("Original"):
-                            st.code(s["original"], language="text")
-
-                    # Rationale
-                    st.markdown(f"**Why:** {s['rationale']}")
 
             # --- Expanders for additional info ---
             with st.expander("Gap Report"):
@@ -0,0 +1,75 @@
+"""
+Recall@K and latency of the IVF index against exact (brute-force) search.
+
+    python benchmarks/ann_recall.py [--n 100000] [--dim 384] [--lists 0] [--k 10]
+        [--probes 1,2,4,8,16,32] [--queries 200]
+
+Vectors are synthetic and clustered (unit norm, MiniLM's 384 dims by default);
+--lists 0 picks ~2*sqrt(n) cells. Exact search is one blocked matrix product per
+query batch; each IVF row reports mean recall@K and per-query latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.ann import IVFIndex, exact_search, recall_at_k  # noqa: E402
+
+
+def _data(n: int, dim: int, n_queries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(16, n // 500), dim)).astype(np.float32)
+    x = centers[rng.integers(0, len(centers), n)] + 0.35 * rng.normal(size=(n, dim))
+    q = centers[rng.integers(0, len(centers), n_queries)] + 0.35 * rng.normal(size=(n_queries, dim))
+    return x.astype(np.float32), q.astype(np.float32)
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--lists", type=int, default=0)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--probes", default="1,2,4,8,16,32")
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    x, q = _data(args.n, args.dim, args.queries)
+    n_lists = args.lists or int(2 * np.sqrt(args.n))
+
+    t0 = time.perf_counter()
+    _, rows = exact_search(x, q, k=args.k)
+    exact_ms = (time.perf_counter() - t0) * 1000 / len(q)
+    exact = [row.tolist() for row in rows]
+
+    t0 = time.perf_counter()
+    index = IVFIndex(args.dim, n_lists)
+    index.add(x)
+    build = time.perf_counter() - t0
+    index.search(q[:1], args.k)  # merge cell chunks once
+
+    print(f"{args.n} x {args.dim}, {n_lists} lists, build {build:.1f} s")
+    print(f"exact           recall@{args.k} 1.000   {exact_ms:7.3f} ms/query")
+    for p in (int(v) for v in args.probes.split(",")):
+        times, found = [], []
+        for i in range(len(q)):
+            t0 = time.perf_counter()
+            hits = index.search(q[i], args.k, n_probe=p)[0]
+            times.append(time.perf_counter() - t0)
+            found.append([h for h, _ in hits])
+        ms = statistics.median(times) * 1000
+        print(
+            f"n_probe={p:<6}  recall@{args.k} {recall_at_k(found, exact):.3f}   {ms:7.3f} ms/query"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Build time and top-K latency of the BM25 JD index on a synthetic catalogue.
+
+    python benchmarks/jd_search.py [--jds 20000] [--k 50] [--queries 200]
+
+JDs are synthesized from Zipf-distributed words (the demo vocabulary mixed into
+30k filler terms) and skills sampled from data/jds.json and the alias map; queries are examples/*.txt resumes. "search" times the
+BM25 lookup on pre-tokenized terms, "search + tokenize" includes the alias scan.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.jd_search import JDSearch, search_terms  # noqa: E402
+from src.score_stub import _tokenize  # noqa: E402
+from src.skills import load_skill_aliases  # noqa: E402
+
+
+def _catalogue(n: int, seed: int = 0):
+    """Zipf-distributed words over the demo JD/resume vocabulary plus 30k filler terms."""
+    rng = random.Random(seed)
+    base = json.loads((ROOT / "data" / "jds.json").read_text(encoding="utf-8"))
+    real = sorted(
+        set(_tokenize(" ".join(jd["text"] for jd in base)))
+        | {w for p in (ROOT / "examples").glob("*.txt") for w in _tokenize(p.read_text())}
+    )
+    vocab = [f"term{i}" for i in range(30000)] + real
+    rng.shuffle(vocab)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    skills = sorted({s for jd in base for s in jd["skills"]} | set(load_skill_aliases()))
+    return [
+        {
+            "id": f"jd-{i}",
+            "title": rng.choice(base)["title"],
+            "skills": rng.sample(skills, 5),
+            "text": " ".join(rng.choices(vocab, weights, k=80)),
+        }
+        for i in range(n)
+    ]
+
+
+def _ms(samples):
+    return f"p50 {statistics.median(samples) * 1000:.3f} ms, max {max(samples) * 1000:.3f} ms"
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--jds", type=int, default=20000)
+    ap.add_argument("--k", type=int, default=50)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    jds = _catalogue(args.jds)
+    resumes = [p.read_text(encoding="utf-8") for p in sorted((ROOT / "examples").glob("*.txt"))]
+
+    t0 = time.perf_counter()
+    index = JDSearch(jds)
+    print(f"build {len(index)} JDs: {time.perf_counter() - t0:.2f} s")
+
+    terms = [search_terms(r) for r in resumes]
+    index.search_terms(terms[0], args.k)  # compile postings once
+    lookup, full = [], []
+    for i in range(args.queries):
+        t0 = time.perf_counter()
+        index.search_terms(terms[i % len(terms)], args.k)
+        lookup.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        index.search(resumes[i % len(resumes)], args.k)
+        full.append(time.perf_counter() - t0)
+    print(f"search (top {args.k})        {_ms(lookup)}")
+    print(f"search + tokenize       {_ms(full)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Before/after prompt size (and optionally latency) for the compact GenAI prompt.
+
+    python benchmarks/prompt_compaction.py [--manifest data/data_sample.jsonl]
+        [--budget 700] [--ranker embeddings|overlap] [--provider mock|local|openai]
+
+Token counts use src.genai.compact.count_tokens. With --provider, each record is
+sent once with the full prompt and once with the compact one (response cache off)
+and the call latency and number of valid suggestions are reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.genai.analyzer import build_gap_report  # noqa: E402
+from src.genai.batch import parse_record, read_manifest  # noqa: E402
+from src.genai.compact import (  # noqa: E402
+    compact_user_prompt,
+    count_tokens,
+    embedding_relevance,
+    overlap_relevance,
+)
+from src.genai.llm import provider_from_env  # noqa: E402
+from src.genai.suggest import SYSTEM_PROMPT, TEMPERATURE, _format_user_prompt  # noqa: E402
+from src.genai.suggest import _validate_response  # noqa: E402
+
+
+def _call(provider, user: str):
+    t0 = time.perf_counter()
+    raw = provider.generate_json(SYSTEM_PROMPT, user, temperature=TEMPERATURE, max_tokens=1200)
+    try:
+        n = len(_validate_response(raw)[0])
+    except ValueError:
+        n = 0
+    return time.perf_counter() - t0, n
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--manifest", default=str(Path("data") / "data_sample.jsonl"))
+    ap.add_argument("--budget", type=int, default=700)
+    ap.add_argument("--ranker", choices=["embeddings", "overlap"], default="embeddings")
+    ap.add_argument("--provider", choices=["mock", "local", "openai"], default=None)
+    args = ap.parse_args(argv)
+
+    os.environ["GENAI_PROMPT"] = "full"
+    os.environ["GENAI_CACHE"] = "0"
+    relevance = embedding_relevance if args.ranker == "embeddings" else overlap_relevance
+    provider = None
+    if args.provider:
+        os.environ["GENAI_PROVIDER"] = args.provider
+        provider = provider_from_env()
+
+    rows = []
+    print(
+        f"{'record':<10} {'full':>6} {'compact':>8} {'saved':>6}"
+        + ("  latency full/compact  sugg" if provider else "")
+    )
+    for n, obj in read_manifest(args.manifest):
+        rid, resume_text, jd = parse_record(n, obj)
+        gap = build_gap_report(resume_text, jd)
+        full = _format_user_prompt(jd, resume_text, gap)
+        compact = compact_user_prompt(jd, resume_text, gap, budget=args.budget, relevance=relevance)
+        f_tok, c_tok = count_tokens(SYSTEM_PROMPT + full), count_tokens(SYSTEM_PROMPT + compact)
+        line = f"{rid:<10} {f_tok:>6} {c_tok:>8} {1 - c_tok / f_tok:>6.0%}"
+        row = {"full": f_tok, "compact": c_tok}
+        if provider:
+            (tf, nf), (tc, nc) = _call(provider, full), _call(provider, compact)
+            row.update(t_full=tf, t_compact=tc)
+            line += f"  {tf:7.2f}s / {tc:5.2f}s      {nf}/{nc}"
+        rows.append(row)
+        print(line)
+
+    tot_f = sum(r["full"] for r in rows)
+    tot_c = sum(r["compact"] for r in rows)
+    print(f"{'total':<10} {tot_f:>6} {tot_c:>8} {1 - tot_c / tot_f:>6.0%}")
+    if provider:
+        print(
+            f"median latency: full {statistics.median(r['t_full'] for r in rows):.2f}s, "
+            f"compact {statistics.median(r['t_compact'] for r in rows):.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Pairs/second of the vectorized stub backend vs. the per-pair loop.
+
+    python benchmarks/stub_matrix.py [--resumes 2000] [--jds 50] [--loop-sample 200]
+
+Resumes and JDs are synthesized by shuffling sentences of examples/*.txt and
+data/jds.json. The per-pair numbers (score_stub.compute_stub_scores and the
+plain _jaccard loop) are measured on --loop-sample resumes and extrapolated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.score_stub import _jaccard, _split_sentences, _tokenize, compute_stub_scores  # noqa: E402
+from src.stub_matrix import StubMatrix  # noqa: E402
+
+
+def _corpus(n_resumes: int, n_jds: int, seed: int = 0):
+    rng = random.Random(seed)
+    base_jds = json.loads((ROOT / "data" / "jds.json").read_text(encoding="utf-8"))
+    lines = [
+        line.strip()
+        for p in sorted((ROOT / "examples").glob("*.txt"))
+        for line in p.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    jd_sentences = [s for jd in base_jds for s in _split_sentences(jd["text"])]
+    resumes = [" ".join(rng.sample(lines, min(len(lines), 25))) for _ in range(n_resumes)]
+    jds = []
+    for i in range(n_jds):
+        jd = dict(base_jds[i % len(base_jds)], id=f"jd-{i}")
+        jd["text"] = " ".join(rng.sample(jd_sentences, min(len(jd_sentences), 8)))
+        jds.append(jd)
+    return resumes, jds
+
+
+def _rate(pairs: int, seconds: float) -> str:
+    return f"{pairs / seconds:>12,.0f} pairs/s"
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--resumes", type=int, default=2000)
+    ap.add_argument("--jds", type=int, default=50)
+    ap.add_argument("--loop-sample", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    resumes, jds = _corpus(args.resumes, args.jds)
+    sample = resumes[: args.loop_sample]
+
+    t0 = time.perf_counter()
+    sm = StubMatrix(jds)
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sm.jaccard(resumes)
+    matrix = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for r in sample:
+        toks = _tokenize(r)
+        for jd in jds:
+            _jaccard(toks, _tokenize(jd["text"]))
+    loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sm.score(sample)
+    full_matrix = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for r in sample:
+        for jd in jds:
+            compute_stub_scores(r, jd)
+    full_loop = time.perf_counter() - t0
+
+    n, m, k = len(resumes), len(jds), len(sample)
+    print(f"{n} resumes x {m} JDs, vocab {len(sm.vocab)}, {len(sm.sentences)} JD sentences")
+    print(f"build StubMatrix             {build * 1000:8.1f} ms")
+    print(f"Jaccard matrix               {_rate(n * m, matrix)}")
+    print(f"Jaccard per-pair loop        {_rate(k * m, loop)}")
+    print(f"full results, StubMatrix     {_rate(k * m, full_matrix)}")
+    print(f"full results, per pair       {_rate(k * m, full_loop)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from src.jd_index import _tmp_path
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    if x.ndim == 1:
+        x = x[None, :]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.where(norms == 0, 1.0, norms)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first."""
+    if len(scores) > k:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def exact_search(
+    vectors: np.ndarray, queries: np.ndarray, k: int = 10, block_size: int = 4096
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Brute-force cosine top-k: (scores, row indices), each (n_queries, k)."""
+    vectors, queries = _normalize(vectors), _normalize(queries)
+    k = min(k, len(vectors))
+    best_s = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_i = np.zeros((len(queries), k), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        sims = queries @ vectors[start : start + block_size].T
+        s = np.concatenate([best_s, sims], axis=1)
+        i = np.concatenate(
+            [best_i, np.broadcast_to(np.arange(start, start + sims.shape[1]), sims.shape)], axis=1
+        )
+        order = np.argsort(-s, axis=1, kind="stable")[:, :k]
+        best_s, best_i = np.take_along_axis(s, order, 1), np.take_along_axis(i, order, 1)
+    return best_s, best_i
+
+
+def kmeans(
+    x: np.ndarray, n_clusters: int, *, n_iter: int = 20, seed: int = 0, block_size: int = 8192
+) -> np.ndarray:
+    """
+    Spherical k-means on L2-normalized rows (assignment by max cosine, centroids
+    re-normalized); empty clusters are re-seeded from random points.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = _assign(x, centroids, block_size)
+        order = np.argsort(assign, kind="stable")
+        cells, starts = np.unique(assign[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[cells] = np.add.reduceat(x[order], starts, axis=0)
+        empty = np.setdiff1d(np.arange(n_clusters), cells)
+        if len(empty):
+            sums[empty] = x[rng.choice(len(x), len(empty), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def _assign(x: np.ndarray, centroids: np.ndarray, block_size: int = 8192) -> np.ndarray:
+    out = np.empty(len(x), dtype=np.int64)
+    for start in range(0, len(x), block_size):
+        out[start : start + block_size] = np.argmax(
+            x[start : start + block_size] @ centroids.T, axis=1
+        )
+    return out
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index for cosine similarity over embedding vectors
+    (e.g. score_embed.embed_texts output).
+
+    A spherical k-means coarse quantizer splits the corpus into n_lists cells;
+    a query is compared with the centroids and then only with the vectors of its
+    n_probe closest cells. n_probe is the recall/latency knob: n_probe == n_lists
+    is exact search, small values scan ~n_probe/n_lists of the corpus.
+    """
+
+    def __init__(self, dim: int, n_lists: int = 256, *, n_probe: int = 8, seed: int = 0):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.centroids: np.ndarray | None = None
+        self._lists: List[List[np.ndarray]] = [[] for _ in range(n_lists)]
+        self._list_ids: List[List[np.ndarray]] = [[] for _ in range(n_lists)]
+        self.ids: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray, *, n_iter: int = 10, max_points: int = 64) -> None:
+        """Fit the coarse quantizer on (a sample of at most max_points per list of) vectors."""
+        x = _normalize(vectors)
+        if len(x) < self.n_lists:
+            raise ValueError(f"need at least n_lists={self.n_lists} vectors to train")
+        rng = np.random.default_rng(self.seed)
+        if len(x) > max_points * self.n_lists:
+            x = x[rng.choice(len(x), max_points * self.n_lists, replace=False)]
+        self.centroids = kmeans(x, self.n_lists, n_iter=n_iter, seed=self.seed)
+
+    def add(self, vectors: np.ndarray, ids: Iterable[Any] | None = None) -> None:
+        """Append vectors (trained on them first if the index is untrained)."""
+        x = _normalize(vectors)
+        if x.shape[1] != self.dim:
+            raise ValueError(f"expected dim {self.dim}, got {x.shape[1]}")
+        if not self.is_trained:
+            self.train(x)
+        ids = list(ids) if ids is not None else list(range(len(self.ids), len(self.ids) + len(x)))
+        if len(ids) != len(x):
+            raise ValueError("ids and vectors differ in length")
+        rows = np.arange(len(self.ids), len(self.ids) + len(x))
+        self.ids.extend(ids)
+        assign = _assign(x, self.centroids)
+        order = np.argsort(assign, kind="stable")
+        cells, starts = np.unique(assign[order], return_index=True)
+        for cell, chunk in zip(cells, np.split(order, starts[1:])):
+            self._lists[cell].append(x[chunk])
+            self._list_ids[cell].append(rows[chunk])
+
+    def _cell(self, cell: int) -> Tuple[np.ndarray, np.ndarray]:
+        # merge appended chunks on first read so later searches touch one array per cell
+        if len(self._lists[cell]) > 1:
+            self._lists[cell] = [np.concatenate(self._lists[cell])]
+            self._list_ids[cell] = [np.concatenate(self._list_ids[cell])]
+        if not self._lists[cell]:
+            return np.empty((0, self.dim), np.float32), np.empty(0, np.int64)
+        return self._lists[cell][0], self._list_ids[cell][0]
+
+    def search(
+        self, queries: np.ndarray, k: int = 10, *, n_probe: int | None = None
+    ) -> List[List[Tuple[Any, float]]]:
+        """Per query, up to k (id, cosine) pairs, best first."""
+        if not self.is_trained:
+            return [[] for _ in range(len(np.atleast_2d(queries)))]
+        q = _normalize(queries)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        coarse = q @ self.centroids.T
+        out = []
+        for qi in range(len(q)):
+            cells = _top_k(coarse[qi], n_probe)
+            parts = [self._cell(int(c)) for c in cells]
+            vecs = np.concatenate([v for v, _ in parts])
+            rows = np.concatenate([r for _, r in parts])
+            sims = vecs @ q[qi]
+            best = _top_k(sims, k)
+            out.append([(self.ids[rows[i]], float(sims[i])) for i in best])
+        return out
+
+    # ---- persistence ----
+
+    def save(self, path: str | Path) -> None:
+        """One .npz: config, centroids, vectors grouped by cell and the id list."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cells = [self._cell(c) for c in range(self.n_lists)]
+        sizes = np.array([len(r) for _, r in cells], dtype=np.int64)
+        tmp = _tmp_path(path)
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                config=np.array([self.dim, self.n_lists, self.n_probe, self.seed], dtype=np.int64),
+                centroids=(
+                    self.centroids if self.is_trained else np.empty((0, self.dim), dtype=np.float32)
+                ),
+                vectors=np.concatenate([v for v, _ in cells]),
+                rows=np.concatenate([r for _, r in cells]),
+                sizes=sizes,
+                ids=np.array(json.dumps(self.ids)),  # JSON, so load() never unpickles
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "IVFIndex":
+        with np.load(path) as data:
+            dim, n_lists, n_probe, seed = (int(v) for v in data["config"])
+            index = cls(dim, n_lists, n_probe=n_probe, seed=seed)
+            if len(data["centroids"]):
+                index.centroids = data["centroids"]
+            index.ids = json.loads(str(data["ids"]))
+            bounds = np.concatenate([[0], np.cumsum(data["sizes"])])
+            vectors, rows = data["vectors"], data["rows"]
+            for c in range(n_lists):
+                lo, hi = bounds[c], bounds[c + 1]
+                if hi > lo:
+                    index._lists[c] = [vectors[lo:hi]]
+                    index._list_ids[c] = [rows[lo:hi]]
+        return index
+
+
+def recall_at_k(approx: Sequence[Sequence[Any]], exact: Sequence[Sequence[Any]]) -> float:
+    """Mean share of the exact top-k ids that the approximate search returned."""
+    if not exact:
+        return 0.0
+    return float(np.mean([len(set(a) & set(e)) / max(1, len(e)) for a, e in zip(approx, exact)]))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Request-coalescing scheduler: items submitted from many threads are gathered for
+    up to max_wait_ms (or until max_batch items) and handed to `fn` as one list.
+    `fn` must return one result per item, in order; each caller gets its own Future.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        *,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        self._q: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        fut: Future = Future()
+        self._q.put((item, fut))
+        return fut
+
+    def __call__(self, item: Any, timeout: float | None = None) -> Any:
+        """Submit and wait for the result."""
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect(self, first: Tuple[Any, Future]) -> Tuple[List[Tuple[Any, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                nxt = self._q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if nxt is _STOP:
+                return batch, True
+            batch.append(nxt)
+        return batch, False
+
+    def _loop(self) -> None:
+        while True:
+            first = self._q.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(first)
+            items = [item for item, _ in batch]
+            try:
+                results = list(self.fn(items))
+                if len(results) != len(batch):
+                    raise ValueError(f"fn returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+            else:
+                for (_, fut), res in zip(batch, results):
+                    fut.set_result(res)
+            self.batches += 1
+            self.items += len(batch)
+            if stop:
+                return
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self._q.put(_STOP)
+        self._thread.join(timeout=timeout)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from src.jd_index import JDIndex
+from src.score_embed import _split_sentences, rank_jds
+from src.stub_matrix import StubMatrix
+
+CASCADE_BACKEND_ID = "cascade:stub+minilm-l6-v2"
+
+
+def _n_keep(n: int, keep_top: int | None, keep_fraction: float | None, top_k: int) -> int:
+    """Survivor count: keep_top JDs or keep_fraction in (0, 1] of the catalogue."""
+    if keep_top is not None and keep_fraction is not None:
+        raise ValueError("pass keep_top or keep_fraction, not both")
+    if keep_top is not None:
+        wanted = int(keep_top)
+    else:
+        fraction = 0.25 if keep_fraction is None else float(keep_fraction)
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError(f"keep_fraction must be in (0, 1], got {fraction}")
+        wanted = math.ceil(fraction * n)
+    return min(n, max(wanted, top_k))
+
+
+def ranking_change(cascade: List[str], full: List[str], top_k: int) -> Dict:
+    """How the cascade's top-k differs from full embedding scoring's."""
+    full_top, pos = full[:top_k], {jd_id: i for i, jd_id in enumerate(full)}
+    shifts = [abs(i - pos[jd_id]) for i, jd_id in enumerate(cascade) if jd_id in pos]
+    return {
+        "overlap_at_k": round(len(set(cascade) & set(full_top)) / max(1, len(full_top)), 4),
+        "top1_same": bool(cascade and full and cascade[0] == full[0]),
+        "mean_rank_shift": round(float(np.mean(shifts)), 4) if shifts else 0.0,
+        "missed": [jd_id for jd_id in full_top if jd_id not in cascade],
+    }
+
+
+def cascade_rank(
+    resume_text: str,
+    jds: List[Dict],
+    top_k: int = 5,
+    top_n: int = 3,
+    *,
+    keep_top: int | None = None,
+    keep_fraction: float | None = None,
+    min_stub_score: float | None = None,
+    stub: StubMatrix | None = None,
+    jd_index: JDIndex | None = None,
+    resume_vec: np.ndarray | None = None,
+    compare: bool = False,
+) -> Dict:
+    """
+    Two-stage ranking of a JD catalogue for one resume.
+
+    Stage 1 scores every JD with the stub backend (token Jaccard + skills coverage,
+    same formula as compute_stub_scores, via StubMatrix.overall). The best
+    keep_top JDs, or keep_fraction of the catalogue (default 0.25), survive (never
+    fewer than top_k); with min_stub_score, survivors below it are dropped as
+    well, down to top_k. Stage 2 runs the embedding scorer
+    (score_embed.rank_jds) on the survivors only.
+
+    Returns {"results": top_k core dicts, best first, "stats": {...}}. The stats
+    count the JDs (and JD sentences) that were never embedded and, with
+    compare=True, how the ranking differs from full embedding scoring (which is
+    then also run, so only use it for evaluation).
+    """
+    if not jds or top_k <= 0:
+        return {"results": [], "stats": {"jds_total": len(jds)}}
+    t0 = time.perf_counter()
+    stub = stub or StubMatrix(jds)
+    stub_scores = stub.overall([resume_text])[0]
+    order = np.argsort(-stub_scores, kind="stable")
+    survivors = order[: _n_keep(len(jds), keep_top, keep_fraction, top_k)]
+    if min_stub_score is not None:  # survivors are sorted, so the passing ones are a prefix
+        n_pass = int((stub_scores[survivors] >= min_stub_score).sum())
+        survivors = survivors[: max(top_k, n_pass)]
+    t1 = time.perf_counter()
+
+    kept = [jds[i] for i in survivors]
+    results = rank_jds(
+        resume_text, kept, top_k=top_k, top_n=top_n, jd_index=jd_index, resume_vec=resume_vec
+    )
+    t2 = time.perf_counter()
+
+    skipped = [jds[i] for i in order[len(survivors) :]]
+    stats = {
+        "jds_total": len(jds),
+        "jds_reranked": len(kept),
+        "jds_skipped": len(skipped),
+        "skipped_fraction": round(len(skipped) / len(jds), 4),
+        "jd_sentences_skipped": sum(len(_split_sentences(jd.get("text", ""))) for jd in skipped),
+        "prefilter_ms": round((t1 - t0) * 1000, 3),
+        "rerank_ms": round((t2 - t1) * 1000, 3),
+    }
+    if compare:
+        full = rank_jds(
+            resume_text,
+            jds,
+            top_k=len(jds),
+            top_n=top_n,
+            jd_index=jd_index,
+            resume_vec=resume_vec,
+        )
+        stats["full_ms"] = round((time.perf_counter() - t2) * 1000, 3)
+        stats.update(
+            ranking_change([r["jd_id"] for r in results], [r["jd_id"] for r in full], top_k)
+        )
+    return {"results": results, "stats": stats}
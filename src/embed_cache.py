@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+def make_key(model_id: str, params: str, text: str) -> str:
+    """Content address for an embedding: (model id, chunking params, text hash)."""
+    h = hashlib.sha256()
+    h.update(f"{model_id}\x1f{params}\x1f".encode("utf-8"))
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache.
+    - memory: LRU bounded by total array bytes (max_bytes)
+    - disk (optional): SQLite table of float32 blobs that survives restarts;
+      disk hits are promoted back into memory. max_rows / max_age (seconds)
+      bound it: rows older than max_age are dropped and, past max_rows, the
+      oldest-written rows go first.
+    Cached arrays are read-only; callers must copy before mutating.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: str | Path | None = None,
+        *,
+        max_rows: int | None = None,
+        max_age: float | None = None,
+    ):
+        self.max_bytes = int(max_bytes)
+        self.max_rows = max_rows or None
+        self.max_age = max_age or None
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        self._db: sqlite3.Connection | None = None
+        if disk_path:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(embeddings)")}
+            if "created" not in columns:  # tables written before the disk tier was bounded
+                self._db.execute(
+                    "ALTER TABLE embeddings ADD COLUMN created REAL NOT NULL DEFAULT 0"
+                )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_created ON embeddings (created)"
+            )
+            self._evict_disk()
+            self._db.commit()
+
+    # ---- memory tier ----
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        if vec.nbytes > self.max_bytes:
+            return
+        self._mem[key] = vec
+        self._bytes += vec.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._mem.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    # ---- disk tier ----
+    def _evict_disk(self) -> None:
+        """Apply max_age / max_rows to the SQLite table (caller commits)."""
+        removed = 0
+        if self.max_age is not None:
+            removed += self._db.execute(
+                "DELETE FROM embeddings WHERE created < ?", (time.time() - self.max_age,)
+            ).rowcount
+        if self.max_rows is not None:
+            removed += self._db.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY created DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            ).rowcount
+        self.disk_evictions += removed
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            vec = self._mem.get(key)
+            if vec is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return vec
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT vec FROM embeddings WHERE key = ? AND created >= ?",
+                    (key, time.time() - self.max_age if self.max_age is not None else 0.0),
+                ).fetchone()
+                if row is not None:
+                    vec = np.frombuffer(row[0], dtype=np.float32)
+                    self._remember(key, vec)
+                    self.disk_hits += 1
+                    return vec
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vec: np.ndarray) -> np.ndarray:
+        return self.put_many([(key, vec)])[0]
+
+    def put_many(self, items: Iterable[Tuple[str, np.ndarray]]) -> List[np.ndarray]:
+        """Store (key, vector) pairs with one SQLite transaction; returns the cached arrays."""
+        out = []
+        for key, vec in items:
+            vec = np.array(vec, dtype=np.float32)
+            vec.flags.writeable = False
+            out.append((key, vec))
+        with self._lock:
+            for key, vec in out:
+                self._remember(key, vec)
+            if self._db is not None and out:
+                now = time.time()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec, created) VALUES (?, ?, ?)",
+                    [(key, vec.tobytes(), now) for key, vec in out],
+                )
+                self._evict_disk()
+                self._db.commit()
+        return [vec for _, vec in out]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "entries": len(self._mem),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Pooled, L2-normalized outputs stay within these cosine tolerances of the torch
+# backend (checked by `python -m src.encoders check`).
+TOLERANCE = {"onnx": 0.9999, "onnx-int8": 0.98}
+
+
+def _repo_root() -> Path:
+    # .../src/encoders.py -> repo root
+    return Path(__file__).resolve().parents[1]
+
+
+def encoder_backend() -> str:
+    """
+    EMBED_BACKEND: 'torch' | 'onnx' | 'onnx-int8' (default: torch)
+    """
+    which = os.getenv("EMBED_BACKEND", "torch").lower().strip()
+    if which not in BACKENDS:
+        raise ValueError(f"Unknown EMBED_BACKEND {which!r}; expected one of {', '.join(BACKENDS)}.")
+    return which
+
+
+def onnx_dir(model_name: str = MODEL_NAME) -> Path:
+    """
+    EMBED_ONNX_DIR overrides where exported models live (default: <repo>/.cache/onnx/<model>).
+    """
+    env = os.getenv("EMBED_ONNX_DIR")
+    return Path(env) if env else _repo_root() / ".cache" / "onnx" / model_name
+
+
+def _load_onnxruntime():
+    try:
+        import onnxruntime
+
+        return onnxruntime
+    except Exception as e:
+        raise RuntimeError("ONNX Runtime not installed. Run: pip install onnxruntime") from e
+
+
+def _with_specials(tokenizer: Any, ids: List[int]) -> List[int]:
+    cls_id, sep_id = tokenizer.cls_token_id, tokenizer.sep_token_id
+    return (
+        ([cls_id] if cls_id is not None else [])
+        + list(ids)
+        + ([sep_id] if sep_id is not None else [])
+    )
+
+
+def _pad(seqs: List[List[int]], pad_id: int):
+    width = max(len(s) for s in seqs)
+    input_ids = np.full((len(seqs), width), pad_id, dtype=np.int64)
+    attention_mask = np.zeros((len(seqs), width), dtype=np.int64)
+    for i, seq in enumerate(seqs):
+        input_ids[i, : len(seq)] = seq
+        attention_mask[i, : len(seq)] = 1
+    return input_ids, attention_mask
+
+
+def n_special_tokens(tokenizer: Any) -> int:
+    return len(_with_specials(tokenizer, []))
+
+
+def encode_token_ids(model: Any, id_chunks: List[List[int]], batch_size: int = 32) -> np.ndarray:
+    """
+    Encode chunks that are already token ids (without special tokens) and return
+    L2-normalized pooled embeddings. Works for OnnxEncoder and SentenceTransformer.
+    """
+    if hasattr(model, "encode_ids"):
+        embs = model.encode_ids(id_chunks, batch_size=batch_size)
+    else:
+        import torch
+
+        tokenizer = model.tokenizer
+        out = []
+        for i in range(0, len(id_chunks), batch_size):
+            seqs = [_with_specials(tokenizer, ids) for ids in id_chunks[i : i + batch_size]]
+            input_ids, attention_mask = _pad(seqs, tokenizer.pad_token_id or 0)
+            features = {
+                "input_ids": torch.from_numpy(input_ids).to(model.device),
+                "attention_mask": torch.from_numpy(attention_mask).to(model.device),
+                "token_type_ids": torch.zeros_like(torch.from_numpy(input_ids)).to(model.device),
+            }
+            with torch.no_grad():
+                out.append(model(features)["sentence_embedding"].float().cpu().numpy())
+        embs = np.concatenate(out)
+    embs = np.asarray(embs, dtype=np.float32)
+    return embs / (np.linalg.norm(embs, axis=1, keepdims=True) + 1e-12)
+
+
+class OnnxEncoder:
+    """
+    Runs a MiniLM transformer exported to ONNX through ONNX Runtime (CPU).
+    Exposes the subset of the SentenceTransformer API the scorers use: encode(),
+    get_sentence_embedding_dimension(), tokenizer and max_seq_length.
+    Pooling matches sentence-transformers: attention-masked mean over token states.
+    """
+
+    def __init__(self, model_path: str | Path, tokenizer: Any, max_seq_length: int = 256):
+        ort = _load_onnxruntime()
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        if isinstance(tokenizer, (str, Path)):
+            from transformers import AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(str(tokenizer))
+        self.model_path = Path(model_path)
+        self.tokenizer = tokenizer
+        self.max_seq_length = max_seq_length
+        self._inputs = [i.name for i in self.session.get_inputs()]
+        self._dim: int | None = None
+
+    def _run(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        feeds: Dict[str, np.ndarray] = {}
+        for name in self._inputs:
+            if name == "input_ids":
+                feeds[name] = input_ids.astype(np.int64)
+            elif name == "attention_mask":
+                feeds[name] = attention_mask.astype(np.int64)
+            elif name == "token_type_ids":
+                feeds[name] = np.zeros_like(input_ids, dtype=np.int64)
+        hidden = self.session.run(None, feeds)[0]  # (batch, seq, dim)
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (hidden * mask).sum(axis=1)
+        return (summed / np.clip(mask.sum(axis=1), 1e-9, None)).astype(np.float32)
+
+    def encode(
+        self,
+        sentences: List[str],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        out = []
+        for i in range(0, len(sentences), batch_size):
+            enc = self.tokenizer(
+                list(sentences[i : i + batch_size]),
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            out.append(self._run(enc["input_ids"], enc["attention_mask"]))
+        embs = (
+            np.concatenate(out) if out else np.zeros((0, self.get_sentence_embedding_dimension()))
+        )
+        if normalize_embeddings:
+            embs = embs / (np.linalg.norm(embs, axis=1, keepdims=True) + 1e-12)
+        return embs.astype(np.float32)
+
+    def encode_ids(self, id_chunks: List[List[int]], batch_size: int = 32) -> np.ndarray:
+        """Encode pre-tokenized chunks (no special tokens) without re-tokenizing."""
+        out = []
+        for i in range(0, len(id_chunks), batch_size):
+            seqs = [_with_specials(self.tokenizer, ids) for ids in id_chunks[i : i + batch_size]]
+            input_ids, attention_mask = _pad(seqs, self.tokenizer.pad_token_id or 0)
+            out.append(self._run(input_ids, attention_mask))
+        return (
+            np.concatenate(out) if out else np.zeros((0, self.get_sentence_embedding_dimension()))
+        )
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dim is None:
+            self._dim = int(self._run(np.zeros((1, 1)), np.ones((1, 1))).shape[1])
+        return self._dim
+
+
+def export_onnx(out_dir: Path | None = None, model_name: str = MODEL_NAME) -> Path:
+    """
+    Export the torch MiniLM transformer to <out_dir>/model.onnx and save its tokenizer
+    next to it. Needs the torch backend (and the model download) once.
+    """
+    import torch
+
+    out_dir = Path(out_dir or onnx_dir(model_name))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0].auto_model.eval()
+    st.tokenizer.save_pretrained(str(out_dir))
+
+    enc = st.tokenizer(["export sample"], return_tensors="pt")
+    dyn = {0: "batch", 1: "seq"}
+    path = out_dir / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            (enc["input_ids"], enc["attention_mask"], enc["token_type_ids"]),
+            str(path),
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": dyn,
+                "attention_mask": dyn,
+                "token_type_ids": dyn,
+                "last_hidden_state": dyn,
+            },
+            opset_version=14,
+        )
+    return path
+
+
+def quantize_onnx(src: Path, dst: Path) -> Path:
+    """Dynamic (weight-only) int8 quantization of an exported model."""
+    _load_onnxruntime()
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(src), str(dst), weight_type=QuantType.QInt8)
+    return dst
+
+
+def load_encoder(backend: str = "torch", model_name: str = MODEL_NAME):
+    """
+    Build the encoder for a backend. ONNX models are exported (and quantized) on
+    first use when they are not in onnx_dir() yet.
+    """
+    if backend == "torch":
+        # Fast, small, great baseline. Downloads once to cache.
+        return SentenceTransformer(model_name)  # ~80MB
+
+    base = onnx_dir(model_name)
+    fp32 = base / "model.onnx"
+    if not fp32.exists():
+        export_onnx(base, model_name)
+    path = fp32
+    if backend == "onnx-int8":
+        path = base / "model.int8.onnx"
+        if not path.exists():
+            quantize_onnx(fp32, path)
+    return OnnxEncoder(path, base)
+
+
+def compare_backends(texts: List[str], backend: str, model_name: str = MODEL_NAME) -> float:
+    """Minimum cosine between torch and `backend` embeddings over texts."""
+    ref = load_encoder("torch", model_name).encode(texts, normalize_embeddings=True)
+    got = load_encoder(backend, model_name).encode(texts, normalize_embeddings=True)
+    return float(np.min(np.sum(ref * got, axis=1)))
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Export/check ONNX encoder backends.")
+    ap.add_argument("command", choices=["export", "check"])
+    ap.add_argument("--backend", choices=BACKENDS[1:], default="onnx-int8")
+    args = ap.parse_args(argv)
+
+    if args.command == "export":
+        print(load_encoder(args.backend).model_path)
+        return
+    sample = (Path(_repo_root()) / "examples" / "sample_resume_backend.txt").read_text("utf-8")
+    texts = [sample] + [line for line in sample.splitlines() if line.strip()]
+    cos = compare_backends(texts, args.backend)
+    ok = cos >= TOLERANCE[args.backend]
+    print(f"{args.backend}: min cosine vs torch = {cos:.5f} ({'ok' if ok else 'OUT OF TOLERANCE'})")
+
+
+if __name__ == "__main__":
+    main()
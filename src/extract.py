@@ -1,11 +1,23 @@
 import io
+import math
 import re
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
 
 import pdfplumber
 from docx import Document
 
 
 MAX_DEFAULT = 10_000
+# Pages per pool task when max_chars may stop extraction early: fewer tasks (and
+# copies of the PDF sent to workers) vs. pages extracted past the stop point.
+PDF_PAGES_PER_TASK = 4
+
+_PDF_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_PDF_POOL_LOCK = threading.Lock()
 
 
 def _normalize(text: str, max_chars: int = MAX_DEFAULT) -> str:
@@ -14,12 +26,105 @@ def _normalize(text: str, max_chars: int = MAX_DEFAULT) -> str:
     return text[:max_chars]
 
 
-def _read_pdf_bytes(b: bytes) -> str:
+def _extract_pages(b: bytes, indices: List[int]) -> List[Tuple[int, str, float]]:
+    """(page index, text, seconds) for the given pages. Top-level so it pickles."""
     out = []
     with pdfplumber.open(io.BytesIO(b)) as pdf:
-        for page in pdf.pages:
+        for i in indices:
+            t0 = time.perf_counter()
+            page = pdf.pages[i]
             t = page.extract_text() or ""
-            out.append(t)
+            page.flush_cache()
+            out.append((i, t, time.perf_counter() - t0))
+    return out
+
+
+def _pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process-wide pool for PDF pages, one per worker count. Pools are never shut
+    down here (another thread may still be submitting to one); worker counts come
+    from a small set of settings, and the executor cleans up at interpreter exit.
+    """
+    with _PDF_POOL_LOCK:
+        pool = _PDF_POOLS.get(workers)
+        if pool is None:
+            pool = _PDF_POOLS[workers] = ProcessPoolExecutor(workers)
+        return pool
+
+
+def _pdf_page_count(b: bytes) -> int:
+    with pdfplumber.open(io.BytesIO(b)) as pdf:
+        return len(pdf.pages)
+
+
+def _read_pdf_bytes(
+    b: bytes,
+    max_chars: int | None = None,
+    *,
+    workers: int = 0,
+    executor: Executor | None = None,
+    stats: Dict | None = None,
+) -> str:
+    """
+    Extract page text in order and stop as soon as the normalized text reaches
+    max_chars (None = every page). Whitespace collapses across page breaks, so
+    the normalized prefix never changes once it has been reached.
+
+    workers > 0 extracts pages in a process pool (a shared one, or `executor`,
+    whose size workers must then give; default 1). Each task gets a contiguous
+    range of pages, so the PDF bytes are sent once per task rather than per page:
+    without max_chars the pages are split evenly across the workers, otherwise
+    waves of `workers` tasks of PDF_PAGES_PER_TASK pages run until the early stop.
+    stats, if given, is filled with pages_total / pages_read / seconds / page_seconds.
+    """
+    t0 = time.perf_counter()
+    out: List[str] = []
+    page_seconds: List[float] = []
+    n_chars = 0
+
+    def take(text: str, seconds: float) -> bool:
+        nonlocal n_chars
+        out.append(text)
+        page_seconds.append(round(seconds, 4))
+        norm = _normalize(text, max_chars=len(text))
+        if norm:
+            n_chars += len(norm) + (1 if n_chars else 0)  # +1: the joining space
+        return max_chars is not None and n_chars >= max_chars
+
+    if workers <= 0 and executor is None:
+        with pdfplumber.open(io.BytesIO(b)) as pdf:
+            n_pages = len(pdf.pages)
+            for page in pdf.pages:
+                t1 = time.perf_counter()
+                text = page.extract_text() or ""
+                page.flush_cache()
+                if take(text, time.perf_counter() - t1):
+                    break
+    else:
+        n_pages = _pdf_page_count(b)
+        workers = max(1, workers)
+        pool = executor or _pdf_pool(workers)
+        per_task = max(1, math.ceil(n_pages / workers))
+        if max_chars is not None:
+            per_task = min(per_task, PDF_PAGES_PER_TASK)
+        wave = workers * per_task
+        for start in range(0, n_pages, wave):
+            futures = [
+                pool.submit(_extract_pages, b, list(range(lo, min(lo + per_task, n_pages))))
+                for lo in range(start, min(start + wave, n_pages), per_task)
+            ]
+            pages = [page for fut in futures for page in fut.result()]
+            # keep every page of the wave (already paid for), then stop
+            if any([take(text, seconds) for _, text, seconds in pages]):
+                break
+
+    if stats is not None:
+        stats.update(
+            pages_total=n_pages,
+            pages_read=len(page_seconds),
+            seconds=round(time.perf_counter() - t0, 4),
+            page_seconds=page_seconds,
+        )
     return "\n".join(out)
 
 
@@ -36,15 +141,46 @@ def _read_txt_bytes(b: bytes) -> str:
         return b.decode("latin-1", errors="ignore")
 
 
-def extract_text_from_file(uploaded_file, max_chars: int = MAX_DEFAULT) -> str:
+def extract_text_from_file(
+    uploaded_file, max_chars: int = MAX_DEFAULT, *, pdf_workers: int = 0, stats: Dict | None = None
+) -> str:
     """
     uploaded_file: streamlit UploadedFile (has .name, .type, .read()) or a similar object.
+    PDFs stop parsing once max_chars is reached; pdf_workers > 0 extracts pages in a
+    process pool. Pass a dict as stats to get per-page timings for PDFs.
     """
-    name = (uploaded_file.name or "").lower()
-    b = uploaded_file.read()
+    return _text_from_bytes(
+        uploaded_file.name or "",
+        uploaded_file.read(),
+        max_chars=max_chars,
+        pdf_workers=pdf_workers,
+        stats=stats,
+    )
+
+
+def extract_text_from_path(
+    path, max_chars: int = MAX_DEFAULT, *, pdf_workers: int = 0, stats: Dict | None = None
+) -> str:
+    """
+    Same as extract_text_from_file, for a file on disk (str or Path).
+    """
+    p = Path(path)
+    return _text_from_bytes(
+        p.name, p.read_bytes(), max_chars=max_chars, pdf_workers=pdf_workers, stats=stats
+    )
+
 
+def _text_from_bytes(
+    name: str,
+    b: bytes,
+    max_chars: int = MAX_DEFAULT,
+    *,
+    pdf_workers: int = 0,
+    stats: Dict | None = None,
+) -> str:
+    name = name.lower()
     if name.endswith(".pdf"):
-        text = _read_pdf_bytes(b)
+        text = _read_pdf_bytes(b, max_chars, workers=pdf_workers, stats=stats)
     elif name.endswith(".docx"):
         text = _read_docx_bytes(b)
     elif name.endswith(".txt"):
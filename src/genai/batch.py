@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from src.genai.analyzer import build_gap_report
+from src.genai.llm import LLMProvider, provider_from_env
+from src.genai.suggest import _pair_payload, request_pairs
+from src.jds import load_jds
+
+# The prompt layout written by suggest._format_user_prompt (and used in data/data.jsonl).
+_PROMPT_RE = re.compile(
+    r"JD_TITLE:[ \t]*(?P<title>.*?)\n+JD_TEXT:[ \t]*\n(?P<text>.*?)\n+"
+    r"JD_SKILLS:[ \t]*(?P<skills>.*?)\n+RESUME_SECTIONS:[ \t]*\n(?P<resume>.*?)\n+GAP_REPORT",
+    re.DOTALL,
+)
+
+
+def read_manifest(path: str | Path) -> Iterator[Tuple[int, Dict[str, Any] | ValueError]]:
+    """
+    Yield (line number, record) for each JSON object line. Trailing characters
+    after the object (e.g. the stray '}' in data/data.jsonl) are ignored. A line
+    that is not valid JSON or not an object yields a ValueError in place of the
+    record (parse_record raises it), so one bad line never stops the iteration.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj, _ = decoder.raw_decode(line)
+            except ValueError as e:
+                yield n, ValueError(f"line {n} is not valid JSON: {e}")
+                continue
+            if not isinstance(obj, dict):
+                yield n, ValueError(f"line {n} is not a JSON object: {type(obj).__name__}")
+                continue
+            yield n, obj
+
+
+def parse_record(
+    n: int, obj: Dict[str, Any] | Exception, jds_by_id: Dict[str, Dict] | None = None
+) -> Tuple[str, str, Dict]:
+    """
+    (record id, resume text, jd) from a manifest record. Accepted shapes:
+    - {"prompt": ...} in the data/data.jsonl layout (JD and resume are parsed out)
+    - {"resume_text": ..., "jd": {...}} or {"resume_text": ..., "jd_id": ...}
+    The id is the record's "id" if present, else "line-<n>".
+    """
+    if isinstance(obj, Exception):
+        raise obj
+    rid = str(obj.get("id") or f"line-{n}")
+    if "prompt" in obj:
+        m = _PROMPT_RE.search(obj["prompt"])
+        if m is None:
+            raise ValueError("prompt does not contain JD_TITLE/JD_TEXT/JD_SKILLS/RESUME_SECTIONS")
+        jd = {
+            "id": obj.get("jd_id", ""),
+            "title": m.group("title").strip(),
+            "text": m.group("text").strip(),
+            "skills": [s.strip() for s in m.group("skills").split(",") if s.strip()],
+        }
+        return rid, m.group("resume").strip(), jd
+
+    resume_text = (obj.get("resume_text") or "").strip()
+    if not resume_text:
+        raise ValueError("record has neither `prompt` nor `resume_text`")
+    jd = obj.get("jd")
+    if not isinstance(jd, dict):
+        jd = (jds_by_id or {}).get(obj.get("jd_id"))
+        if jd is None:
+            raise ValueError(f"unknown jd_id: {obj.get('jd_id')!r}")
+    return rid, resume_text, jd
+
+
+def completed_ids(out_path: str | Path) -> Set[str]:
+    """Ids already written without an error: the output file is the checkpoint."""
+    done: Set[str] = set()
+    path = Path(out_path)
+    if not path.exists():
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            if "error" not in row:
+                done.add(row["id"])
+    return done
+
+
+class RateLimiter:
+    """Spaces acquire() calls at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate_per_sec: float | None):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ---- per-record stages (top-level so they pickle into pool workers) ----
+
+
+def _prepare(args: Tuple[str, Dict]) -> Dict:
+    resume_text, jd = args
+    return build_gap_report(resume_text, jd)
+
+
+def _finish(args: Tuple[str, Dict, Dict, Any]) -> Dict[str, Any]:
+    return _pair_payload(*args)
+
+
+class _InlineExecutor(Executor):
+    """workers=0: run the CPU stages in this process (debugging, small manifests)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        fut: Future = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+
+def _error(rid: str, e: Exception) -> Dict[str, Any]:
+    return {"id": rid, "error": f"{type(e).__name__}: {e}"}
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _windows(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    window: List[Any] = []
+    for item in items:
+        window.append(item)
+        if len(window) == size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+def run_batch(
+    manifest: str | Path,
+    out_path: str | Path,
+    *,
+    provider: LLMProvider | None = None,
+    jds: List[Dict] | None = None,
+    workers: int = 2,
+    concurrency: int = 4,
+    rate_per_sec: float | None = None,
+    window: int = 32,
+    pairs_per_call: int = 1,
+    max_tokens: int = 1200,
+) -> Dict[str, Any]:
+    """
+    Generate improvements for every (resume, JD) record of a JSONL manifest and
+    append one JSON line per record to out_path.
+
+    Records are processed in windows: gap reports in a process pool (`workers`;
+    0 = in-process), LLM calls on `concurrency` threads spaced by `rate_per_sec`
+    (each call packs up to `pairs_per_call` records, see suggest.request_pairs),
+    then lift estimation back in the pool. Each line is flushed as
+    soon as its window completes, so a rerun after a crash skips every id already
+    in the output (records that failed are written with an "error" and retried).
+    """
+    provider = provider or provider_from_env()
+    jds_by_id = {jd.get("id"): jd for jd in (jds or [])}
+    done = completed_ids(out_path)
+    limiter = RateLimiter(rate_per_sec)
+    stats = {"written": 0, "skipped": 0, "errors": 0, "seconds": 0.0}
+    t0 = time.perf_counter()
+
+    def pending() -> Iterator[Tuple[str, Any]]:
+        for n, obj in read_manifest(manifest):
+            try:
+                rid, resume_text, jd = parse_record(n, obj, jds_by_id)
+            except (ValueError, KeyError, TypeError) as e:
+                yield f"line-{n}", e
+                continue
+            if rid in done:
+                stats["skipped"] += 1
+                continue
+            yield rid, (resume_text, jd)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    cpu: Executor = ProcessPoolExecutor(workers) if workers > 0 else _InlineExecutor()
+    with cpu, ThreadPoolExecutor(max(1, concurrency)) as io, open(
+        out_path, "a", encoding="utf-8"
+    ) as out:
+        if out.tell() and not _ends_with_newline(out_path):
+            out.write("\n")  # terminate a torn line left by a crash
+
+        def write(row: Dict[str, Any]) -> None:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            stats["errors" if "error" in row else "written"] += 1
+
+        for batch in _windows(pending(), window):
+            prepares = []
+            for rid, rec in batch:
+                if isinstance(rec, Exception):
+                    write(_error(rid, rec))
+                else:
+                    prepares.append((rid, rec, cpu.submit(_prepare, rec)))
+
+            contexts = []
+            for rid, (resume_text, jd), fut in prepares:
+                try:
+                    contexts.append((rid, (resume_text, jd, fut.result())))
+                except Exception as e:
+                    write(_error(rid, e))
+
+            calls = [
+                (
+                    group,
+                    io.submit(
+                        request_pairs,
+                        provider,
+                        [ctx for _, ctx in group],
+                        max_tokens=max_tokens,
+                        before_call=limiter.acquire,
+                    ),
+                )
+                for group in _windows(contexts, max(1, pairs_per_call))
+            ]
+
+            finishes = []
+            for group, call in calls:
+                try:
+                    raws = call.result()
+                except Exception as e:
+                    for rid, _ in group:
+                        write(_error(rid, e))
+                    continue
+                for (rid, (resume_text, jd, gap)), raw in zip(group, raws):
+                    finishes.append((rid, jd, cpu.submit(_finish, (resume_text, jd, gap, raw))))
+
+            for rid, jd, fut in finishes:
+                try:
+                    write({"id": rid, "jd_title": jd.get("title", ""), **fut.result()})
+                except Exception as e:
+                    write(_error(rid, e))
+            out.flush()
+            os.fsync(out.fileno())
+
+    stats["seconds"] = round(time.perf_counter() - t0, 3)
+    return stats
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Bulk GenAI improvements over a JSONL manifest.")
+    ap.add_argument("manifest", help="JSONL with `prompt` records or resume_text + jd/jd_id")
+    ap.add_argument("--out", required=True, help="output JSONL (also the resume checkpoint)")
+    ap.add_argument("--jds", default=str(Path("data") / "jds.json"))
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--rate", type=float, default=None, help="max LLM calls per second")
+    ap.add_argument("--window", type=int, default=32)
+    ap.add_argument("--pairs-per-call", type=int, default=1, help="records packed per LLM prompt")
+    args = ap.parse_args(argv)
+
+    jds = load_jds(Path(args.jds)) if Path(args.jds).exists() else []
+    stats = run_batch(
+        args.manifest,
+        args.out,
+        jds=jds,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        rate_per_sec=args.rate,
+        window=args.window,
+        pairs_per_call=args.pairs_per_call,
+    )
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
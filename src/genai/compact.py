@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.genai.analyzer import split_resume_sections
+
+# Approximate LLM tokens: word pieces and single punctuation marks. Close enough to
+# BPE counts for budgeting and before/after comparisons without a model tokenizer.
+_TOKEN_RE = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+
+DEFAULT_BUDGET = 700
+
+_RULES = (
+    "RULES: use JD phrasing where truthful; never change dates, employers or degrees; "
+    "if evidence is missing set needs_evidence=true."
+)
+_SHAPE = (
+    '{"suggestions":[{"type":"rewrite_bullet|add_bullet|summary_tweak|keyword_injection|'
+    'section_order","target_section":"summary|skills|experience|projects","original":"",'
+    '"proposed":"","rationale":"","needs_evidence":false}],"notes":[],"guardrails":[]}'
+)
+_SECTIONS = ("summary", "skills", "experience", "work experience", "projects")
+
+Relevance = Callable[[List[str], Dict], Sequence[float]]
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text or ""))
+
+
+def prompt_style() -> str:
+    """GENAI_PROMPT: 'full' (default) | 'compact'."""
+    return "compact" if os.getenv("GENAI_PROMPT", "full").lower().strip() == "compact" else "full"
+
+
+def prompt_budget() -> int:
+    return int(os.getenv("GENAI_PROMPT_BUDGET") or DEFAULT_BUDGET)
+
+
+def embedding_relevance(lines: List[str], jd: Dict) -> np.ndarray:
+    """Cosine of each line to the JD vector (cached embeddings, one batch)."""
+    from src.score_embed import embed_texts, jd_vector
+
+    return embed_texts(lines) @ jd_vector(jd)
+
+
+def overlap_relevance(lines: List[str], jd: Dict) -> List[float]:
+    """Model-free fallback: share of each line's terms that occur in the JD."""
+    from src.score_stub import _tokenize
+
+    jd_terms = set(_tokenize(f"{jd.get('text', '')} {' '.join(jd.get('skills', []))}"))
+    out = []
+    for line in lines:
+        terms = set(_tokenize(line))
+        out.append(len(terms & jd_terms) / len(terms) if terms else 0.0)
+    return out
+
+
+def _dedupe(items: Sequence[str]) -> List[str]:
+    seen, out = set(), []
+    for item in items:
+        key = item.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            out.append(item.strip())
+    return out
+
+
+def _resume_lines(resume_text: str) -> List[Tuple[str, str]]:
+    """(section, line) pairs for the sections the full prompt sends (body if none)."""
+    sections = split_resume_sections(resume_text)
+    names = [s for s in _SECTIONS if s in sections] or ["body"]
+    out = []
+    for name in names:
+        for line in sections.get(name, "").splitlines():
+            line = line.strip(" \t•-*")
+            if line:
+                out.append(("experience" if name == "work experience" else name, line))
+    return out
+
+
+def _truncate(text: str, budget: int) -> str:
+    if count_tokens(text) <= budget:
+        return text
+    out: List[str] = []
+    used = 1  # the ellipsis
+    for w in text.split():
+        used += count_tokens(w)
+        if used > budget:
+            break
+        out.append(w)
+    return " ".join(out) + " …"
+
+
+def compact_pair_context(
+    jd: Dict,
+    resume_text: str,
+    gap_report: Dict,
+    *,
+    budget: int | None = None,
+    relevance: Relevance | None = None,
+) -> str:
+    """
+    Compact counterpart of suggest._format_pair_context, kept within `budget`
+    approximate tokens for the whole pair block:
+    - JD skills deduplicated; gap report as single-line JSON without the skills the
+      JD line already lists, matched skills (implied) or the static notes
+    - resume lines ranked by relevance to the JD (embeddings by default); the most
+      relevant ones that fit are kept, in their original order
+    """
+    budget = budget or prompt_budget()
+    relevance = relevance or embedding_relevance
+    skills = _dedupe(jd.get("skills", []))
+    skill_keys = {s.lower() for s in skills}
+    unquantified = set(gap_report.get("unquantified_bullets", []))
+    gap = {
+        "missing_skills": _dedupe(gap_report.get("missing_skills", [])),
+        "underused_keywords": [
+            k
+            for k in _dedupe(gap_report.get("underused_keywords", []))
+            if k.lower().strip(".") not in skill_keys
+        ],
+        "sections_present": gap_report.get("sections", {}).get("present", []),
+    }
+    head = (
+        f"JD_TITLE: {jd.get('title', '')}\nJD_SKILLS: {', '.join(skills)}\n"
+        f"GAP: {json.dumps(gap, ensure_ascii=False, separators=(',', ':'))}"
+    )
+    lines = [
+        (section, f"- {line}" + (" (no metric)" if line in unquantified else ""), line)
+        for section, line in _resume_lines(resume_text)
+    ]
+    labels = "JD_TEXT: RESUME (most JD-relevant lines):" + "".join(
+        f"[{s}]" for s in dict.fromkeys(section for section, _, _ in lines)
+    )
+    remaining = max(0, budget - count_tokens(head) - count_tokens(labels))
+    jd_text = _truncate(" ".join((jd.get("text") or "").split()), remaining // 3)
+    remaining -= count_tokens(jd_text)
+
+    keep = set()
+    if lines:
+        scores = np.asarray(relevance([line for _, _, line in lines], jd), dtype=np.float32)
+        for i in np.argsort(-scores, kind="stable"):
+            cost = count_tokens(lines[i][1])
+            if cost <= remaining:
+                keep.add(int(i))
+                remaining -= cost
+    resume_block, current = [], None
+    for i, (section, rendered, _) in enumerate(lines):
+        if i not in keep:
+            continue
+        if section != current:
+            resume_block.append(f"[{section}]")
+            current = section
+        resume_block.append(rendered)
+
+    return f"{head}\nJD_TEXT: {jd_text}\nRESUME (most JD-relevant lines):\n" + "\n".join(
+        resume_block
+    )
+
+
+def compact_user_prompt(
+    jd: Dict,
+    resume_text: str,
+    gap_report: Dict,
+    *,
+    budget: int | None = None,
+    relevance: Relevance | None = None,
+) -> str:
+    """Compact single-pair prompt: pair context, one-line rules and a minified schema."""
+    budget = budget or prompt_budget()
+    tail = f"{_RULES}\nReturn JSON: {_SHAPE}"
+    context = compact_pair_context(
+        jd,
+        resume_text,
+        gap_report,
+        budget=max(1, budget - count_tokens(tail)),
+        relevance=relevance,
+    )
+    return f"{context}\n{tail}"
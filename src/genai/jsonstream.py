@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+
+class JSONObjectScanner:
+    """
+    Incremental scanner for the first top-level JSON object in a token stream.
+    Tracks nesting depth and string/escape state one character at a time, so each
+    fed chunk costs O(len(chunk)) and the end of the object is known the moment
+    its closing brace arrives. Text before the first '{' (prose, code fences) is
+    skipped.
+
+    Objects that complete directly inside a top-level array (e.g. each item of
+    "suggestions") are parsed and returned by feed() as soon as they close.
+    """
+
+    def __init__(self, item_key: str = "suggestions"):
+        self.item_key = item_key
+        self.done = False
+        self._buf: List[str] = []
+        self._stack: List[str] = []  # open containers: '{' or '['
+        self._keys: List[str | None] = []  # key each container was opened under
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []
+        self._expect_key = False
+        self._last_key: str | None = None
+        self._item_start: int | None = None
+        self._pos = 0
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buf)
+
+    def _in_item_array(self) -> bool:
+        return len(self._stack) == 2 and self._stack[1] == "[" and self._keys[1] == self.item_key
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._stack and ch != "{":
+                continue  # still before the object
+            self._buf.append(ch)
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._expect_key and self._stack[-1] == "{":
+                        self._last_key = "".join(self._string)
+                    self._string = []
+                    continue
+                if self._expect_key:
+                    self._string.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "{" and self._in_item_array():
+                    self._item_start = self._pos - 1
+                self._keys.append(self._last_key if self._stack else None)
+                self._stack.append(ch)
+                self._expect_key = ch == "{"
+                self._last_key = None
+            elif ch in "}]":
+                self._stack.pop()
+                self._keys.pop()
+                self._expect_key = False
+                if not self._stack:
+                    self.done = True
+                elif ch == "}" and self._item_start is not None and self._in_item_array():
+                    try:
+                        items.append(json.loads("".join(self._buf[self._item_start :])))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+            elif ch == ",":
+                self._expect_key = self._stack[-1] == "{"
+            elif ch == ":":
+                self._expect_key = False
+        return items
+
+    def result(self) -> Dict[str, Any] | None:
+        """The parsed object once done (None if it was not valid JSON)."""
+        if not self.done:
+            return None
+        try:
+            obj = json.loads(self.text)
+        except ValueError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+
+def extract_json_object(text: str) -> Dict[str, Any] | None:
+    """
+    First balanced {...} in text that parses as a JSON object. One character scan
+    per candidate instead of the backtracking recursive `\\{(?:[^{}]|(?R))*\\}` regex.
+    """
+    start = text.find("{")
+    while start != -1:
+        scanner = JSONObjectScanner()
+        scanner.feed(text[start:])
+        obj = scanner.result()
+        if obj is not None:
+            return obj
+        start = text.find("{", start + 1)
+    return None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import re
 from typing import Any, Dict, Protocol
 
 from src.genai.local_provider import LocalProvider
@@ -13,10 +14,25 @@ class LLMProvider(Protocol):
     ) -> Dict[str, Any]: ...
 
 
+class AsyncLLMProvider(Protocol):
+    """
+    Non-blocking variant: every built-in provider implements both protocols, so one
+    instance serves sync callers and asyncio fan-out alike.
+    """
+
+    async def agenerate_json(
+        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 8000
+    ) -> Dict[str, Any]: ...
+
+
+_PAIR_KEY_RE = re.compile(r"(?m)^=== PAIR (\S+) ===$")
+
+
 class MockProvider:
     """
     Deterministic provider for tests and offline dev.
-    Returns a small set of plausible suggestions with the required schema.
+    Returns a small set of plausible suggestions with the required schema
+    (keyed by pair for multi-pair prompts, see suggest._format_batch_prompt).
     """
 
     def generate_json(
@@ -47,14 +63,22 @@ class MockProvider:
             ],
             "guardrails": ["Do not invent employers, dates, or certifications."],
         }
+        keys = _PAIR_KEY_RE.findall(user)
+        if keys:
+            return {"pairs": {key: payload for key in keys}}
         return payload
 
+    async def agenerate_json(
+        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 8000
+    ) -> Dict[str, Any]:
+        return self.generate_json(system, user, temperature=temperature, max_tokens=max_tokens)
 
-def _load_openai():
+
+def _load_openai(name: str = "OpenAI"):
     try:
-        from openai import OpenAI
+        import openai
 
-        return OpenAI
+        return getattr(openai, name)
     except Exception as e:
         raise RuntimeError("OpenAI client not installed. Run: pip install openai>=1.0.0") from e
 
@@ -68,12 +92,11 @@ class OpenAIProvider:
     def __init__(self, model: str | None = None):
         OpenAI = _load_openai()
         self.client = OpenAI()
+        self._aclient = None  # AsyncOpenAI, created on first async call
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-    def generate_json(
-        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 8000
-    ) -> Dict[str, Any]:
-        resp = self.client.chat.completions.create(
+    def _request(self, system: str, user: str, temperature: float, max_tokens: int) -> Dict:
+        return dict(
             model=self.model,
             temperature=temperature,
             response_format={"type": "json_object"},
@@ -83,7 +106,27 @@ class OpenAIProvider:
             ],
             max_tokens=max_tokens,
         )
-        content = resp.choices[0].message.content
+
+    def generate_json(
+        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 8000
+    ) -> Dict[str, Any]:
+        resp = self.client.chat.completions.create(
+            **self._request(system, user, temperature, max_tokens)
+        )
+        return self._parse(resp.choices[0].message.content)
+
+    async def agenerate_json(
+        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 8000
+    ) -> Dict[str, Any]:
+        if self._aclient is None:
+            self._aclient = _load_openai("AsyncOpenAI")()
+        resp = await self._aclient.chat.completions.create(
+            **self._request(system, user, temperature, max_tokens)
+        )
+        return self._parse(resp.choices[0].message.content)
+
+    @staticmethod
+    def _parse(content: str) -> Dict[str, Any]:
         try:
             return json.loads(content)
         except Exception as e:
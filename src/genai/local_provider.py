@@ -1,8 +1,15 @@
+import asyncio
 import os
 import json
+import random
+import threading
+import time
 import requests
-import regex
-from typing import Any, Dict
+from functools import partial
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, List, Tuple
+
+from src.genai.jsonstream import JSONObjectScanner, extract_json_object
 
 raw_sample = {
     "suggestions": [
@@ -51,52 +58,115 @@ raw_sample = {
 }
 
 
+# One pooled, keep-alive session per pool size, shared by every LocalProvider:
+# provider_from_env() builds a new provider per request, the connections persist.
+_SESSIONS: Dict[int, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _pooled_session(pool_size: int) -> requests.Session:
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(pool_size)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["Connection"] = "keep-alive"
+            _SESSIONS[pool_size] = session
+        return session
+
+
+def _env_number(name: str, default: float) -> float:
+    return float(os.getenv(name) or default)
+
+
 class LocalProvider:
     """
     Simple provider that calls a local Ollama server at http://localhost:11434/api/generate.
     Works fully offline once a model is pulled with `ollama pull <model>`.
+
+    Requests go through a pooled keep-alive session. Connection errors and 5xx
+    responses are retried up to `retries` times with jittered exponential backoff;
+    read timeouts are not retried (the generation may still be running server-side).
+
+    By default generations are streamed (GENAI_LOCAL_STREAM=0 turns it off): the
+    JSON object is scanned incrementally and the call returns as soon as it closes.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        pool_size: int | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        retries: int | None = None,
+        backoff: float | None = None,
+        stream: bool | None = None,
+    ):
         self.url = os.getenv("GENAI_LOCAL_URL", "http://localhost:11434/api/generate")
         self.model = os.getenv("LOCAL_MODEL", "phi3")
+        self.pool_size = int(pool_size or _env_number("GENAI_LOCAL_POOL_SIZE", 8))
+        self.connect_timeout = connect_timeout or _env_number("GENAI_LOCAL_CONNECT_TIMEOUT", 5)
+        self.read_timeout = read_timeout or _env_number("GENAI_LOCAL_READ_TIMEOUT", 300)
+        self.retries = int(
+            retries if retries is not None else _env_number("GENAI_LOCAL_RETRIES", 2)
+        )
+        self.backoff = backoff if backoff is not None else _env_number("GENAI_LOCAL_BACKOFF", 0.5)
+        self.stream = stream if stream is not None else os.getenv("GENAI_LOCAL_STREAM", "1") != "0"
+        self.session = _pooled_session(self.pool_size)
 
-    def generate_json(
-        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 800
-    ) -> Dict[str, Any]:
+    def _sleep_before_retry(self, attempt: int) -> None:
+        # "Full jitter": uniform in [0, backoff * 2^attempt], capped at 10s.
+        time.sleep(random.uniform(0, min(10.0, self.backoff * (2**attempt))))
+
+    def _post(self, payload: Dict[str, Any], *, stream: bool = False) -> requests.Response:
+        timeout = (self.connect_timeout, self.read_timeout)
+        for attempt in range(self.retries + 1):
+            try:
+                r = self.session.post(self.url, json=payload, timeout=timeout, stream=stream)
+            except requests.exceptions.ConnectionError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if r.status_code < 500 or attempt == self.retries:
+                    r.raise_for_status()
+                    return r
+                r.close()
+            self._sleep_before_retry(attempt)
+        raise AssertionError("unreachable")
 
+    def _payload(
+        self, system: str, user: str, temperature: float, max_tokens: int, stream: bool
+    ) -> Dict[str, Any]:
         prompt = (
             f"{system}\n\n"
             f"{user}\n\n"
             "Return STRICT JSON ONLY. Do not add commentary. "
             "Do not add code fences. Do not add explanations."
         )
-
-        payload = {
+        return {
             "model": self.model,
             "prompt": prompt,
             "temperature": temperature,
             "num_predict": max_tokens,
+            "stream": stream,
         }
 
-        r = requests.post(self.url, json=payload, timeout=300)
-        r.raise_for_status()
-        raw = r.json().get("response") or ""
-
+    @staticmethod
+    def _parse_raw(raw: str) -> Dict[str, Any]:
         # --- 1) Try direct JSON ---
-
         try:
-            return raw.copy()  # json.loads(raw)
-        except Exception:
+            obj = json.loads(raw)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
             pass
 
-        # --- 2) Extract first JSON object using regex ---
-        json_match = regex.search(r"\{(?:[^{}]|(?R))*\}", raw, flags=regex.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except Exception:
-                pass
+        # --- 2) Extract first JSON object (single linear scan) ---
+        obj = extract_json_object(raw)
+        if obj is not None:
+            return obj
 
         # --- 3) Fallback: return safe structure ---
         return {
@@ -104,3 +174,57 @@ class LocalProvider:
             "notes": [f"Ollama returned non-JSON text. Raw output (truncated): {raw[:180]}"],
             "guardrails": ["Ensure model prompt enforces JSON-only output."],
         }
+
+    def stream_json(
+        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 800
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Read Ollama's NDJSON token stream and yield ("suggestion", item) for each
+        suggestion object as soon as it closes, then ("result", payload).
+        The response is closed as soon as the top-level object is complete, which
+        drops the connection and makes Ollama stop generating the trailing tokens.
+        """
+        scanner = JSONObjectScanner()
+        raw: List[str] = []
+        r = self._post(self._payload(system, user, temperature, max_tokens, True), stream=True)
+        try:
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                token = chunk.get("response") or ""
+                raw.append(token)
+                for item in scanner.feed(token):
+                    yield "suggestion", item
+                if scanner.done or chunk.get("done"):
+                    break
+        finally:
+            r.close()
+        payload = scanner.result()
+        yield "result", payload if payload is not None else self._parse_raw("".join(raw))
+
+    def generate_json(
+        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 800
+    ) -> Dict[str, Any]:
+        if self.stream:
+            for kind, value in self.stream_json(
+                system, user, temperature=temperature, max_tokens=max_tokens
+            ):
+                if kind == "result":
+                    return value
+        r = self._post(self._payload(system, user, temperature, max_tokens, False))
+        return self._parse_raw(r.json().get("response") or "")
+
+    async def agenerate_json(
+        self, system: str, user: str, *, temperature: float = 0.2, max_tokens: int = 800
+    ) -> Dict[str, Any]:
+        """
+        Non-blocking generate_json: the HTTP round-trip runs in the loop's default
+        executor (requests has no asyncio API), so the event loop keeps serving
+        other improvement requests while Ollama generates.
+        """
+        loop = asyncio.get_running_loop()
+        call = partial(
+            self.generate_json, system, user, temperature=temperature, max_tokens=max_tokens
+        )
+        return await loop.run_in_executor(None, call)
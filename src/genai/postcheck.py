@@ -4,10 +4,23 @@ import numpy as np
 from typing import Dict, Iterable, List
 
 from src.skills import find_skills, load_skill_aliases
-from src.score_embed import embed_text  # uses MiniLM embed
+from src.score_embed import embed_text, embed_texts, jd_vector  # uses MiniLM embed
 from src.genai.analyzer import split_resume_sections
 
 
+# reconstruct naive resume text order
+SECTION_ORDER = [
+    "summary",
+    "skills",
+    "experience",
+    "projects",
+    "education",
+    "certifications",
+    "work experience",
+    "body",
+]
+
+
 def _cos(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b))
 
@@ -18,61 +31,92 @@ def _semantic_similarity(text_a: str, text_b: str) -> float:
     return _cos(va, vb)
 
 
-def estimate_snippet_lift(
-    resume_text: str, jd: Dict, snippet: str, target_section: str | None = None
-) -> Dict:
-    """
-    Estimate delta in semantic similarity and skills coverage if 'snippet' were added.
-    We don't rewrite the whole resume; we approximate by appending snippet to the chosen section (or to body).
-    """
-    jd_text = jd.get("text", "") or ""
-    jd_skills = jd.get("skills", []) or []
+def _coverage(text: str, jd_skills: List[str]) -> float:
+    matched = find_skills(text, jd_skills, alias_map=load_skill_aliases())
+    return (len(matched) / len(jd_skills)) if jd_skills else 0.0
 
-    # baseline
-    base_sem = _semantic_similarity(resume_text, jd_text)
-    aliases = load_skill_aliases()
-    base_matched = find_skills(resume_text, jd_skills, alias_map=aliases)
-    base_cov = (len(base_matched) / len(jd_skills)) if jd_skills else 0.0
 
-    # apply snippet
-    sections = split_resume_sections(resume_text)
+def _apply_snippet(sections: Dict[str, str], snippet: str, target_section: str | None) -> str:
+    """
+    We don't rewrite the whole resume; we approximate by appending snippet to the chosen
+    section (or to body).
+    """
     ts = (target_section or "body").lower()
     combined = dict(sections)
     combined[ts] = (combined.get(ts, "") + "\n" + (snippet or "")).strip()
-    # reconstruct naive resume text order
-    order = [
-        "summary",
-        "skills",
-        "experience",
-        "projects",
-        "education",
-        "certifications",
-        "work experience",
-        "body",
-    ]
-    new_resume = "\n\n".join([combined[s] for s in order if s in combined])
+    return "\n\n".join([combined[s] for s in SECTION_ORDER if s in combined])
 
-    new_sem = _semantic_similarity(new_resume, jd_text)
-    new_matched = find_skills(new_resume, jd_skills, alias_map=aliases)
-    new_cov = (len(new_matched) / len(jd_skills)) if jd_skills else 0.0
 
+def compute_baseline(resume_text: str, jd: Dict) -> Dict:
+    """
+    Everything about the unmodified resume/JD pair that every suggestion shares:
+    resume + JD vectors, baseline semantic similarity and skills coverage.
+    """
+    jd_skills = jd.get("skills", []) or []
+    resume_vec = embed_text(resume_text)
+    jd_vec = jd_vector(jd)
     return {
-        "baseline": {"semantic": round(base_sem, 4), "skills": round(base_cov, 4)},
-        "new": {"semantic": round(new_sem, 4), "skills": round(new_cov, 4)},
-        "delta": {"semantic": round(new_sem - base_sem, 4), "skills": round(new_cov - base_cov, 4)},
+        "resume_vec": resume_vec,
+        "jd_vec": jd_vec,
+        "semantic": _cos(resume_vec, jd_vec),
+        "skills": _coverage(resume_text, jd_skills),
     }
 
 
-def estimate_lifts(resume_text: str, jd: Dict, suggestions: Iterable[Dict]) -> List[Dict]:
+def _estimate(
+    resume_text: str, jd: Dict, edits: List[Dict], baseline: Dict | None = None
+) -> List[Dict]:
+    jd_skills = jd.get("skills", []) or []
+    base = baseline or compute_baseline(resume_text, jd)
+    base_sem, base_cov = base["semantic"], base["skills"]
+
+    sections = split_resume_sections(resume_text)
+    new_resumes = [
+        _apply_snippet(sections, e.get("proposed", ""), e.get("target_section")) for e in edits
+    ]
+    # all modified resumes go through the encoder in one batched call
+    new_sems = embed_texts(new_resumes) @ base["jd_vec"] if new_resumes else []
+
+    out = []
+    for new_resume, new_sem in zip(new_resumes, new_sems):
+        new_sem = float(new_sem)
+        new_cov = _coverage(new_resume, jd_skills)
+        out.append(
+            {
+                "baseline": {"semantic": round(base_sem, 4), "skills": round(base_cov, 4)},
+                "new": {"semantic": round(new_sem, 4), "skills": round(new_cov, 4)},
+                "delta": {
+                    "semantic": round(new_sem - base_sem, 4),
+                    "skills": round(new_cov - base_cov, 4),
+                },
+            }
+        )
+    return out
+
+
+def estimate_snippet_lift(
+    resume_text: str, jd: Dict, snippet: str, target_section: str | None = None
+) -> Dict:
+    """
+    Estimate delta in semantic similarity and skills coverage if 'snippet' were added.
+    We don't rewrite the whole resume; we approximate by appending snippet to the chosen section (or to body).
+    """
+    edit = {"proposed": snippet, "target_section": target_section}
+    return _estimate(resume_text, jd, [edit])[0]
+
+
+def estimate_lifts(
+    resume_text: str, jd: Dict, suggestions: Iterable[Dict], *, baseline: Dict | None = None
+) -> List[Dict]:
     """
     suggestions: iterable of {"proposed": str, "target_section": str}
     returns: each item + {"est_lift": {...}}
+    The baseline (see compute_baseline) is computed once, not per suggestion.
     """
+    suggestions = list(suggestions)
+    lifts = _estimate(resume_text, jd, suggestions, baseline=baseline)
     out = []
-    for s in suggestions:
-        snippet = s.get("proposed", "")
-        section = s.get("target_section")
-        lift = estimate_snippet_lift(resume_text, jd, snippet, section)
+    for s, lift in zip(suggestions, lifts):
         item = dict(s)
         item["est_lift"] = lift["delta"]
         out.append(item)
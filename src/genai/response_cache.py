@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def response_key(provider: Any, system: str, user: str, temperature: float) -> str:
+    """(provider class, model, temperature, system prompt hash, user prompt hash)."""
+    parts = [
+        type(provider).__name__,
+        str(getattr(provider, "model", "")),
+        f"{temperature:.3f}",
+        _sha(system),
+        _sha(user),
+    ]
+    return _sha("\x1f".join(parts))
+
+
+class ResponseCache:
+    """
+    Persistent cache of provider JSON payloads in SQLite.
+    - entries older than ttl_seconds are treated as misses and deleted
+    - at most max_entries rows are kept; the least recently used go first
+    """
+
+    def __init__(
+        self, path: str | Path, *, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 1000
+    ):
+        self.path = Path(path)
+        self.ttl = float(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, created, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload, ensure_ascii=False), now, now),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE created < ? OR key IN ("
+                "SELECT key FROM responses ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (now - self.ttl, self.max_entries),
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_CACHE: ResponseCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """
+    Process-wide cache, configured from the environment:
+    GENAI_CACHE=0 disables it; GENAI_CACHE_PATH (default <repo>/.cache/genai_responses.sqlite),
+    GENAI_CACHE_TTL seconds (default 7 days), GENAI_CACHE_MAX_ENTRIES (default 1000).
+    """
+    global _CACHE
+    if os.getenv("GENAI_CACHE", "1") == "0":
+        return None
+    default = Path(__file__).resolve().parents[2] / ".cache" / "genai_responses.sqlite"
+    path = Path(os.getenv("GENAI_CACHE_PATH") or default)
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE.path != path:
+            _CACHE = ResponseCache(
+                path,
+                ttl_seconds=float(os.getenv("GENAI_CACHE_TTL", 7 * 24 * 3600)),
+                max_entries=int(os.getenv("GENAI_CACHE_MAX_ENTRIES", 1000)),
+            )
+        return _CACHE
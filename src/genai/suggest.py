@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
 
-from src.genai.llm import provider_from_env, LLMProvider
+from src.genai.llm import provider_from_env, AsyncLLMProvider, LLMProvider
 from src.genai.analyzer import build_gap_report, split_resume_sections
-from src.genai.postcheck import estimate_lifts
+from src.genai.compact import (
+    _RULES,
+    _SHAPE,
+    compact_pair_context,
+    compact_user_prompt,
+    count_tokens,
+    prompt_style,
+)
+from src.genai.postcheck import compute_baseline, estimate_lifts
+from src.genai.response_cache import get_response_cache, response_key
 
 
 SYSTEM_PROMPT = """You are a resume improvement assistant for the Indian job market.
@@ -14,8 +26,31 @@ If a suggestion requires evidence or user confirmation, set "needs_evidence": tr
 Each bullet must be ≤ 25 words, use a strong verb, name the tech, and include a metric if available.
 Return strictly valid JSON according to the requested schema, with no extra text."""
 
+TEMPERATURE = 0.2
 
-def _format_user_prompt(jd: Dict, resume_text: str, gap_report: Dict) -> str:
+
+_CONSTRAINTS = """CONSTRAINTS:
+- Use JD phrasing where truthful (e.g., RESTful, DRF, PostgreSQL).
+- Do not change dates, employers, or degrees.
+- If information is missing, propose a phrasing with "needs_evidence": true."""
+
+_RESPONSE_SHAPE = """{
+  "suggestions": [
+    {
+      "type": "rewrite_bullet" | "add_bullet" | "summary_tweak" | "keyword_injection" | "section_order",
+      "target_section": "summary" | "skills" | "experience" | "projects",
+      "original": "<optional>",
+      "proposed": "<concise ATS-friendly sentence>",
+      "rationale": "<why this helps for the JD>",
+      "needs_evidence": true | false
+    }
+  ],
+  "notes": ["..."],
+  "guardrails": ["..."]
+}"""
+
+
+def _format_pair_context(jd: Dict, resume_text: str, gap_report: Dict) -> str:
     # tiny splitter so the LLM sees some structure
     sections = split_resume_sections(resume_text)
     summary = sections.get("summary", "")
@@ -43,27 +78,51 @@ Projects:
 {projects}
 
 GAP_REPORT (JSON):
-{json.dumps(gap_report, ensure_ascii=False, indent=2)}
+{json.dumps(gap_report, ensure_ascii=False, indent=2)}"""
 
-CONSTRAINTS:
-- Use JD phrasing where truthful (e.g., RESTful, DRF, PostgreSQL).
-- Do not change dates, employers, or degrees.
-- If information is missing, propose a phrasing with "needs_evidence": true.
+
+def _format_user_prompt(jd: Dict, resume_text: str, gap_report: Dict) -> str:
+    if prompt_style() == "compact":
+        return compact_user_prompt(jd, resume_text, gap_report)
+    return f"""{_format_pair_context(jd, resume_text, gap_report)}
+
+{_CONSTRAINTS}
 
 Return JSON with this shape:
+{_RESPONSE_SHAPE}"""
+
+
+PAIR_HEADER = "=== PAIR {key} ==="
+
+
+def _format_batch_prompt(keys: List[str], pairs: List[Tuple[str, Dict, Dict]]) -> str:
+    """
+    Several (resume_text, jd, gap_report) pairs in one prompt. The constraints and
+    the response schema are sent once; the answer is keyed by pair key.
+    """
+    compact = prompt_style() == "compact"
+    context = compact_pair_context if compact else _format_pair_context
+    blocks = [
+        f"{PAIR_HEADER.format(key=key)}\n{context(jd, resume_text, gap)}"
+        for key, (resume_text, jd, gap) in zip(keys, pairs)
+    ]
+    if compact:
+        return (
+            f"Improve each of these {len(pairs)} resume/JD pairs independently.\n"
+            + "\n".join(blocks)
+            + f'\n{_RULES}\nReturn JSON: {{"pairs":{{"<pair key>":{_SHAPE}}}}}'
+        )
+    return f"""Improve each of the following {len(pairs)} resume/JD pairs independently.
+
+{chr(10).join(blocks)}
+
+{_CONSTRAINTS}
+
+Return JSON with this shape, with one entry per pair key ({', '.join(keys)}):
 {{
-  "suggestions": [
-    {{
-      "type": "rewrite_bullet" | "add_bullet" | "summary_tweak" | "keyword_injection" | "section_order",
-      "target_section": "summary" | "skills" | "experience" | "projects",
-      "original": "<optional>",
-      "proposed": "<concise ATS-friendly sentence>",
-      "rationale": "<why this helps for the JD>",
-      "needs_evidence": true | false
-    }}
-  ],
-  "notes": ["..."],
-  "guardrails": ["..."]
+  "pairs": {{
+    "<pair key>": {_RESPONSE_SHAPE}
+  }}
 }}"""
 
 
@@ -78,6 +137,31 @@ ALLOWED_TYPES = {
 ALLOWED_SECTIONS = {"summary", "skills", "experience", "projects"}
 
 
+def _clean_suggestion(s: Any) -> Dict[str, Any] | None:
+    if not isinstance(s, dict):
+        return None
+    missing = REQUIRED_SUG_KEYS - set(s.keys())
+    if missing:
+        return None
+    if s["type"] not in ALLOWED_TYPES:
+        return None
+    if s["target_section"] not in ALLOWED_SECTIONS:
+        return None
+    if not isinstance(s["needs_evidence"], bool):
+        return None
+    # keep only minimal fields + optional original
+    item = {
+        "type": s["type"],
+        "target_section": s["target_section"],
+        "proposed": s["proposed"].strip(),
+        "rationale": s["rationale"].strip(),
+        "needs_evidence": bool(s["needs_evidence"]),
+    }
+    if "original" in s and isinstance(s["original"], str):
+        item["original"] = s["original"].strip()
+    return item
+
+
 def _validate_response(
     payload: Dict[str, Any]
 ) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
@@ -91,31 +175,7 @@ def _validate_response(
     if not isinstance(suggestions, list):
         raise ValueError("`suggestions` must be a list.")
 
-    cleaned: List[Dict[str, Any]] = []
-    for s in suggestions:
-        if not isinstance(s, dict):
-            continue
-        missing = REQUIRED_SUG_KEYS - set(s.keys())
-        if missing:
-            continue
-        if s["type"] not in ALLOWED_TYPES:
-            continue
-        if s["target_section"] not in ALLOWED_SECTIONS:
-            continue
-        if not isinstance(s["needs_evidence"], bool):
-            continue
-        # keep only minimal fields + optional original
-        item = {
-            "type": s["type"],
-            "target_section": s["target_section"],
-            "proposed": s["proposed"].strip(),
-            "rationale": s["rationale"].strip(),
-            "needs_evidence": bool(s["needs_evidence"]),
-        }
-        if "original" in s and isinstance(s["original"], str):
-            item["original"] = s["original"].strip()
-        cleaned.append(item)
-
+    cleaned = [item for item in map(_clean_suggestion, suggestions) if item is not None]
     return (
         cleaned,
         [n for n in notes if isinstance(n, str)],
@@ -123,12 +183,137 @@ def _validate_response(
     )
 
 
-def generate_improvements(resume_text: str, jd: Dict) -> Dict[str, Any]:
+def _validate_batch_response(payload: Any, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a keyed multi-pair payload ({"pairs": {key: {...}}}) into per-pair payloads.
+    Pairs that are missing, fail _validate_response or have no suggestion left
+    after _clean_suggestion are left out, so callers can re-request them one by one.
+    """
+    pairs = payload.get("pairs") if isinstance(payload, dict) else None
+    if not isinstance(pairs, dict):
+        return {}
+    out: Dict[str, Dict[str, Any]] = {}
+    for key in keys:
+        try:
+            suggestions, _, _ = _validate_response(pairs.get(key))
+        except ValueError:
+            continue
+        if suggestions:
+            out[key] = pairs[key]
+    return out
+
+
+def _cached_response(provider: Any, user: str) -> Tuple[str, Dict[str, Any] | None]:
+    """(cache key, cached payload or None). The key is "" when caching is off."""
+    cache = get_response_cache()
+    if cache is None:
+        return "", None
+    key = response_key(provider, SYSTEM_PROMPT, user, TEMPERATURE)
+    return key, cache.get(key)
+
+
+def _remember_response(key: str, raw: Any) -> None:
+    # only well-formed payloads with suggestions; failures are retried next time
+    cache = get_response_cache()
+    if cache is None or not key:
+        return
+    try:
+        suggestions, _, _ = _validate_response(raw)
+    except ValueError:
+        return
+    if suggestions:
+        cache.put(key, raw)
+
+
+def request_pairs(
+    provider: LLMProvider,
+    pairs: List[Tuple[str, Dict, Dict]],
+    *,
+    max_tokens: int = 1200,
+    before_call: Callable[[], None] | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Provider payloads for (resume_text, jd, gap_report) pairs, in order.
+    Pairs not in the response cache are sent together in one multi-pair prompt;
+    pairs the answer leaves out or mangles fall back to single-pair calls.
+    Every payload is cached under its single-pair prompt, so batch and one-off
+    runs share cache entries. `before_call` runs before each provider call (rate limits).
+    """
+    users = [_format_user_prompt(jd, resume_text, gap) for resume_text, jd, gap in pairs]
+    cached = [_cached_response(provider, user) for user in users]
+    results: List[Dict[str, Any] | None] = [raw for _, raw in cached]
+    todo = [i for i, raw in enumerate(results) if raw is None]
+
+    if len(todo) > 1:
+        keys = [f"p{n}" for n in range(1, len(todo) + 1)]
+        user = _format_batch_prompt(keys, [pairs[i] for i in todo])
+        if before_call:
+            before_call()
+        try:
+            raw = provider.generate_json(
+                SYSTEM_PROMPT, user, temperature=TEMPERATURE, max_tokens=max_tokens * len(todo)
+            )
+        except ValueError:  # whole answer malformed: every pair goes single
+            raw = None
+        split = _validate_batch_response(raw, keys)
+        for key, i in zip(keys, todo):
+            if key in split:
+                results[i] = split[key]
+                _remember_response(cached[i][0], split[key])
+
+    for i in todo:
+        if results[i] is None:
+            if before_call:
+                before_call()
+            results[i] = provider.generate_json(
+                SYSTEM_PROMPT, users[i], temperature=TEMPERATURE, max_tokens=max_tokens
+            )
+            _remember_response(cached[i][0], results[i])
+    return results  # type: ignore[return-value]
+
+
+def _pair_payload(resume_text: str, jd: Dict, gap: Dict, raw: Any) -> Dict[str, Any]:
+    """generate_improvements' output for one pair answered inside a packed prompt."""
+    suggestions, notes, guardrails = _validate_response(raw)
+    return {
+        "gap_report": gap,
+        "suggestions": estimate_lifts(resume_text, jd, suggestions),
+        "notes": notes,
+        "guardrails": guardrails,
+        # size of the pair's own (single-pair) prompt, as in the other paths
+        "prompt_tokens": count_tokens(_format_user_prompt(jd, resume_text, gap)),
+    }
+
+
+def generate_improvements_batch(
+    pairs: Sequence[Tuple[str, Dict]],
+    provider: LLMProvider | None = None,
+    *,
+    pairs_per_call: int = 4,
+) -> List[Dict[str, Any]]:
+    """
+    generate_improvements for many (resume_text, jd) pairs, packing up to
+    `pairs_per_call` gap reports into each provider call. Returns one payload per
+    pair, in order, with the same shape generate_improvements returns.
+    """
+    provider = provider or provider_from_env()
+    contexts = [(r, jd, build_gap_report(r, jd)) for r, jd in pairs]
+    out: List[Dict[str, Any]] = []
+    for start in range(0, len(contexts), max(1, pairs_per_call)):
+        group = contexts[start : start + max(1, pairs_per_call)]
+        for (resume_text, jd, gap), raw in zip(group, request_pairs(provider, group)):
+            out.append(_pair_payload(resume_text, jd, gap, raw))
+    return out
+
+
+def generate_improvements(
+    resume_text: str, jd: Dict, provider: LLMProvider | None = None
+) -> Dict[str, Any]:
     """
     Main entrypoint:
     - builds gap report
     - creates prompt
-    - calls the provider (mock/openai)
+    - calls the provider (mock/openai), unless the response cache has this prompt
     - validates shape
     - estimates lifts per suggestion
     """
@@ -136,8 +321,11 @@ def generate_improvements(resume_text: str, jd: Dict) -> Dict[str, Any]:
     system = SYSTEM_PROMPT
     user = _format_user_prompt(jd, resume_text, gap)
 
-    provider: LLMProvider = provider_from_env()
-    raw = provider.generate_json(system, user, temperature=0.2, max_tokens=1200)
+    provider = provider or provider_from_env()
+    key, raw = _cached_response(provider, user)
+    if raw is None:
+        raw = provider.generate_json(system, user, temperature=TEMPERATURE, max_tokens=1200)
+        _remember_response(key, raw)
     suggestions, notes, guardrails = _validate_response(raw)
 
     # enrich with estimated lifts (semantic+skills deltas)
@@ -148,4 +336,103 @@ def generate_improvements(resume_text: str, jd: Dict) -> Dict[str, Any]:
         "suggestions": enriched,
         "notes": notes,
         "guardrails": guardrails,
+        "prompt_tokens": count_tokens(user),
     }
+
+
+async def agenerate_improvements(
+    resume_text: str, jd: Dict, provider: AsyncLLMProvider | None = None
+) -> Dict[str, Any]:
+    """
+    Async variant of generate_improvements for serving many requests from one process.
+    The baseline embedding (resume + JD vectors for the lift estimates) runs in a
+    worker thread while the LLM call is in flight; CPU-bound steps never block the loop.
+    """
+    loop = asyncio.get_running_loop()
+    baseline_job = loop.run_in_executor(None, compute_baseline, resume_text, jd)
+    gap = await loop.run_in_executor(None, build_gap_report, resume_text, jd)
+    user = _format_user_prompt(jd, resume_text, gap)
+
+    provider = provider or provider_from_env()
+    key, raw = _cached_response(provider, user)
+    if raw is None:
+        raw, baseline = await asyncio.gather(
+            provider.agenerate_json(SYSTEM_PROMPT, user, temperature=TEMPERATURE, max_tokens=1200),
+            baseline_job,
+        )
+        _remember_response(key, raw)
+    else:
+        baseline = await baseline_job
+    suggestions, notes, guardrails = _validate_response(raw)
+
+    enriched = await loop.run_in_executor(
+        None, partial(estimate_lifts, resume_text, jd, suggestions, baseline=baseline)
+    )
+    return {
+        "gap_report": gap,
+        "suggestions": enriched,
+        "notes": notes,
+        "guardrails": guardrails,
+        "prompt_tokens": count_tokens(user),
+    }
+
+
+def stream_improvements(
+    resume_text: str, jd: Dict, provider: LLMProvider | None = None
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Progressive generate_improvements for the UI: yields ("suggestion", item) for
+    each validated, lift-enriched suggestion as the provider produces it, then
+    ("result", payload) with the same shape generate_improvements returns.
+    Providers with a `stream_json` method and `stream` on (LocalProvider unless
+    GENAI_LOCAL_STREAM=0) stream token by token; others are called once and their
+    suggestions yielded after the call.
+    """
+    gap = build_gap_report(resume_text, jd)
+    user = _format_user_prompt(jd, resume_text, gap)
+    provider = provider or provider_from_env()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        baseline_job = pool.submit(compute_baseline, resume_text, jd)
+        key, cached = _cached_response(provider, user)
+        if cached is not None:
+            events = [("result", cached)]
+        elif hasattr(provider, "stream_json") and getattr(provider, "stream", False):
+            events = provider.stream_json(
+                SYSTEM_PROMPT, user, temperature=TEMPERATURE, max_tokens=1200
+            )
+        else:
+            raw = provider.generate_json(
+                SYSTEM_PROMPT, user, temperature=TEMPERATURE, max_tokens=1200
+            )
+            events = [("result", raw)]
+
+        enriched: List[Dict[str, Any]] = []
+        for kind, value in events:
+            if kind == "suggestion":
+                item = _clean_suggestion(value)
+                if item is None:
+                    continue
+                lifted = estimate_lifts(resume_text, jd, [item], baseline=baseline_job.result())
+                enriched.append(lifted[0])
+                yield "suggestion", lifted[0]
+                continue
+
+            suggestions, notes, guardrails = _validate_response(value)
+            if cached is None:
+                _remember_response(key, value)
+            if not enriched and suggestions:
+                # nothing was streamed item by item (non-streaming provider or a
+                # fallback parse): enrich in one batch
+                enriched = estimate_lifts(
+                    resume_text, jd, suggestions, baseline=baseline_job.result()
+                )
+                for item in enriched:
+                    yield "suggestion", item
+            yield "result", {
+                "gap_report": gap,
+                "suggestions": enriched,
+                "notes": notes,
+                "guardrails": guardrails,
+                "prompt_tokens": count_tokens(user),
+            }
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import glob
+import os
+import tarfile
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, Tuple
+
+from src.extract import MAX_DEFAULT, _text_from_bytes
+
+SUPPORTED = (".pdf", ".docx", ".txt")
+MAX_FILE_BYTES = 20 * 1024 * 1024
+_TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# A resume to parse: (display name, path on disk | bytes already read from an archive).
+_Job = Tuple[str, Any]
+# A damaged member (bad CRC, corrupt deflate stream, truncated data) fails on its own.
+_MEMBER_ERRORS = (zlib.error, zipfile.BadZipFile, OSError, EOFError, tarfile.TarError)
+
+
+def _supported(name: str) -> bool:
+    base = os.path.basename(name)
+    return name.lower().endswith(SUPPORTED) and not base.startswith((".", "~$"))
+
+
+def _is_archive(path: Path) -> bool:
+    name = path.name.lower()
+    return name.endswith(".zip") or name.endswith(_TAR_SUFFIXES)
+
+
+def _archive_jobs(path: Path, max_file_bytes: int) -> Iterator[_Job]:
+    """
+    Members are read one at a time, only when the consumer asks for them. A member
+    that cannot be read yields (name, error) and the next member is tried.
+    """
+    if path.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or "__MACOSX/" in info.filename or not _supported(info.filename):
+                    continue
+                name = f"{path.name}:{info.filename}"
+                if info.file_size > max_file_bytes:
+                    yield name, ValueError(f"file larger than {max_file_bytes} bytes")
+                    continue
+                try:
+                    data = zf.read(info)
+                except _MEMBER_ERRORS as e:
+                    yield name, e
+                    continue
+                yield name, data
+        return
+    with tarfile.open(path, mode="r:*") as tf:
+        for member in tf:
+            if not member.isfile() or not _supported(member.name):
+                continue
+            name = f"{path.name}:{member.name}"
+            if member.size > max_file_bytes:
+                yield name, ValueError(f"file larger than {max_file_bytes} bytes")
+                continue
+            try:
+                f = tf.extractfile(member)
+                data = f.read() if f is not None else b""
+            except _MEMBER_ERRORS as e:
+                yield name, e
+                continue
+            yield name, data
+
+
+def iter_sources(sources: str | os.PathLike | Iterable[str | os.PathLike]) -> Iterator[Path]:
+    """
+    Expand sources into files: a directory (recursive), a glob pattern, an
+    archive or a single file. Directory and glob matches are sorted for
+    deterministic order.
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+    for src in sources:
+        src_str = os.fspath(src)
+        path = Path(src_str)
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.is_file())
+        elif any(ch in src_str for ch in "*?["):
+            yield from (Path(p) for p in sorted(glob.glob(src_str, recursive=True)))
+        else:
+            yield path
+
+
+def _jobs(sources: Any, max_file_bytes: int) -> Iterator[_Job]:
+    for path in iter_sources(sources):
+        if _is_archive(path):
+            try:
+                yield from _archive_jobs(path, max_file_bytes)
+            except _MEMBER_ERRORS as e:  # unreadable archive (or its listing)
+                yield str(path), e
+        elif _supported(path.name):
+            yield str(path), path
+
+
+def _parse(name: str, payload: Any, max_chars: int, max_file_bytes: int) -> Dict[str, Any]:
+    """One file -> {"name", "text", "error"}; top-level so it runs in pool workers."""
+    try:
+        if isinstance(payload, Exception):
+            raise payload
+        if isinstance(payload, Path):
+            if payload.stat().st_size > max_file_bytes:
+                raise ValueError(f"file larger than {max_file_bytes} bytes")
+            payload = payload.read_bytes()
+        text = _text_from_bytes(name, payload, max_chars=max_chars)
+        return {"name": name, "text": text, "error": None}
+    except Exception as e:
+        return {"name": name, "text": None, "error": f"{type(e).__name__}: {e}"}
+
+
+def ingest(
+    sources: str | os.PathLike | Iterable[str | os.PathLike],
+    *,
+    max_chars: int = MAX_DEFAULT,
+    workers: int = 0,
+    max_pending: int | None = None,
+    max_file_bytes: int = MAX_FILE_BYTES,
+    executor: Executor | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse every PDF/DOCX/TXT found in `sources` (directories, globs, zip/tar
+    archives or files) and yield {"name", "text", "error"} in discovery order.
+    Failures never raise: the file's dict carries the error and text=None.
+
+    workers > 0 (or an executor) parses in a process pool. At most max_pending
+    files (default 4 per worker) are read or in flight at once, so memory stays
+    bounded however large the source is; with an executor, workers should give
+    its size for that default.
+    """
+    pool = executor or (ProcessPoolExecutor(workers) if workers > 0 else None)
+    if pool is None:
+        for name, payload in _jobs(sources, max_file_bytes):
+            yield _parse(name, payload, max_chars, max_file_bytes)
+        return
+
+    limit = max_pending or 4 * max(1, workers)
+    pending: Deque[Future] = deque()
+    try:
+        for name, payload in _jobs(sources, max_file_bytes):
+            pending.append(pool.submit(_parse, name, payload, max_chars, max_file_bytes))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        if executor is None:
+            pool.shutdown()
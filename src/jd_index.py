@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
+
+
+def _repo_root() -> Path:
+    # .../src/jd_index.py -> repo root
+    return Path(__file__).resolve().parents[1]
+
+
+def default_index_dir() -> Path:
+    """
+    JD_INDEX_DIR overrides the on-disk location (default: <repo>/.cache/jd_index).
+    """
+    env = os.getenv("JD_INDEX_DIR")
+    return Path(env) if env else _repo_root() / ".cache" / "jd_index"
+
+
+def jd_content_hash(jd: Dict) -> str:
+    text = jd.get("text", "") or ""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value).strip("_") or "jd"
+
+
+def _tmp_path(path: Path) -> Path:
+    # unique per process/thread: pool workers may write the same index concurrently
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _save_array(path: Path, arr: np.ndarray) -> None:
+    tmp = _tmp_path(path)
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, path)
+
+
+@dataclass
+class JDEntry:
+    jd_id: str
+    content_hash: str
+    sentences: List[str]
+    vector: np.ndarray  # pooled, L2-normalized JD vector (dim,)
+    sentence_matrix: np.ndarray  # one normalized row per sentence (n_sentences, dim)
+
+
+class JDIndex:
+    """
+    Disk-backed store of JD embeddings keyed by (model name, JD id, content hash).
+
+    Each JD gets two .npy files (pooled vector + per-sentence matrix) that are
+    opened memory-mapped, plus a small <jd>.json meta file recording which hash they
+    belong to. Meta files are per JD and read fresh from disk, so instances or
+    processes sharing the directory never overwrite each other's entries.
+    An entry is re-encoded only when the JD text changes.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        model_name: str,
+        *,
+        embed_fn: Callable[[str], np.ndarray],
+        encode_fn: Callable[[List[str]], np.ndarray],
+        split_fn: Callable[[str], List[str]],
+    ):
+        self.model_name = model_name
+        self.dir = Path(root) / _slug(model_name)
+        self._embed = embed_fn
+        self._encode = encode_fn
+        self._split = split_fn
+        self._lock = threading.Lock()
+        self._entries: Dict[str, JDEntry] = {}
+        self.builds = 0  # number of JDs encoded by this instance
+
+    # ---- per-JD meta ----
+    def _meta_path(self, jd_id: str) -> Path:
+        return self.dir / f"{_slug(jd_id)}.json"
+
+    def _read_meta(self, jd_id: str) -> Dict | None:
+        try:
+            with open(self._meta_path(jd_id), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("id", jd_id) == jd_id else None  # slug collision
+
+    def _write_meta(self, jd_id: str, meta: Dict) -> None:
+        path = self._meta_path(jd_id)
+        tmp = _tmp_path(path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    # ---- entries ----
+    def _load_entry(self, jd_id: str, meta: Dict) -> JDEntry | None:
+        vec_path = self.dir / meta["vector_file"]
+        sent_path = self.dir / meta["sentences_file"]
+        if not vec_path.exists() or not sent_path.exists():
+            return None
+        return JDEntry(
+            jd_id=jd_id,
+            content_hash=meta["hash"],
+            sentences=list(meta.get("sentences", [])),
+            vector=np.load(vec_path, mmap_mode="r"),
+            sentence_matrix=np.load(sent_path, mmap_mode="r"),
+        )
+
+    def _build_entry(self, jd_id: str, jd: Dict, content_hash: str) -> JDEntry:
+        text = jd.get("text", "") or ""
+        vector = np.asarray(self._embed(text), dtype=np.float32)
+        sentences = self._split(text)
+        if sentences:
+            sent_embs = np.asarray(self._encode(sentences), dtype=np.float32)
+        else:
+            sent_embs = np.zeros((0, vector.shape[0]), dtype=np.float32)
+
+        stem = f"{_slug(jd_id)}-{content_hash[:16]}"
+        meta = {
+            "id": jd_id,
+            "hash": content_hash,
+            "model": self.model_name,
+            "sentences": sentences,
+            "vector_file": f"{stem}.vec.npy",
+            "sentences_file": f"{stem}.sent.npy",
+        }
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _save_array(self.dir / meta["vector_file"], vector)
+        _save_array(self.dir / meta["sentences_file"], sent_embs)
+
+        old = self._read_meta(jd_id)  # fresh: another process may have updated it
+        self._write_meta(jd_id, meta)
+        if old and old.get("hash") != content_hash:
+            # drop the stale arrays of the previous JD text
+            for key in ("vector_file", "sentences_file"):
+                try:
+                    (self.dir / old[key]).unlink()
+                except (OSError, KeyError):
+                    pass
+
+        self.builds += 1
+        return self._load_entry(jd_id, meta) or JDEntry(
+            jd_id, content_hash, sentences, vector, sent_embs
+        )
+
+    def get(self, jd: Dict) -> JDEntry:
+        """
+        Return the indexed entry for a JD, encoding it only if it is new or its text changed.
+        JDs without an id are keyed by their content hash.
+        """
+        content_hash = jd_content_hash(jd)
+        jd_id = str(jd.get("id") or content_hash[:16])
+        with self._lock:
+            entry = self._entries.get(jd_id)
+            if entry is not None and entry.content_hash == content_hash:
+                return entry
+
+            meta = self._read_meta(jd_id)
+            if meta and meta.get("hash") == content_hash and meta.get("model") == self.model_name:
+                entry = self._load_entry(jd_id, meta)
+            else:
+                entry = None
+            if entry is None:
+                entry = self._build_entry(jd_id, jd, content_hash)
+            self._entries[jd_id] = entry
+            return entry
+
+    def build(self, jds: Iterable[Dict]) -> List[JDEntry]:
+        """Index (or refresh) every JD in the catalogue."""
+        return [self.get(jd) for jd in jds]
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from src.jd_index import _tmp_path
+from src.score_stub import _tokenize
+from src.skills import get_skill_matcher, load_skill_aliases
+
+SKILL_PREFIX = "skill:"
+
+
+def canonical_skills(skills: Iterable[str]) -> set:
+    """
+    Canonical names for listed skills through the same alias table as text, so a JD
+    listing "PostgreSQL" or "REST APIs" gets skill:postgres / skill:rest. Skills the
+    alias map does not know are kept lowercased.
+    """
+    matcher = get_skill_matcher((), load_skill_aliases())
+    out = set()
+    for skill in skills:
+        name = (skill or "").lower().strip()
+        if name:
+            out |= matcher.find(name) or {name}
+    return out
+
+
+def search_terms(text: str, skills: Iterable[str] = ()) -> Counter:
+    """
+    Term frequencies for BM25: stub tokens (regex + stopwords) plus one
+    `skill:<canonical>` term per skill from skill_aliases.json found in the text
+    (so "PSQL" and "PostgreSQL" meet) and per explicitly listed skill.
+    """
+    terms = Counter(_tokenize(text or ""))
+    found = get_skill_matcher((), load_skill_aliases()).find(text or "")
+    found |= canonical_skills(skills)
+    for skill in found:
+        terms[SKILL_PREFIX + skill] += 1
+    return terms
+
+
+class JDSearch:
+    """
+    BM25 inverted index over JDs (title + text + skills) for candidate generation.
+
+    Postings are kept as {term: {slot: tf}} so JDs can be added and removed one at
+    a time; slots freed by remove() are reused by the next add(). On first use
+    after a change, a term's postings are compiled to NumPy arrays of (slot, BM25
+    weight); idf and length normalization depend on the whole catalogue, so any
+    add/remove invalidates them. A query sums the weights of its
+    terms per slot (np.bincount) and takes the top k with np.argpartition.
+    """
+
+    def __init__(self, jds: Iterable[Dict] = (), *, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._jds: Dict[str, Dict] = {}
+        self._slot: Dict[str, int] = {}
+        self._ids: List[str | None] = []  # slot -> JD id (None while free)
+        self._free: List[int] = []  # slots released by remove(), reused by add()
+        self._lengths: List[int] = []
+        self._doc_terms: List[Dict[str, int] | None] = []
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._length_norm: np.ndarray | None = None
+        self._total_length = 0
+        for jd in jds:
+            self.add(jd)
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, jd_id: str) -> bool:
+        return jd_id in self._slot
+
+    def get(self, jd_id: str) -> Dict | None:
+        """O(1) counterpart of jds.get_jd_by_id."""
+        return self._jds.get(jd_id)
+
+    # ---- incremental updates ----
+
+    def add(self, jd: Dict, *, terms: Dict[str, int] | None = None) -> None:
+        """Index (or re-index, if the id is already present) one JD."""
+        jd_id = jd.get("id")
+        if jd_id in self._slot:
+            self.remove(jd_id)
+        if terms is None:
+            text = f"{jd.get('title', '')}\n{jd.get('text', '')}"
+            terms = search_terms(text, jd.get("skills", []) or [])
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._ids)
+            self._ids.append(None)
+            self._lengths.append(0)
+            self._doc_terms.append(None)
+        self._ids[slot] = jd_id
+        self._lengths[slot] = sum(terms.values())
+        self._doc_terms[slot] = dict(terms)
+        self._total_length += self._lengths[slot]
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[slot] = tf
+        self._invalidate()
+        self._slot[jd_id] = slot
+        self._jds[jd_id] = jd
+
+    def remove(self, jd_id: str) -> bool:
+        slot = self._slot.pop(jd_id, None)
+        if slot is None:
+            return False
+        del self._jds[jd_id]
+        for term in self._doc_terms[slot]:
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths[slot]
+        self._ids[slot], self._doc_terms[slot], self._lengths[slot] = None, None, 0
+        self._free.append(slot)
+        self._invalidate()
+        return True
+
+    def _invalidate(self) -> None:
+        self._compiled.clear()
+        self._length_norm = None
+
+    # ---- search ----
+
+    def _term_weights(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(slots, BM25 weight of the term in each) for the current catalogue."""
+        arrays = self._compiled.get(term)
+        if arrays is None:
+            if self._length_norm is None:
+                lengths = np.asarray(self._lengths, dtype=np.float32)
+                avgdl = self._total_length / len(self._slot)
+                self._length_norm = self.k1 * (1.0 - self.b + self.b * lengths / avgdl)
+            postings = self._postings[term]
+            n, df = len(self._slot), len(postings)
+            docs = np.fromiter(postings.keys(), dtype=np.int64, count=df)
+            tf = np.fromiter(postings.values(), dtype=np.float32, count=df)
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            weights = idf * tf * (self.k1 + 1.0) / (tf + self._length_norm[docs])
+            arrays = self._compiled[term] = (docs, weights.astype(np.float32))
+        return arrays
+
+    def search_terms(self, terms: Iterable[str], k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (JD id, BM25 score) for a bag of query terms (each counted once)."""
+        if not self._slot or k <= 0:
+            return []
+        compiled = [self._term_weights(t) for t in set(terms) if t in self._postings]
+        if not compiled:
+            return []
+        docs = np.concatenate([d for d, _ in compiled])
+        weights = np.concatenate([w for _, w in compiled])
+        scores = np.bincount(docs, weights=weights, minlength=len(self._ids))
+
+        hits = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        hits = hits[scores[hits] > 0]
+        hits = hits[np.lexsort((hits, -scores[hits]))]  # score desc, then slot
+        return [(self._ids[i], float(scores[i])) for i in hits]
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (JD id, BM25 score) for a resume or free-text query."""
+        return self.search_terms(search_terms(text), k)
+
+    def candidates(self, resume_text: str, k: int = 50) -> List[Dict]:
+        """
+        Top-k JDs for a resume, ready for score_embed.rank_jds(resume_text, candidates)
+        so only they are embedded and scored.
+        """
+        return [self._jds[jd_id] for jd_id, _ in self.search(resume_text, k)]
+
+    # ---- persistence ----
+
+    def save(self, path: str | Path) -> None:
+        """JDs plus their term frequencies as JSON (written atomically)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        docs = [
+            {"jd": self._jds[jd_id], "terms": self._doc_terms[slot]}
+            for jd_id, slot in sorted(self._slot.items(), key=lambda kv: kv[1])
+        ]
+        tmp = _tmp_path(path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "k1": self.k1, "b": self.b, "docs": docs}, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "JDSearch":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data.get("k1", 1.2), b=data.get("b", 0.75))
+        for doc in data["docs"]:
+            index.add(doc["jd"], terms=doc["terms"])
+        return index
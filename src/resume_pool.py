@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from src.extract import MAX_DEFAULT, extract_text_from_file, extract_text_from_path
+from src.ingest import ingest
+from src.jds import get_jd_by_id, load_jds
+from src.score_embed import _core_result, _get_jd_index, _top_sentences, embed_texts
+from src.skills import find_skills, load_skill_aliases
+
+
+def _as_text(item: Any, max_chars: int) -> Tuple[str, str]:
+    """
+    Resolve one pool item to (name, text).
+    Plain strings are resume text; (name, text) tuples (e.g. from src.ingest) are
+    taken as is; Paths/PathLike are read from disk; objects with .read() (e.g.
+    Streamlit uploads) go through extract_text_from_file.
+    """
+    if isinstance(item, str):
+        return "", item[:max_chars]
+    if isinstance(item, tuple) and len(item) == 2:
+        return str(item[0]), str(item[1])[:max_chars]
+    if isinstance(item, os.PathLike):
+        return str(item), extract_text_from_path(item, max_chars=max_chars)
+    if hasattr(item, "read"):
+        return getattr(item, "name", "") or "", extract_text_from_file(item, max_chars=max_chars)
+    raise TypeError(f"Unsupported resume item: {type(item).__name__}")
+
+
+def _blocks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(items)
+    while True:
+        block = list(islice(it, size))
+        if not block:
+            return
+        yield block
+
+
+def rank_resume_pool(
+    resumes: Iterable[Any],
+    jd: Dict,
+    top_k: int = 10,
+    top_n: int = 3,
+    *,
+    batch_size: int = 64,
+    block_size: int = 512,
+    max_chars: int = MAX_DEFAULT,
+) -> Dict:
+    """
+    Rank a pool of resumes (texts, paths or uploaded files) against one JD.
+
+    Resumes are read block_size at a time, embedded with one encode call per block
+    (batch_size chunks per forward pass), scored against the indexed JD vector with a
+    single matmul, and only the best top_k are kept on a min-heap. CPU-only is fine.
+    Returns {"results": [core dicts + resume_index/resume_name], "stats": {...}}.
+    """
+    t0 = time.perf_counter()
+    entry = _get_jd_index().get(jd)
+    jd_vec = np.asarray(entry.vector, dtype=np.float32)
+    jd_skills = jd.get("skills", []) or []
+    aliases = load_skill_aliases()
+
+    heap: List[Tuple[float, int, str, str, np.ndarray, List[str]]] = []
+    n = 0
+    for block in _blocks(resumes, block_size):
+        named = [_as_text(item, max_chars) for item in block]
+        texts = [t for _, t in named]
+        vecs = embed_texts(texts, batch_size=batch_size)
+        semantic = vecs @ jd_vec
+
+        for j, (name, text) in enumerate(named):
+            matched = find_skills(text, jd_skills, alias_map=aliases)
+            coverage = (len(matched) / len(jd_skills)) if jd_skills else 0.0
+            final = 100.0 * (0.7 * float(semantic[j]) + 0.3 * coverage)
+            # negative index keeps earlier resumes ahead on ties
+            item = (final, -(n + j), name, text, vecs[j], matched)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif top_k > 0 and item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        n += len(block)
+
+    results = []
+    for final, neg_idx, name, text, vec, matched in sorted(heap, key=lambda x: x[:2], reverse=True):
+        coverage = (len(matched) / len(jd_skills)) if jd_skills else 0.0
+        missing = [s for s in jd_skills if s not in matched]
+        core = _core_result(
+            jd,
+            text,
+            final,
+            float(np.dot(vec, jd_vec)),
+            coverage,
+            matched,
+            missing,
+            _top_sentences(entry, vec, top_n),
+        )
+        core["resume_index"] = -neg_idx
+        core["resume_name"] = name
+        results.append(core)
+
+    seconds = time.perf_counter() - t0
+    return {
+        "results": results,
+        "stats": {
+            "n_resumes": n,
+            "seconds": round(seconds, 4),
+            "resumes_per_sec": round(n / seconds, 2) if seconds > 0 else 0.0,
+            "batch_size": batch_size,
+        },
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Rank a folder/list of resumes against one JD.")
+    ap.add_argument(
+        "resumes", nargs="+", help="resume files (PDF/DOCX/TXT), directories, globs or zip/tar"
+    )
+    ap.add_argument("--jd-id", required=True)
+    ap.add_argument("--jds", default=str(Path("data") / "jds.json"))
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--workers", type=int, default=0, help="parse files in a process pool")
+    args = ap.parse_args(argv)
+
+    jd = get_jd_by_id(load_jds(Path(args.jds)), args.jd_id)
+    if jd is None:
+        raise SystemExit(f"Unknown JD id: {args.jd_id}")
+
+    def parsed():
+        for doc in ingest(args.resumes, workers=args.workers):
+            if doc["error"]:
+                print(f"skipped {doc['name']}: {doc['error']}", file=sys.stderr)
+            else:
+                yield doc["name"], doc["text"]
+
+    out = rank_resume_pool(parsed(), jd, top_k=args.top_k, batch_size=args.batch_size)
+    for r in out["results"]:
+        print(f"{r['overall_score']:6.2f}  {r['resume_name']}")
+    print(json.dumps(out["stats"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -64,3 +64,30 @@ def wrap_result(
             "truncated_preview": bool(truncated),
         },
     }
+
+
+def wrap_improvements(
+    payload: Dict,  # generate_improvements output: gap_report, suggestions, notes, guardrails, prompt_tokens
+    *,
+    jd_id: str | None,
+    jd_title: str,
+    backend: str,
+    latency_ms: int,
+) -> Dict:
+    """
+    Same versioned envelope as wrap_result (schema version, run id, timestamp,
+    backend, latency, JD) around an improvement payload, which is kept whole under
+    "improvements" since it has no metrics/skills/explanations to normalize.
+    """
+    return {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "run_id": str(uuid.uuid4())[:8],
+        "timestamp_utc": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "backend": backend,  # "genai:MockProvider" | "genai:LocalProvider" | "genai:OpenAIProvider"
+        "latency_ms": int(latency_ms),
+        "jd": {
+            "id": jd_id,
+            "title": jd_title,
+        },
+        "improvements": payload,
+    }
@@ -1,25 +1,176 @@
 from __future__ import annotations
 
+import os
 import re
-from typing import Dict, List
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
 # add this import near the top
 from skills import find_skills, load_skill_aliases
+from src.embed_cache import EmbeddingCache, make_key
+from src.encoders import (
+    MODEL_NAME,
+    OnnxEncoder,
+    encode_token_ids,
+    encoder_backend,
+    load_encoder,
+    n_special_tokens,
+)
+from src.jd_index import JDEntry, JDIndex, default_index_dir
+from src.jds import load_jds
 
 
+CHUNK_SIZE = 250  # words per chunk
+CHUNK_OVERLAP = 50
+TOKEN_STRIDE = int(os.getenv("EMBED_CHUNK_STRIDE", "32"))  # tokens shared by token windows
+
 # ---- model loading (lazy singletons) ----
-_MODEL: SentenceTransformer | None = None
+_MODEL: SentenceTransformer | OnnxEncoder | None = None
+_MODEL_BACKEND: str | None = None
+_JD_INDEX: JDIndex | None = None
+_EMBED_CACHE: EmbeddingCache | None = None
+_MODEL_LOCK = threading.Lock()
+
+# ---- warm-up / readiness ----
+_READY = threading.Event()
+_WARMUP_THREAD: threading.Thread | None = None
+_WARMUP_ERROR: str | None = None
+
+
+def _mark_ready() -> None:
+    """The encoder is loaded: ready, and any earlier warm-up error is stale."""
+    global _WARMUP_ERROR
+    _WARMUP_ERROR = None
+    _READY.set()
+
+
+def _get_model() -> SentenceTransformer | OnnxEncoder:
+    """Encoder for the configured EMBED_BACKEND (torch | onnx | onnx-int8)."""
+    global _MODEL, _MODEL_BACKEND
+    backend = encoder_backend()
+    with _MODEL_LOCK:  # a background warm-up and a request must not both load the model
+        if _MODEL is None or _MODEL_BACKEND != backend:
+            _MODEL = load_encoder(backend, MODEL_NAME)
+            _MODEL_BACKEND = backend
+            _mark_ready()  # also after a failed warm-up, when a request loads it
+        return _MODEL
+
+
+def _warm_up(jds_path: Path | str | None) -> None:
+    global _WARMUP_ERROR
+    try:
+        model = _get_model()
+        # dummy forward pass: lazy init, kernel selection, buffer allocation
+        model.encode(["warm-up"], normalize_embeddings=True)
+        if jds_path is not None:
+            _get_jd_index().build(load_jds(Path(jds_path)))
+        _mark_ready()
+    except Exception as e:  # surfaced through readiness(), the first request retries
+        _WARMUP_ERROR = f"{type(e).__name__}: {e}"
+
+
+def warm_up(
+    jds_path: Path | str | None = None, *, background: bool = False
+) -> threading.Thread | None:
+    """
+    Load the encoder, run a dummy encode and (optionally) pre-build the JD index
+    from jds_path. With background=True this runs in a daemon thread and returns it;
+    calling again while a warm-up is running or finished is a no-op.
+    """
+    global _WARMUP_THREAD
+    if _READY.is_set():
+        return None
+    if _WARMUP_THREAD is not None and _WARMUP_THREAD.is_alive():
+        return _WARMUP_THREAD
+    if not background:
+        _warm_up(jds_path)
+        return None
+    _WARMUP_THREAD = threading.Thread(
+        target=_warm_up, args=(jds_path,), name="embed-warm-up", daemon=True
+    )
+    _WARMUP_THREAD.start()
+    return _WARMUP_THREAD
+
+
+def is_ready() -> bool:
+    """True once the encoder is loaded and warmed up."""
+    return _READY.is_set()
+
+
+def readiness() -> Dict:
+    warming = _WARMUP_THREAD is not None and _WARMUP_THREAD.is_alive()
+    return {
+        "ready": is_ready(),
+        "warming_up": warming,
+        "backend": encoder_backend(),
+        "error": _WARMUP_ERROR,
+    }
+
+
+def _model_id() -> str:
+    # backend is part of cache/index keys: ONNX vectors are close to, not equal to, torch's
+    backend = encoder_backend()
+    return MODEL_NAME if backend == "torch" else f"{MODEL_NAME}:{backend}"
+
+
+def chunking_mode() -> str:
+    """
+    EMBED_CHUNKING: 'words' (default, ~250-word windows) | 'tokens' (tokenizer-exact windows)
+    """
+    mode = os.getenv("EMBED_CHUNKING", "words").lower().strip()
+    return "tokens" if mode == "tokens" else "words"
+
+
+def _chunk_params() -> str:
+    if chunking_mode() == "tokens":
+        return f"tokens:{_get_model().max_seq_length}:{TOKEN_STRIDE}"
+    return f"words:{CHUNK_SIZE}:{CHUNK_OVERLAP}"
+
+
+def _get_embed_cache() -> EmbeddingCache:
+    """
+    Process-wide embedding cache keyed by (model id, chunking params, text hash).
+    EMBED_CACHE_MB bounds the in-memory LRU (default 64); EMBED_CACHE_PATH enables
+    the SQLite tier that survives restarts, bounded by EMBED_CACHE_MAX_ROWS and
+    EMBED_CACHE_TTL (seconds; both unset/0 = unbounded).
+    """
+    global _EMBED_CACHE
+    if _EMBED_CACHE is None:
+        max_mb = float(os.getenv("EMBED_CACHE_MB", "64"))
+        _EMBED_CACHE = EmbeddingCache(
+            max_bytes=int(max_mb * 1024 * 1024),
+            disk_path=os.getenv("EMBED_CACHE_PATH") or None,
+            max_rows=int(os.getenv("EMBED_CACHE_MAX_ROWS", "0")),
+            max_age=float(os.getenv("EMBED_CACHE_TTL", "0")),
+        )
+    return _EMBED_CACHE
+
+
+def _jd_index_key() -> str:
+    # JD vectors are pooled like resume vectors, so they must share the chunking scheme
+    return f"{_model_id()}|{_chunk_params()}"
 
 
-def _get_model() -> SentenceTransformer:
-    global _MODEL
-    if _MODEL is None:
-        # Fast, small, great baseline. Downloads once to cache.
-        _MODEL = SentenceTransformer("all-MiniLM-L6-v2")  # ~80MB
-    return _MODEL
+def _get_jd_index() -> JDIndex:
+    """
+    Persistent JD embedding index (pooled vector + sentence matrix per JD), one per
+    (model id, chunking params) so both embedding schemes never mix in one score.
+    """
+    global _JD_INDEX
+    key = _jd_index_key()
+    if _JD_INDEX is None or _JD_INDEX.model_name != key:
+        _JD_INDEX = JDIndex(
+            default_index_dir(),
+            key,
+            embed_fn=_embed_text,
+            encode_fn=_encode_sentences,
+            split_fn=_split_sentences,
+        )
+    return _JD_INDEX
 
 
 # ---- small helpers ----
@@ -32,6 +183,15 @@ def embed_text(text: str):
     return _embed_text(text)
 
 
+def jd_vector(jd: Dict) -> np.ndarray:
+    """Pooled JD vector, served from the persistent JD index."""
+    return np.asarray(_get_jd_index().get(jd).vector, dtype=np.float32)
+
+
+def _split_sentences(text: str) -> List[str]:
+    return [s for s in re.split(r"(?<=[.!?])\s+", (text or "").strip()) if s]
+
+
 def _chunk_words(words: List[str], size: int = 250, overlap: int = 50) -> List[str]:
     """
     Break a long text into ~word-sized chunks so we don't lose information
@@ -56,21 +216,143 @@ def _chunk_words(words: List[str], size: int = 250, overlap: int = 50) -> List[s
 def _embed_text(text: str) -> np.ndarray:
     """
     Embed (possibly long) text by chunking -> mean-pooling chunk embeddings.
-    Returns a single L2-normalized vector.
+    Returns a single L2-normalized vector (served from the embedding cache when possible).
+    """
+    return embed_texts([text])[0]
+
+
+def _chunk_tokens(text: str, stride: int) -> List[Tuple[int, ...]]:
+    """
+    Tokenize once with the model tokenizer and cut the ids into windows that exactly
+    fill max_seq_length (minus [CLS]/[SEP]); consecutive windows share `stride` tokens.
     """
     model = _get_model()
+    tokenizer = model.tokenizer
+    ids = tokenizer(text or "", add_special_tokens=False, truncation=False, verbose=False)[
+        "input_ids"
+    ]
+    window = model.max_seq_length - n_special_tokens(tokenizer)
+    if not ids:
+        return [()]
+    step = max(window - stride, 1)
+    chunks = []
+    i = 0
+    while True:
+        chunks.append(tuple(ids[i : i + window]))
+        if i + window >= len(ids):
+            break
+        i += step
+    return chunks
+
+
+def _chunk_text(text: str) -> List[str | Tuple[int, ...]]:
+    """Chunks for one text: word windows (strings) or token-id windows (tuples)."""
+    if chunking_mode() == "tokens":
+        return _chunk_tokens(text, TOKEN_STRIDE)
     words = _tokenize_words(text)
-    if not words:
-        # fall back to embedding of empty string (will be zero-ish vector)
-        vec = model.encode([""], normalize_embeddings=True)[0]
-        return vec.astype(np.float32)
+    # texts without words fall back to the embedding of the empty string (zero-ish vector)
+    return _chunk_words(words, size=CHUNK_SIZE, overlap=CHUNK_OVERLAP) if words else [""]
+
+
+def chunk_counts(texts: List[str]) -> List[int]:
+    """How many chunks (= encoder forward-pass rows) each text produces."""
+    return [len(_chunk_text(t)) for t in texts]
+
+
+def _encode_chunks(chunks: List[str | Tuple[int, ...]], batch_size: int) -> np.ndarray:
+    """
+    Encode chunks through the chunk-level cache: only chunks never seen before
+    (e.g. the window an edit touched) reach the encoder, in one batched call.
+    Token-id chunks go straight to the model without re-tokenizing.
+    """
+    cache = _get_embed_cache()
+    model_id = _model_id()
+    keys = [
+        (
+            make_key(model_id, "chunk", c)
+            if isinstance(c, str)
+            else make_key(model_id, "ids", ",".join(map(str, c)))
+        )
+        for c in chunks
+    ]
+    vecs: Dict[str, np.ndarray] = {}
+    todo: Dict[str, str | Tuple[int, ...]] = {}
+    for key, chunk in zip(keys, chunks):
+        if key in vecs or key in todo:
+            continue
+        hit = cache.get(key)
+        if hit is None:
+            todo[key] = chunk
+        else:
+            vecs[key] = hit
+
+    if todo:
+        model = _get_model()
+        pending = list(todo.values())
+        if isinstance(pending[0], str):
+            embs = model.encode(pending, batch_size=batch_size, normalize_embeddings=True)
+        else:
+            embs = encode_token_ids(model, [list(c) for c in pending], batch_size=batch_size)
+        stored = cache.put_many(zip(todo, np.asarray(embs, dtype=np.float32)))
+        vecs.update(zip(todo, stored))
+    return np.stack([vecs[k] for k in keys])
+
+
+def _pool_chunks(texts: List[str], batch_size: int) -> np.ndarray:
+    chunks: List[str | Tuple[int, ...]] = []
+    owners: List[int] = []
+    for i, text in enumerate(texts):
+        text_chunks = _chunk_text(text)
+        chunks.extend(text_chunks)
+        owners.extend([i] * len(text_chunks))
+
+    embs = _encode_chunks(chunks, batch_size)
+    # mean-pool per text then renormalize to unit vectors
+    pooled = np.zeros((len(texts), embs.shape[1]), dtype=np.float32)
+    np.add.at(pooled, np.asarray(owners), embs)
+    pooled /= np.linalg.norm(pooled, axis=1, keepdims=True) + 1e-12
+    return pooled
+
+
+def embed_texts(texts: List[str], batch_size: int = 64) -> np.ndarray:
+    """
+    Batched version of _embed_text: texts missing from the embedding cache are chunked,
+    their uncached chunks are encoded in one model.encode call (batch_size chunks per
+    forward pass) and the chunk vectors are mean-pooled per text.
+    Returns an (n_texts, dim) matrix of L2-normalized rows.
+    """
+    cache = _get_embed_cache()
+    params = _chunk_params()
+    keys = [make_key(_model_id(), params, t or "") for t in texts]
+    vecs: Dict[str, np.ndarray] = {}
+    todo: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key in vecs or key in todo:
+            continue
+        hit = cache.get(key)
+        if hit is None:
+            todo[key] = text or ""
+        else:
+            vecs[key] = hit
+
+    if todo:
+        pooled = _pool_chunks(list(todo.values()), batch_size)
+        vecs.update(zip(todo, cache.put_many(zip(todo, pooled))))
 
-    chunks = _chunk_words(words, size=250, overlap=50)
-    embs = model.encode(chunks, normalize_embeddings=True)
-    # mean-pool then renormalize to unit vector
-    mean_vec = np.mean(embs, axis=0)
-    norm = np.linalg.norm(mean_vec) + 1e-12
-    return (mean_vec / norm).astype(np.float32)
+    if not keys:
+        return np.zeros((0, _get_model().get_sentence_embedding_dimension()), dtype=np.float32)
+    return np.stack([vecs[k] for k in keys])
+
+
+def embedding_cache_stats() -> Dict[str, int]:
+    """Hit/miss/eviction counters of the process-wide embedding cache."""
+    return _get_embed_cache().stats()
+
+
+def _encode_sentences(sentences: List[str]) -> np.ndarray:
+    """One normalized embedding per sentence (no chunking; sentences are short)."""
+    model = _get_model()
+    return np.asarray(model.encode(sentences, normalize_embeddings=True), dtype=np.float32)
 
 
 """
@@ -90,13 +372,23 @@ def _cosine(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b))
 
 
-def compute_embed_scores(resume_text: str, jd: Dict, top_n: int = 3) -> Dict:
-    jd_text = jd.get("text", "") or ""
+def compute_embed_scores(
+    resume_text: str,
+    jd: Dict,
+    top_n: int = 3,
+    *,
+    jd_index: JDIndex | None = None,
+    resume_vec: np.ndarray | None = None,
+) -> Dict:
     jd_skills = jd.get("skills", []) or []
 
-    # Semantic similarity via embeddings
-    resume_vec = _embed_text(resume_text)
-    jd_vec = _embed_text(jd_text)
+    # JD vectors come from the persistent index; only the resume hits the encoder
+    entry = (jd_index or _get_jd_index()).get(jd)
+
+    # Semantic similarity via embeddings (callers that batch encodes pass resume_vec)
+    if resume_vec is None:
+        resume_vec = _embed_text(resume_text)
+    jd_vec = entry.vector
     semantic = _cosine(resume_vec, jd_vec)  # already normalized → cosine in [~0,1]
 
     # Skills coverage
@@ -114,16 +406,31 @@ def compute_embed_scores(resume_text: str, jd: Dict, top_n: int = 3) -> Dict:
     # Final score (same formula)
     final = 100.0 * (0.7 * semantic + 0.3 * coverage)
 
-    # Explainability: sentence-level sims (embed each JD sentence vs resume vector)
-    sentences = [s for s in re.split(r"(?<=[.!?])\s+", jd_text.strip()) if s]
-    top_sent = []
-    if sentences:
-        model = _get_model()
-        sent_embs = model.encode(sentences, normalize_embeddings=True)
-        sims = np.dot(sent_embs, resume_vec)  # cosine per sentence
-        order = np.argsort(-sims)[:top_n]
-        top_sent = [{"sentence": sentences[i], "similarity": float(sims[i])} for i in order]
+    # Explainability: sentence-level sims (indexed JD sentence vectors vs resume vector)
+    top_sent = _top_sentences(entry, resume_vec, top_n)
+
+    return _core_result(jd, resume_text, final, semantic, coverage, matched, missing, top_sent)
+
+
+def _top_sentences(entry: JDEntry, resume_vec: np.ndarray, top_n: int) -> List[Dict]:
+    sentences = entry.sentences
+    if not sentences:
+        return []
+    sims = np.dot(entry.sentence_matrix, resume_vec)  # cosine per sentence
+    order = np.argsort(-sims)[:top_n]
+    return [{"sentence": sentences[i], "similarity": float(sims[i])} for i in order]
 
+
+def _core_result(
+    jd: Dict,
+    resume_text: str,
+    final: float,
+    semantic: float,
+    coverage: float,
+    matched: List[str],
+    missing: List[str],
+    top_sent: List[Dict],
+) -> Dict:
     return {
         "jd_id": jd.get("id"),
         "overall_score": round(final, 2),
@@ -134,3 +441,62 @@ def compute_embed_scores(resume_text: str, jd: Dict, top_n: int = 3) -> Dict:
         "resume_text_preview": resume_text,
         "top_matching_jd_sentences": top_sent,
     }
+
+
+def rank_jds(
+    resume_text: str,
+    jds: List[Dict],
+    top_k: int = 5,
+    top_n: int = 3,
+    *,
+    jd_index: JDIndex | None = None,
+    resume_vec: np.ndarray | None = None,
+) -> List[Dict]:
+    """
+    Rank a whole JD catalogue for one resume.
+    The resume is embedded once and scored against the stacked JD matrix in a single
+    matrix-vector product; skills are matched once over the union of all JD skills.
+    Returns up to top_k core dicts (same keys as compute_embed_scores), best first.
+    """
+    if not jds or top_k <= 0:
+        return []
+    entries = (jd_index or _get_jd_index()).build(jds)
+
+    if resume_vec is None:
+        resume_vec = _embed_text(resume_text)
+    jd_matrix = np.stack([np.asarray(e.vector, dtype=np.float32) for e in entries])
+    semantic = jd_matrix @ resume_vec  # (n_jds,)
+
+    # one skills pass over the union of JD skills, then per-JD lookups
+    all_skills = list(dict.fromkeys(s for jd in jds for s in (jd.get("skills", []) or [])))
+    found = set(find_skills(resume_text, all_skills, alias_map=load_skill_aliases()))
+    n_skills = np.array([len(jd.get("skills", []) or []) for jd in jds], dtype=np.float32)
+    n_matched = np.array(
+        [sum(1 for s in dict.fromkeys(jd.get("skills", []) or []) if s in found) for jd in jds],
+        dtype=np.float32,
+    )
+    coverage = np.divide(n_matched, n_skills, out=np.zeros_like(n_skills), where=n_skills > 0)
+
+    final = 100.0 * (0.7 * semantic + 0.3 * coverage)
+    order = np.argsort(-final, kind="stable")[:top_k]
+
+    results = []
+    for i in order:
+        jd = jds[i]
+        jd_skills = jd.get("skills", []) or []
+        matched = [s for s in dict.fromkeys(jd_skills) if s in found]
+        missing = [s for s in jd_skills if s not in matched]
+        top_sent = _top_sentences(entries[i], resume_vec, top_n)
+        results.append(
+            _core_result(
+                jd,
+                resume_text,
+                float(final[i]),
+                float(semantic[i]),
+                float(coverage[i]),
+                matched,
+                missing,
+                top_sent,
+            )
+        )
+    return results
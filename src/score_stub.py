@@ -45,6 +45,10 @@ def _tokenize(text: str) -> List[str]:
     ]
 
 
+def _split_sentences(text: str) -> List[str]:
+    return re.split(r"(?<=[.!?])\s+", text.strip())
+
+
 def _jaccard(a: List[str], b: List[str]) -> float:
     sa, sb = set(a), set(b)
     if not sa or not sb:
@@ -70,7 +74,8 @@ def compute_stub_scores(resume_text: str, jd: Dict, top_n: int = 3) -> Dict:
     jd_skills = jd.get("skills", [])
 
     # Semantic (stub): Jaccard overlap of tokens
-    sem = _jaccard(_tokenize(resume_text), _tokenize(jd_text))
+    resume_tokens = _tokenize(resume_text)  # once; reused for every JD sentence below
+    sem = _jaccard(resume_tokens, _tokenize(jd_text))
 
     # Skills coverage
     """
@@ -87,10 +92,10 @@ def compute_stub_scores(resume_text: str, jd: Dict, top_n: int = 3) -> Dict:
     final = 100.0 * (0.7 * sem + 0.3 * coverage)
 
     # Sentence-level “explanations” (stub): pick JD sentences most overlapping with resume
-    sentences = re.split(r"(?<=[.!?])\s+", jd_text.strip())
+    sentences = _split_sentences(jd_text)
     scored = []
     for s in sentences:
-        sim = _jaccard(_tokenize(resume_text), _tokenize(s))
+        sim = _jaccard(resume_tokens, _tokenize(s))
         scored.append({"sentence": s, "similarity": round(sim, 4)})
     scored.sort(key=lambda x: x["similarity"], reverse=True)
     top_sent = scored[:top_n] if sentences else []
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.batching import MicroBatcher
+from src.cascade import CASCADE_BACKEND_ID, cascade_rank
+from src.genai.llm import provider_from_env
+from src.genai.suggest import generate_improvements
+from src.jds import load_jds
+from src.schema import ScoreWeights, wrap_improvements, wrap_result
+from src.score_embed import compute_embed_scores, embed_texts, rank_jds, readiness, warm_up
+from src.score_stub import compute_stub_scores
+from src.stub_matrix import StubMatrix
+
+EMBED_BACKEND_ID = "embeddings:minilm-l6-v2"
+STUB_BACKEND_ID = "stub:token-overlap"
+
+
+class RequestError(ValueError):
+    """Invalid request payload; the only error the HTTP layer reports as 400."""
+
+
+def _number(body: Dict[str, Any], name: str, default: Any, cast: type) -> Any:
+    value = body.get(name, default)
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise RequestError(f"`{name}` must be a number.")
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"`{name}` must be a number.") from None
+
+
+class ScoringService:
+    """
+    Headless version of the Streamlit flow: match and rank endpoints that return
+    the wrap_result schema, and improve, which wraps its payload in the same
+    envelope (schema.wrap_improvements). Payload problems raise RequestError.
+    Resume embeddings from concurrent requests are coalesced by a MicroBatcher
+    into one embed_texts call.
+    """
+
+    def __init__(self, jds: List[Dict], *, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.jds = jds
+        self._by_id = {jd.get("id"): jd for jd in jds}
+        self.weights = ScoreWeights()
+        self.stub = StubMatrix(jds)  # cascade prefilter over the whole catalogue
+        self.batcher = MicroBatcher(
+            lambda texts: list(embed_texts(texts)), max_batch=max_batch, max_wait_ms=max_wait_ms
+        )
+
+    def _jd(self, body: Dict[str, Any]) -> Dict:
+        if isinstance(body.get("jd"), dict):
+            return body["jd"]
+        jd = self._by_id.get(body.get("jd_id"))
+        if jd is None:
+            raise RequestError(f"Unknown jd_id: {body.get('jd_id')!r}")
+        return jd
+
+    @staticmethod
+    def _resume(body: Dict[str, Any]) -> str:
+        text = body.get("resume_text") or ""
+        if not isinstance(text, str) or not text.strip():
+            raise RequestError("`resume_text` is required.")
+        return text.strip()
+
+    def _wrap(self, core: Dict, jd: Dict, backend: str, t0: float, resume_text: str) -> Dict:
+        return wrap_result(
+            core,
+            jd_title=jd.get("title", ""),
+            backend=backend,
+            weights=self.weights,
+            latency_ms=int((time.perf_counter() - t0) * 1000),
+            resume_char_count=len(resume_text),
+        )
+
+    def match(self, body: Dict[str, Any]) -> Dict:
+        t0 = time.perf_counter()
+        resume_text, jd = self._resume(body), self._jd(body)
+        top_n = _number(body, "top_n", 3, int)
+        if str(body.get("backend", "embeddings")).startswith("stub"):
+            core = compute_stub_scores(resume_text, jd, top_n=top_n)
+            return self._wrap(core, jd, STUB_BACKEND_ID, t0, resume_text)
+        vec = self.batcher(resume_text)
+        core = compute_embed_scores(resume_text, jd, top_n=top_n, resume_vec=vec)
+        return self._wrap(core, jd, EMBED_BACKEND_ID, t0, resume_text)
+
+    def rank(self, body: Dict[str, Any]) -> Dict:
+        t0 = time.perf_counter()
+        resume_text = self._resume(body)
+        top_k, top_n = _number(body, "top_k", 5, int), _number(body, "top_n", 3, int)
+        if body.get("mode") == "cascade":
+            keep_top = _number(body, "keep_top", None, int)
+            keep_fraction = _number(body, "keep_fraction", None, float)
+            if keep_top is not None and keep_fraction is not None:
+                raise RequestError("Pass `keep_top` or `keep_fraction`, not both.")
+            if keep_fraction is not None and not 0.0 < keep_fraction <= 1.0:
+                raise RequestError("`keep_fraction` must be in (0, 1].")
+            vec = self.batcher(resume_text)
+            out = cascade_rank(
+                resume_text,
+                self.jds,
+                top_k=top_k,
+                top_n=top_n,
+                keep_top=keep_top,
+                keep_fraction=keep_fraction,
+                min_stub_score=_number(body, "min_stub_score", None, float),
+                stub=self.stub,
+                resume_vec=vec,
+                compare=bool(body.get("compare", False)),
+            )
+            cores, backend, extra = out["results"], CASCADE_BACKEND_ID, {"stats": out["stats"]}
+        else:
+            vec = self.batcher(resume_text)
+            cores = rank_jds(resume_text, self.jds, top_k=top_k, top_n=top_n, resume_vec=vec)
+            backend, extra = EMBED_BACKEND_ID, {}
+        return {
+            "results": [
+                self._wrap(c, self._by_id.get(c["jd_id"], {}), backend, t0, resume_text)
+                for c in cores
+            ],
+            **extra,
+        }
+
+    def improve(self, body: Dict[str, Any]) -> Dict:
+        t0 = time.perf_counter()
+        resume_text, jd = self._resume(body), self._jd(body)
+        provider = provider_from_env()
+        return wrap_improvements(
+            generate_improvements(resume_text, jd, provider),
+            jd_id=jd.get("id"),
+            jd_title=jd.get("title", ""),
+            backend=f"genai:{type(provider).__name__}",
+            latency_ms=int((time.perf_counter() - t0) * 1000),
+        )
+
+    def health(self) -> Dict:
+        return dict(readiness(), batching=self.batcher.stats())
+
+    def close(self) -> None:
+        self.batcher.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ScoringHTTPServer"
+
+    def _send(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, self.server.service.health())
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def _body(self) -> Dict[str, Any]:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:  # bad Content-Length, invalid JSON or encoding
+            raise RequestError(f"Request body is not valid JSON: {e}") from None
+        if not isinstance(body, dict):
+            raise RequestError("Request body must be a JSON object.")
+        return body
+
+    def do_POST(self) -> None:
+        routes = {
+            "/match": self.server.service.match,
+            "/rank": self.server.service.rank,
+            "/improve": self.server.service.improve,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            self._send(200, handler(self._body()))
+        except RequestError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format: str, *args: Any) -> None:  # keep test/CI output quiet
+        pass
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: ScoringService):
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def make_server(service: ScoringService, host: str = "127.0.0.1", port: int = 8000):
+    return ScoringHTTPServer((host, port), service)
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Resume ↔ JD scoring HTTP service.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--jds", default=str(Path("data") / "jds.json"))
+    ap.add_argument("--max-batch", type=int, default=32)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = ap.parse_args(argv)
+
+    warm_up(args.jds, background=True)
+    service = ScoringService(
+        load_jds(Path(args.jds)), max_batch=args.max_batch, max_wait_ms=args.max_wait_ms
+    )
+    server = make_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import json
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
 
 def _repo_root() -> Path:
@@ -74,7 +74,7 @@ def _alias_to_regex(alias: str) -> str:
     return rf"(?<![A-Za-z0-9]){esc}(?![A-Za-z0-9])"
 
 
-def _compile_patterns(canonical: str, aliases: Iterable[str]) -> List[re.Pattern]:
+def _unique_variants(canonical: str, aliases: Iterable[str]) -> List[str]:
     variants = [canonical] + list(aliases)
     uniq: List[str] = []
     seen = set()
@@ -83,15 +83,107 @@ def _compile_patterns(canonical: str, aliases: Iterable[str]) -> List[re.Pattern
         if key and key not in seen:
             seen.add(key)
             uniq.append(v)
+    return uniq
+
 
+def _compile_patterns(canonical: str, aliases: Iterable[str]) -> List[re.Pattern]:
     pats: List[re.Pattern] = []
-    for a in uniq:
+    for a in _unique_variants(canonical, aliases):
         pat = _alias_to_regex(a)
         if pat:
             pats.append(re.compile(pat, flags=re.IGNORECASE))
     return pats
 
 
+_BOUNDARY = r"(?<![A-Za-z0-9])"
+
+
+class SkillMatcher:
+    """
+    Every canonical skill (alias map keys + any extra skills) compiled into one
+    regex: a zero-width lookahead alternation with a named group per skill, so a
+    single left-to-right scan reports each position where some skill starts.
+    The shared boundary and first-character class are hoisted in front so most
+    positions are rejected without trying the alternation.
+    Other skills starting at the same position are picked up by anchored checks of
+    the skills sharing that first character, keeping results identical to searching
+    each skill's patterns separately.
+    """
+
+    def __init__(self, alias_map: Dict[str, List[str]], extra_skills: Iterable[str] = ()):
+        keys = list(
+            dict.fromkeys([k.lower() for k in alias_map] + [s.lower() for s in extra_skills])
+        )
+        self.skills: List[str] = []
+        self._patterns: Dict[str, List[re.Pattern]] = {}
+        self._group_skill: Dict[str, str] = {}
+        self._by_first: Dict[str, List[str]] = {}
+        parts: List[str] = []
+        for key in keys:
+            variants = [v for v in _unique_variants(key, alias_map.get(key, [])) if v.strip()]
+            regexes = [_alias_to_regex(v) for v in variants]
+            if not regexes:
+                continue
+            group = f"s{len(self.skills)}"
+            self.skills.append(key)
+            self._group_skill[group] = key
+            self._patterns[key] = [re.compile(r, flags=re.IGNORECASE) for r in regexes]
+            # special-cased expansions (REST, Node.js, AWS...) keep the alias's first letter
+            for first in {v.strip()[0].lower() for v in variants}:
+                self._by_first.setdefault(first, []).append(key)
+            parts.append(f"(?P<{group}>" + "|".join(f"(?:{r})" for r in regexes) + ")")
+
+        self._scan = None
+        if parts:
+            first_class = "".join(re.escape(c) for c in sorted(self._by_first))
+            self._scan = re.compile(
+                _BOUNDARY + f"(?=[{first_class}])(?=" + "|".join(parts) + ")",
+                flags=re.IGNORECASE,
+            )
+
+    def find(self, text: str, targets: Iterable[str] | None = None) -> set:
+        """
+        Return the set of canonical (lowercase) skills present in text.
+        With targets, scanning stops early once all of them have been seen.
+        """
+        found: set = set()
+        if self._scan is None or not text:
+            return found
+        wanted = None if targets is None else {t.lower() for t in targets} & set(self.skills)
+        if wanted is not None and not wanted:
+            return found
+
+        for m in self._scan.finditer(text):
+            found.add(self._group_skill[m.lastgroup])
+            pos = m.start()
+            for key in self._by_first.get(text[pos].lower(), ()):
+                if key not in found and any(p.match(text, pos) for p in self._patterns[key]):
+                    found.add(key)
+            if wanted is not None and wanted <= found:
+                break
+        return found
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(
+    frozen_aliases: Tuple[Tuple[str, Tuple[str, ...]], ...], extra_skills: Tuple[str, ...]
+) -> SkillMatcher:
+    return SkillMatcher({k: list(v) for k, v in frozen_aliases}, extra_skills)
+
+
+def get_skill_matcher(
+    skills: Iterable[str] = (), alias_map: Dict[str, List[str]] | None = None
+) -> SkillMatcher:
+    """
+    Compiled matcher for the whole alias map plus any skills missing from it.
+    Cached per (alias map, extra skills), so patterns are compiled once per process.
+    """
+    alias_map = alias_map or load_skill_aliases()
+    extra = tuple(sorted({(s or "").lower() for s in skills} - set(alias_map) - {""}))
+    frozen = tuple((k, tuple(v)) for k, v in alias_map.items())
+    return _cached_matcher(frozen, extra)
+
+
 def find_skills(
     resume_text: str, jd_skills: List[str], alias_map: Dict[str, List[str]] | None = None
 ) -> List[str]:
@@ -100,21 +192,14 @@ def find_skills(
     - alias_map: mapping from canonical (lowercase) -> list of aliases
     """
     txt = resume_text or ""
-    alias_map = alias_map or load_skill_aliases()
-    found: List[str] = []
-
-    for skill in jd_skills:
-        key = (skill or "").lower()
-        aliases = alias_map.get(key, [])
-        patterns = _compile_patterns(skill, aliases)
-        if any(p.search(txt) for p in patterns):
-            found.append(skill)
+    matcher = get_skill_matcher(jd_skills, alias_map)
+    present = matcher.find(txt, targets=[(s or "") for s in jd_skills])
 
     # keep JD order, de-dup just in case
     seen = set()
     ordered = []
-    for s in found:
-        if s not in seen:
+    for s in jd_skills:
+        if (s or "").lower() in present and s not in seen:
             seen.add(s)
             ordered.append(s)
     return ordered
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from src.score_stub import _split_sentences, _tokenize
+from src.skills import get_skill_matcher, load_skill_aliases
+
+
+def _sparse():
+    """scipy.sparse when installed; otherwise dense float32 blocks are used."""
+    try:
+        from scipy import sparse
+    except ImportError:
+        return None
+    return sparse
+
+
+class StubMatrix:
+    """
+    Stub backend (token-overlap Jaccard + skills coverage) for N resumes x M JDs.
+
+    Tokens map to integer ids in a vocabulary built from the JD texts, so each
+    resume, JD and JD sentence is a row of a binary matrix. Only JD tokens can
+    intersect, so resume tokens outside the vocabulary are counted (for the
+    union) but never stored. Intersections are one sparse (SciPy) or dense
+    (NumPy, in blocks of `block_size` resumes) matrix product; Jaccard follows
+    from |a & b| / (|a| + |b| - |a & b|). Results are identical to
+    score_stub.compute_stub_scores for every pair.
+    """
+
+    def __init__(self, jds: Sequence[Dict], *, block_size: int = 2048):
+        self.jds = list(jds)
+        self.block_size = block_size
+        self.vocab: Dict[str, int] = {}
+        self.sentences: List[str] = []
+        # JD j owns sentences[self.sentence_offsets[j] : self.sentence_offsets[j + 1]]
+        self.sentence_offsets = [0]
+
+        jd_sets, sentence_sets = [], []
+        for jd in self.jds:
+            text = jd.get("text", "")
+            jd_sets.append(set(_tokenize(text)))
+            for sentence in _split_sentences(text):
+                self.sentences.append(sentence)
+                sentence_sets.append(set(_tokenize(sentence)))
+            self.sentence_offsets.append(len(self.sentences))
+        for tokens in jd_sets + sentence_sets:
+            for t in sorted(tokens):
+                self.vocab.setdefault(t, len(self.vocab))
+
+        self._jd, self._jd_sizes = self._rows(jd_sets)
+        self._sent, self._sent_sizes = self._rows(sentence_sets)
+
+        self.skills = [jd.get("skills", []) for jd in self.jds]
+        all_skills = list(dict.fromkeys(s for skills in self.skills for s in skills))
+        self._all_skills = [(s or "") for s in all_skills]
+        self._matcher = get_skill_matcher(all_skills, load_skill_aliases())
+        # (M x K) count of each JD's distinct skill strings per lowercased skill, so
+        # skills coverage for many JDs is one product with a resume's found-skill row
+        self._skill_keys = {
+            k: i for i, k in enumerate(dict.fromkeys(s.lower() for s in self._all_skills))
+        }
+        self._skill_counts = np.zeros((len(self.jds), len(self._skill_keys)), dtype=np.float64)
+        for j, skills in enumerate(self.skills):
+            for s in dict.fromkeys(skills):
+                self._skill_counts[j, self._skill_keys[(s or "").lower()]] += 1
+        self._n_skills = np.array([len(skills) for skills in self.skills], dtype=np.float64)
+
+    # ---- binary rows ----
+
+    def _rows(self, token_sets: Sequence[Iterable[str]]) -> Tuple[Any, np.ndarray]:
+        """Binary matrix (rows x vocab) plus each row's unique token count (incl. OOV)."""
+        indptr, indices, sizes = [0], [], []
+        for tokens in token_sets:
+            tokens = set(tokens)
+            ids = [self.vocab[t] for t in tokens if t in self.vocab]
+            indices.extend(ids)
+            indptr.append(len(indices))
+            sizes.append(len(tokens))
+        indices_arr = np.asarray(indices, dtype=np.int32)
+        indptr_arr = np.asarray(indptr, dtype=np.int64)
+        shape = (len(sizes), len(self.vocab))
+        sparse = _sparse()
+        if sparse is not None:
+            data = np.ones(len(indices_arr), dtype=np.float32)
+            mat = sparse.csr_matrix((data, indices_arr, indptr_arr), shape=shape)
+        else:
+            mat = np.zeros(shape, dtype=np.float32)
+            rows = np.repeat(np.arange(shape[0]), np.diff(indptr_arr))
+            mat[rows, indices_arr] = 1.0
+        return mat, np.asarray(sizes, dtype=np.float64)
+
+    @staticmethod
+    def _jaccard(inter: Any, a_sizes: np.ndarray, b_sizes: np.ndarray) -> np.ndarray:
+        inter = np.asarray(inter.toarray() if hasattr(inter, "toarray") else inter, np.float64)
+        union = a_sizes[:, None] + b_sizes[None, :] - inter
+        empty = (a_sizes[:, None] == 0) | (b_sizes[None, :] == 0)
+        return np.where(empty, 0.0, inter / np.where(union == 0, 1.0, union))
+
+    def _against(self, resumes: Sequence[str], other: Any, other_sizes: np.ndarray) -> np.ndarray:
+        out = np.zeros((len(resumes), len(other_sizes)), dtype=np.float64)
+        for start in range(0, len(resumes), self.block_size):
+            block = resumes[start : start + self.block_size]
+            mat, sizes = self._rows([_tokenize(r) for r in block])
+            out[start : start + len(block)] = self._jaccard(mat @ other.T, sizes, other_sizes)
+        return out
+
+    # ---- public API ----
+
+    def jaccard(self, resumes: Sequence[str]) -> np.ndarray:
+        """(N, M) token Jaccard of each resume against each JD text."""
+        return self._against(list(resumes), self._jd, self._jd_sizes)
+
+    def sentence_jaccard(self, resumes: Sequence[str]) -> np.ndarray:
+        """(N, S) token Jaccard against every JD sentence (see sentence_offsets)."""
+        return self._against(list(resumes), self._sent, self._sent_sizes)
+
+    def coverage(self, resumes: Sequence[str]) -> np.ndarray:
+        """(N, M) skills coverage of each JD's skill list by each resume."""
+        present = np.zeros((len(resumes), len(self._skill_keys)), dtype=np.float64)
+        for i, resume_text in enumerate(resumes):
+            for skill in self._matcher.find(resume_text or "", targets=self._all_skills):
+                if skill in self._skill_keys:
+                    present[i, self._skill_keys[skill]] = 1.0
+        matched = present @ self._skill_counts.T
+        return np.divide(
+            matched, self._n_skills, out=np.zeros_like(matched), where=self._n_skills > 0
+        )
+
+    def overall(self, resumes: Sequence[str]) -> np.ndarray:
+        """
+        (N, M) stub overall scores (0-100, unrounded) straight from the arrays,
+        without building score()'s per-pair result dicts.
+        """
+        resumes = list(resumes)
+        return 100.0 * (0.7 * self.jaccard(resumes) + 0.3 * self.coverage(resumes))
+
+    def score(self, resumes: Sequence[str], top_n: int = 3) -> List[List[Dict]]:
+        """compute_stub_scores(resume, jd, top_n) for every resume (outer) and JD (inner)."""
+        resumes = list(resumes)
+        out: List[List[Dict]] = []
+        for start in range(0, len(resumes), self.block_size):
+            block = resumes[start : start + self.block_size]
+            mat, sizes = self._rows([_tokenize(r) for r in block])
+            sem = self._jaccard(mat @ self._jd.T, sizes, self._jd_sizes)
+            sent = self._jaccard(mat @ self._sent.T, sizes, self._sent_sizes)
+            for i, resume_text in enumerate(block):
+                present = self._matcher.find(resume_text or "", targets=self._all_skills)
+                out.append(
+                    [
+                        self._result(j, resume_text, sem[i, j], sent[i], present, top_n)
+                        for j in range(len(self.jds))
+                    ]
+                )
+        return out
+
+    def _result(
+        self, j: int, resume_text: str, sem: float, sent_row: np.ndarray, present: set, top_n: int
+    ) -> Dict:
+        jd, jd_skills = self.jds[j], self.skills[j]
+        seen, matched = set(), []
+        for s in jd_skills:  # same order/dedupe as skills.find_skills
+            if (s or "").lower() in present and s not in seen:
+                seen.add(s)
+                matched.append(s)
+        coverage = (len(matched) / len(jd_skills)) if jd_skills else 0.0
+        sem = float(sem)
+
+        lo, hi = self.sentence_offsets[j], self.sentence_offsets[j + 1]
+        scored = [
+            {"sentence": self.sentences[k], "similarity": round(float(sent_row[k]), 4)}
+            for k in range(lo, hi)
+        ]
+        scored.sort(key=lambda x: x["similarity"], reverse=True)
+        return {
+            "jd_id": jd.get("id"),
+            "overall_score": round(100.0 * (0.7 * sem + 0.3 * coverage), 2),
+            "semantic_similarity": round(sem, 4),
+            "skills_coverage": round(coverage, 4),
+            "matched_skills": matched,
+            "missing_skills": [s for s in jd_skills if s not in matched],
+            "resume_text_preview": resume_text,
+            "top_matching_jd_sentences": scored[:top_n],
+        }
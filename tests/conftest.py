@@ -1,6 +1,90 @@
+import re
 import sys
+import zlib
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+class FakeTokenizer:
+    """Word-level tokenizer with BERT-style special token ids."""
+
+    cls_token_id, sep_token_id, pad_token_id = 1, 2, 0
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text, add_special_tokens=True, **kwargs):
+        self.calls += 1
+        ids = [10 + zlib.crc32(w.encode()) % 10000 for w in re.findall(r"[a-z0-9]+", text.lower())]
+        if add_special_tokens:
+            ids = [self.cls_token_id] + ids + [self.sep_token_id]
+        return {"input_ids": ids}
+
+
+class FakeEncoder:
+    """
+    Deterministic stand-in for SentenceTransformer: hashed bag-of-words vectors.
+    Similar texts get similar vectors, and every encoded text is counted.
+    """
+
+    dim = 384
+    max_seq_length = 16
+
+    def __init__(self):
+        self.encoded = []
+        self.calls = 0
+        self.tokenizer = FakeTokenizer()
+
+    def encode_ids(self, id_chunks, batch_size=32):
+        import numpy as np
+
+        self.calls += 1
+        out = np.zeros((len(id_chunks), self.dim), dtype=np.float32)
+        for i, ids in enumerate(id_chunks):
+            self.encoded.append(tuple(ids))
+            for t in ids:
+                out[i, t % self.dim] += 1.0
+            out[i, 0] += 0.01
+        return out
+
+    def encode(self, sentences, normalize_embeddings=False, **kwargs):
+        import numpy as np
+
+        self.calls += 1
+        out = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for i, s in enumerate(sentences):
+            self.encoded.append(s)
+            for w in re.findall(r"[a-z0-9]+", s.lower()):
+                out[i, zlib.crc32(w.encode()) % self.dim] += 1.0
+            out[i, 0] += 0.01  # keep the empty string non-zero
+        if normalize_embeddings:
+            out /= np.linalg.norm(out, axis=1, keepdims=True)
+        return out
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+
+@pytest.fixture
+def fake_encoder(monkeypatch, tmp_path):
+    """Swap the MiniLM model for FakeEncoder; isolate the JD index and embedding cache."""
+    from src import score_embed
+
+    enc = FakeEncoder()
+    monkeypatch.setattr(score_embed, "_get_model", lambda: enc)
+    monkeypatch.setenv("JD_INDEX_DIR", str(tmp_path / "jd_index"))
+    monkeypatch.setattr(score_embed, "_JD_INDEX", None)
+    monkeypatch.delenv("EMBED_CACHE_PATH", raising=False)
+    monkeypatch.setattr(score_embed, "_EMBED_CACHE", None)
+    return enc
+
+
+@pytest.fixture(autouse=True)
+def _isolated_response_cache(monkeypatch, tmp_path):
+    """Keep the GenAI response cache out of the repo's .cache during tests."""
+    monkeypatch.setenv("GENAI_CACHE_PATH", str(tmp_path / "genai_responses.sqlite"))
@@ -55,3 +55,26 @@ def test_postcheck_lift_increases_with_relevant_snippet():
     lift = estimate_snippet_lift(RESUME, JD, snippet, target_section="experience")
     assert lift["delta"]["semantic"] >= 0.0
     assert lift["delta"]["skills"] > 0.0  # should cover docker/aws
+
+
+def test_estimate_lifts_batches_modified_resumes(fake_encoder):
+    from src.genai.postcheck import estimate_lifts
+    from src.score_embed import jd_vector
+
+    suggestions = [
+        {
+            "proposed": "Containerized Django services with Docker on AWS.",
+            "target_section": "experience",
+        },
+        {"proposed": "Linux administration and Git workflows.", "target_section": "skills"},
+        {"proposed": "Mentored interns.", "target_section": "summary"},
+    ]
+    jd_vector(JD)  # warm the JD index
+    fake_encoder.calls = 0
+
+    out = estimate_lifts(RESUME, JD, suggestions)
+    assert fake_encoder.calls == 2  # baseline resume + one batch for all modified resumes
+    assert out[0]["est_lift"]["skills"] > 0.0
+    assert out[2]["est_lift"]["skills"] == 0.0
+    single = estimate_snippet_lift(RESUME, JD, suggestions[0]["proposed"], "experience")
+    assert single["delta"] == out[0]["est_lift"]
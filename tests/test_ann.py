@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.ann import IVFIndex, exact_search, recall_at_k
+
+
+def _clustered(n=3000, dim=32, centers=40, seed=0):
+    rng = np.random.default_rng(seed)
+    c = rng.normal(size=(centers, dim))
+    x = c[rng.integers(0, centers, n)] + 0.3 * rng.normal(size=(n, dim))
+    q = c[rng.integers(0, centers, 50)] + 0.3 * rng.normal(size=(50, dim))
+    return x.astype(np.float32), q.astype(np.float32)
+
+
+def test_exact_search_matches_argsort():
+    x, q = _clustered(n=500)
+    scores, rows = exact_search(x, q, k=5, block_size=64)
+    xn = x / np.linalg.norm(x, axis=1, keepdims=True)
+    qn = q / np.linalg.norm(q, axis=1, keepdims=True)
+    expected = np.argsort(-(qn @ xn.T), axis=1, kind="stable")[:, :5]
+    assert np.array_equal(rows, expected)
+    assert np.allclose(scores, np.take_along_axis(qn @ xn.T, expected, 1), atol=1e-6)
+
+
+def test_ivf_recall_grows_with_n_probe_and_is_exact_at_full_probe():
+    x, q = _clustered()
+    index = IVFIndex(dim=32, n_lists=32, n_probe=4)
+    index.add(x[:2000], ids=[f"r{i}" for i in range(2000)])
+    index.add(x[2000:], ids=[f"r{i}" for i in range(2000, 3000)])  # incremental add
+
+    _, rows = exact_search(x, q, k=10)
+    exact = [[f"r{i}" for i in row] for row in rows]
+    recalls = [
+        recall_at_k([[i for i, _ in hits] for hits in index.search(q, 10, n_probe=p)], exact)
+        for p in (1, 4, 32)
+    ]
+    assert recalls[0] <= recalls[1] <= recalls[2] == 1.0
+    assert recalls[1] >= 0.9
+
+
+def test_ivf_save_load_roundtrip(tmp_path):
+    x, q = _clustered(n=800)
+    index = IVFIndex(dim=32, n_lists=16, n_probe=3)
+    index.add(x, ids=[f"jd-{i}" for i in range(len(x))])
+    index.save(tmp_path / "ivf.npz")
+
+    loaded = IVFIndex.load(tmp_path / "ivf.npz")
+    assert len(loaded) == len(index) and loaded.n_probe == 3
+    assert loaded.search(q, 5) == index.search(q, 5)
+
+
+def test_ivf_rejects_wrong_dim_and_small_training_sets():
+    with pytest.raises(ValueError):
+        IVFIndex(dim=8, n_lists=4).add(np.ones((10, 9), np.float32))
+    with pytest.raises(ValueError):
+        IVFIndex(dim=8, n_lists=16).train(np.ones((10, 8), np.float32))
+    assert IVFIndex(dim=8).search(np.ones(8, np.float32)) == [[]]
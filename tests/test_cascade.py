@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from src.cascade import _n_keep, cascade_rank, ranking_change
+from src.score_embed import rank_jds
+
+RESUME = (
+    "Backend engineer building REST APIs with Python, Django and PostgreSQL. "
+    "Containerized services with Docker on Linux; Git workflows."
+)
+
+
+def _catalogue():
+    jds = json.load(open("data/jds.json"))
+    extra = [
+        {"id": f"filler-{i}", "title": "Other", "skills": ["cobol"], "text": f"Mainframe role {i}."}
+        for i in range(9)
+    ]
+    return jds + extra
+
+
+def test_cascade_embeds_only_survivors(fake_encoder):
+    jds = _catalogue()
+    out = cascade_rank(RESUME, jds, top_k=2, keep_top=3)
+
+    assert [r["jd_id"] for r in out["results"]][0] == "backend"
+    stats = out["stats"]
+    assert stats["jds_total"] == 12 and stats["jds_reranked"] == 3 and stats["jds_skipped"] == 9
+    assert stats["skipped_fraction"] == 0.75 and stats["jd_sentences_skipped"] == 9
+    encoded = " ".join(fake_encoder.encoded)
+    assert "Mainframe" not in encoded  # filler JDs never reached the encoder
+
+
+def test_cascade_matches_full_ranking_when_everything_survives(fake_encoder):
+    jds = _catalogue()
+    out = cascade_rank(RESUME, jds, top_k=4, keep_fraction=1.0, compare=True)
+
+    full = rank_jds(RESUME, jds, top_k=4)
+    assert out["results"] == full
+    stats = out["stats"]
+    assert stats["overlap_at_k"] == 1.0 and stats["top1_same"] and stats["missed"] == []
+    assert stats["mean_rank_shift"] == 0.0 and stats["jds_skipped"] == 0
+
+
+def test_cascade_threshold_and_keep_rules(fake_encoder):
+    jds = _catalogue()
+    out = cascade_rank(RESUME, jds, top_k=1, keep_fraction=1.0, min_stub_score=20.0)
+    assert out["stats"]["jds_reranked"] == 1  # only the backend JD clears the bar
+
+    assert _n_keep(100, None, 0.1, 5) == 10 and _n_keep(100, 2, None, 5) == 5
+    assert _n_keep(3, 10, None, 1) == 3 and _n_keep(100, None, None, 1) == 25
+    assert _n_keep(100, 1.0, None, 1) == 1  # JSON may send 1.0: still a count
+    with pytest.raises(ValueError):
+        _n_keep(10, None, 1.5, 1)
+    with pytest.raises(ValueError):
+        _n_keep(10, 2, 0.5, 1)
+
+
+def test_ranking_change_reports_shifts_and_misses():
+    change = ranking_change(["b", "a"], ["a", "b", "c"], top_k=2)
+    assert change == {"overlap_at_k": 1.0, "top1_same": False, "mean_rank_shift": 1.0, "missed": []}
+    assert ranking_change(["a", "c"], ["a", "b", "c"], 2)["missed"] == ["b"]
@@ -0,0 +1,50 @@
+from src.genai.analyzer import build_gap_report
+from src.genai.compact import compact_user_prompt, count_tokens
+from src.genai.llm import MockProvider
+from src.genai.suggest import _format_user_prompt, generate_improvements
+
+JD = {
+    "id": "backend",
+    "title": "Backend SDE (Django/REST)",
+    "skills": ["Python", "Django", "python", "Docker", "PostgreSQL"],
+    "text": "We build RESTful APIs using Python and Django. PostgreSQL and Docker preferred.",
+}
+FILLER = [f"- Organised the office {w} party and managed catering vendors." for w in "abcdefgh"]
+RESUME = "\n".join(
+    ["Summary:", "Engineer who likes teamwork.", "Experience:"]
+    + FILLER[:4]
+    + ["- Built Django REST APIs in Python backed by PostgreSQL."]
+    + FILLER[4:]
+    + ["Skills:", "Python, Django, Git"]
+)
+
+
+def test_compact_prompt_is_smaller_and_deduplicated(fake_encoder, monkeypatch):
+    monkeypatch.setenv("GENAI_PROMPT", "full")
+    gap = build_gap_report(RESUME, JD)
+    full = _format_user_prompt(JD, RESUME, gap)
+    compact = compact_user_prompt(JD, RESUME, gap, budget=2000)
+
+    assert count_tokens(compact) < count_tokens(full)
+    assert "\n  " not in compact  # no JSON indentation
+    assert "JD_SKILLS: Python, Django, Docker, PostgreSQL\n" in compact
+    assert "Quantify impact" not in compact  # static gap notes are not repeated
+
+
+def test_compact_prompt_keeps_most_relevant_lines_within_budget(fake_encoder):
+    gap = build_gap_report(RESUME, JD)
+    compact = compact_user_prompt(JD, RESUME, gap, budget=340)
+
+    assert count_tokens(compact) <= 340
+    assert "Built Django REST APIs in Python backed by PostgreSQL." in compact
+    assert sum(line.startswith("- Organised") for line in compact.splitlines()) < len(FILLER)
+
+
+def test_generate_improvements_uses_compact_prompt_when_selected(fake_encoder, monkeypatch):
+    monkeypatch.setenv("GENAI_PROMPT", "full")
+    full = generate_improvements(RESUME, JD, MockProvider())
+    monkeypatch.setenv("GENAI_PROMPT", "compact")
+    compact = generate_improvements(RESUME, JD, MockProvider())
+
+    assert compact["prompt_tokens"] < full["prompt_tokens"]
+    assert compact["suggestions"]
@@ -0,0 +1,93 @@
+import numpy as np
+
+from src import score_embed
+from src.embed_cache import EmbeddingCache, make_key
+
+
+def test_lru_evicts_by_bytes():
+    vec = np.ones(4, dtype=np.float32)  # 16 bytes
+    cache = EmbeddingCache(max_bytes=40)
+    cache.put("a", vec)
+    cache.put("b", vec)
+    assert cache.get("a") is not None  # "b" becomes least recently used
+    cache.put("c", vec)
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2 and stats["bytes"] == 32
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db = tmp_path / "emb.sqlite"
+    key = make_key("model", "words:250:50", "hello")
+    EmbeddingCache(disk_path=db).put(key, np.arange(3, dtype=np.float32))
+
+    fresh = EmbeddingCache(disk_path=db)
+    assert np.array_equal(fresh.get(key), [0, 1, 2])
+    assert fresh.stats()["disk_hits"] == 1
+    assert fresh.get(key) is not None and fresh.stats()["hits"] == 1
+
+
+def test_put_many_commits_once_and_disk_tier_is_bounded(tmp_path, monkeypatch):
+    db = tmp_path / "emb.sqlite"
+    cache = EmbeddingCache(disk_path=db, max_rows=3)
+    commits = []
+    real_db = cache._db
+
+    class CountingConnection:
+        def __getattr__(self, name):
+            return getattr(real_db, name)
+
+        def commit(self):
+            commits.append(1)
+            real_db.commit()
+
+    cache._db = CountingConnection()
+    stored = cache.put_many((f"k{i}", np.full(2, i, dtype=np.float32)) for i in range(5))
+    assert len(commits) == 1 and [float(v[0]) for v in stored] == [0, 1, 2, 3, 4]
+    assert cache.stats()["disk_evictions"] == 2
+
+    fresh = EmbeddingCache(disk_path=db)
+    assert real_db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 3
+    assert fresh.get("k4") is not None and fresh.get("k1") is None
+
+    clock = [1000.0]
+    monkeypatch.setattr("src.embed_cache.time.time", lambda: clock[0])
+    aged = EmbeddingCache(disk_path=tmp_path / "aged.sqlite", max_age=60)
+    aged.put("old", np.ones(2))
+    clock[0] += 61
+    assert EmbeddingCache(disk_path=tmp_path / "aged.sqlite", max_age=60).get("old") is None
+
+
+def test_repeated_embedding_is_a_cache_hit(fake_encoder):
+    text = "Python developer with Django and Docker."
+    first = score_embed.embed_text(text)
+    calls = fake_encoder.calls
+    again = score_embed.embed_texts([text, text])
+    assert fake_encoder.calls == calls
+    assert np.allclose(again[0], first) and np.allclose(again[1], first)
+    assert score_embed.embedding_cache_stats()["hits"] >= 1
+
+
+def test_small_edit_only_encodes_changed_chunks(fake_encoder):
+    words = [f"w{i}" for i in range(600)]  # three overlapping 250-word windows
+    score_embed.embed_text(" ".join(words))
+    assert len(fake_encoder.encoded) == 3
+
+    fake_encoder.encoded.clear()
+    edited = score_embed.embed_text(" ".join(words + ["docker", "aws"]))
+    assert len(fake_encoder.encoded) == 1  # only the last window changed
+    assert fake_encoder.encoded[0].endswith("docker aws")
+    assert np.isclose(np.linalg.norm(edited), 1.0)
+
+
+def test_token_chunking_fills_windows_and_skips_retokenizing(fake_encoder, monkeypatch):
+    monkeypatch.setenv("EMBED_CHUNKING", "tokens")
+    monkeypatch.setattr(score_embed, "TOKEN_STRIDE", 4)
+    text = " ".join(f"w{i}" for i in range(30))  # 30 tokens, windows of 16 - 2 specials
+
+    assert score_embed.chunk_counts([text, ""]) == [3, 1]  # 0-14, 10-24, 20-30
+    fake_encoder.tokenizer.calls = 0
+    vec = score_embed.embed_text(text)
+    assert fake_encoder.tokenizer.calls == 1
+    assert [len(c) for c in fake_encoder.encoded] == [14, 14, 10]
+    assert np.isclose(np.linalg.norm(vec), 1.0)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src import encoders
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "python", "django", "docker", "aws", "sql"]
+
+
+def _tiny_model(tmp_path):
+    """Embedding-lookup 'transformer': last_hidden_state = table[input_ids]."""
+    from onnx import TensorProto, helper, numpy_helper
+
+    table = np.random.default_rng(0).normal(size=(len(VOCAB), 8)).astype(np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("Gather", ["table", "input_ids"], ["last_hidden_state"])],
+        "tiny",
+        [
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["b", "s"]),
+            helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["b", "s"]),
+        ],
+        [helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["b", "s", 8])],
+        [numpy_helper.from_array(table, "table")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 14)])
+    model.ir_version = 8
+    path = tmp_path / "model.onnx"
+    onnx.save(model, str(path))
+    return path, table
+
+
+def _tokenizer():
+    from tokenizers import BertWordPieceTokenizer
+    from transformers import PreTrainedTokenizerFast
+
+    wordpiece = BertWordPieceTokenizer({w: i for i, w in enumerate(VOCAB)})
+    return PreTrainedTokenizerFast(tokenizer_object=wordpiece._tokenizer, pad_token="[PAD]")
+
+
+def test_onnx_encoder_mean_pools_and_normalizes(tmp_path):
+    path, table = _tiny_model(tmp_path)
+    enc = encoders.OnnxEncoder(path, _tokenizer())
+
+    out = enc.encode(["python django", "aws"], batch_size=1, normalize_embeddings=True)
+    expected = table[[2, 4, 5, 3]].mean(axis=0)  # [CLS] python django [SEP]
+    expected /= np.linalg.norm(expected)
+    assert out.shape == (2, 8)
+    assert np.allclose(out[0], expected, atol=1e-6)
+    assert np.allclose(np.linalg.norm(out, axis=1), 1.0)
+    assert enc.get_sentence_embedding_dimension() == 8
+
+
+def test_int8_quantized_model_stays_within_tolerance(tmp_path):
+    path, _ = _tiny_model(tmp_path)
+    tok = _tokenizer()
+    q = encoders.quantize_onnx(path, tmp_path / "model.int8.onnx")
+    texts = ["python django docker", "aws sql", "docker"]
+    ref = encoders.OnnxEncoder(path, tok).encode(texts, normalize_embeddings=True)
+    got = encoders.OnnxEncoder(q, tok).encode(texts, normalize_embeddings=True)
+    assert np.min(np.sum(ref * got, axis=1)) >= encoders.TOLERANCE["onnx-int8"]
+
+
+def test_backend_switch_changes_model_id(monkeypatch):
+    from src import score_embed
+
+    monkeypatch.setenv("EMBED_BACKEND", "onnx-int8")
+    assert score_embed._model_id() == "all-MiniLM-L6-v2:onnx-int8"
+    monkeypatch.setenv("EMBED_BACKEND", "tensorrt")
+    with pytest.raises(ValueError):
+        encoders.encoder_backend()
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.extract import (
+    PDF_PAGES_PER_TASK,
+    _extract_pages,
+    _pdf_pool,
+    _read_pdf_bytes,
+    _text_from_bytes,
+    extract_text_from_path,
+)
+
+
+def make_pdf(pages):
+    """Minimal multi-page PDF with one line of Helvetica text per page."""
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    kids = []
+    for text in pages:
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objs.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+        page_no = len(objs) + 1
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {page_no - 1} 0 R "
+            f"/Resources << /Font << /F1 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            f">> >> >> >>".encode()
+        )
+        kids.append(f"{page_no} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{n} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{o:010d} 00000 n \n".encode() for o in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+PAGES = [f"Page {i} Python Django REST APIs and PostgreSQL tuning work" for i in range(12)]
+
+
+def test_pdf_extraction_stops_once_budget_is_met():
+    pdf = make_pdf(PAGES)
+    stats = {}
+    text = _text_from_bytes("cv.pdf", pdf, max_chars=120, stats=stats)
+
+    full = _text_from_bytes("cv.pdf", pdf, max_chars=100_000)
+    assert text == full[:120]
+    assert stats["pages_total"] == 12
+    assert stats["pages_read"] == 3
+    assert len(stats["page_seconds"]) == 3
+
+
+def test_pdf_extraction_reads_all_pages_without_budget():
+    stats = {}
+    text = _read_pdf_bytes(make_pdf(PAGES), stats=stats)
+    assert stats["pages_read"] == 12
+    assert "Page 11" in text
+
+
+def test_pdf_extraction_in_process_pool_matches_sequential(tmp_path):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(make_pdf(PAGES))
+    stats = {}
+    parallel = extract_text_from_path(path, max_chars=300, pdf_workers=2, stats=stats)
+
+    assert parallel == extract_text_from_path(path, max_chars=300)
+    assert stats["pages_read"] < stats["pages_total"]
+    assert stats["pages_read"] % (2 * PDF_PAGES_PER_TASK) == 0  # whole waves of 2 tasks
+    assert _pdf_pool(2) is _pdf_pool(2)  # the pool is shared across calls
+
+
+def test_pdf_pool_per_worker_count_stays_usable():
+    pool = _pdf_pool(2)
+    assert _pdf_pool(1) is not pool  # another worker count gets its own pool...
+    pdf = make_pdf(PAGES)
+    assert pool.submit(_extract_pages, pdf, [0]).result()[0][1]  # ...and this one still runs
+    assert _read_pdf_bytes(pdf, workers=2) == _read_pdf_bytes(pdf, workers=1)
+
+
+def test_pdf_pool_tasks_get_contiguous_page_ranges():
+    submitted = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args[1])
+            return super().submit(fn, *args)
+
+    with RecordingExecutor(3) as pool:
+        text = _read_pdf_bytes(make_pdf(PAGES), workers=3, executor=pool)
+    assert submitted == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+    assert text == _read_pdf_bytes(make_pdf(PAGES))
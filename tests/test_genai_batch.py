@@ -0,0 +1,117 @@
+import json
+
+from src.genai.batch import RateLimiter, completed_ids, parse_record, read_manifest, run_batch
+from src.genai.llm import MockProvider
+
+
+class CountingProvider(MockProvider):
+    def __init__(self, fail_on=None):
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def generate_json(self, system, user, **kwargs):
+        self.calls += 1
+        if self.fail_on and self.fail_on in user:
+            raise RuntimeError("provider down")
+        return super().generate_json(system, user, **kwargs)
+
+
+def test_read_manifest_parses_data_jsonl_prompts():
+    records = list(read_manifest("data/data_sample.jsonl"))
+    assert len(records) == 10
+    rid, resume_text, jd = parse_record(*records[0])
+    assert rid == "line-1"
+    assert jd["title"] and jd["text"] and jd["skills"]
+    assert "Summary:" in resume_text and "GAP_REPORT" not in resume_text
+
+
+def test_run_batch_end_to_end_with_mock_provider(fake_encoder, tmp_path, monkeypatch):
+    monkeypatch.setenv("GENAI_CACHE", "0")
+    out = tmp_path / "out.jsonl"
+    provider = CountingProvider()
+    stats = run_batch(
+        "data/data_sample.jsonl", out, provider=provider, workers=0, concurrency=4, window=4
+    )
+
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert stats["written"] == 10 and stats["errors"] == 0
+    assert [r["id"] for r in rows] == [f"line-{i}" for i in range(1, 11)]
+    assert all("est_lift" in s for r in rows for s in r["suggestions"])
+    assert all(r["prompt_tokens"] > 0 for r in rows)
+    assert provider.calls == 10
+
+
+def test_run_batch_resumes_from_checkpoint_and_retries_errors(fake_encoder, tmp_path, monkeypatch):
+    monkeypatch.setenv("GENAI_CACHE", "0")
+    manifest = tmp_path / "m.jsonl"
+    jd = {"id": "b", "title": "Backend", "skills": ["python", "django"], "text": "Django REST."}
+    manifest.write_text(
+        "\n".join(
+            json.dumps(
+                {"id": f"r{i}", "resume_text": f"Summary:\nPython developer number {i}.", "jd": jd}
+            )
+            for i in range(4)
+        )
+        + "\n"
+        + json.dumps({"id": "bad", "resume_text": "x", "jd_id": "missing"})
+        + "\n"
+    )
+    out = tmp_path / "out.jsonl"
+
+    first = run_batch(manifest, out, provider=CountingProvider(fail_on="number 2"), workers=0)
+    assert first["written"] == 3 and first["errors"] == 2
+    assert completed_ids(out) == {"r0", "r1", "r3"}
+
+    with open(out, "a") as f:
+        f.write('{"id": "torn')  # crash mid-write
+    provider = CountingProvider()
+    second = run_batch(manifest, out, provider=provider, workers=0)
+    assert second["skipped"] == 3 and second["written"] == 1
+    assert provider.calls == 1
+    assert completed_ids(out) == {"r0", "r1", "r2", "r3"}
+
+
+def test_run_batch_writes_error_rows_for_malformed_lines(fake_encoder, tmp_path, monkeypatch):
+    monkeypatch.setenv("GENAI_CACHE", "0")
+    manifest = tmp_path / "m.jsonl"
+    jd = {"id": "b", "title": "Backend", "skills": ["python"], "text": "Python APIs."}
+    good = json.dumps({"id": "ok", "resume_text": "Summary:\nPython developer.", "jd": jd})
+    manifest.write_text(f'{{"id": "torn\n[1, 2]\n{good}\n')
+    out = tmp_path / "out.jsonl"
+
+    stats = run_batch(manifest, out, provider=CountingProvider(), workers=0)
+
+    rows = {r["id"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert stats["written"] == 1 and stats["errors"] == 2
+    assert "not valid JSON" in rows["line-1"]["error"]
+    assert "not a JSON object" in rows["line-2"]["error"]
+    assert "suggestions" in rows["ok"]
+
+
+def test_run_batch_process_pool(fake_encoder, tmp_path, monkeypatch):
+    monkeypatch.setenv("GENAI_CACHE", "0")
+    out = tmp_path / "out.jsonl"
+    stats = run_batch("data/data_sample.jsonl", out, provider=MockProvider(), workers=2, window=5)
+    assert stats["written"] == 10
+    assert len(out.read_text().splitlines()) == 10
+
+
+def test_rate_limiter_spaces_calls():
+    import time
+
+    limiter = RateLimiter(50)
+    t0 = time.perf_counter()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.perf_counter() - t0 >= 0.09
+
+
+def test_run_batch_packs_records_per_call(fake_encoder, tmp_path, monkeypatch):
+    monkeypatch.setenv("GENAI_CACHE", "0")
+    out = tmp_path / "out.jsonl"
+    provider = CountingProvider()
+    stats = run_batch(
+        "data/data_sample.jsonl", out, provider=provider, workers=0, window=10, pairs_per_call=5
+    )
+    assert stats["written"] == 10
+    assert provider.calls == 2
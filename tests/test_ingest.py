@@ -0,0 +1,105 @@
+import io
+import tarfile
+import zipfile
+
+from docx import Document
+
+from src.ingest import ingest
+from src.resume_pool import main as resume_pool_main
+
+
+def _docx_bytes(text):
+    doc = Document()
+    doc.add_paragraph(text)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+FILES = {
+    "a.txt": b"Python   Django\nREST APIs",
+    "b.docx": _docx_bytes("Go and Kubernetes"),
+    "c.pdf": b"not really a pdf",
+}
+
+
+def test_ingest_directory_collects_errors_in_order(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_bytes(FILES["a.txt"])
+    (tmp_path / "sub" / "b.docx").write_bytes(FILES["b.docx"])
+    (tmp_path / "c.pdf").write_bytes(FILES["c.pdf"])
+    (tmp_path / "notes.md").write_text("ignored")
+
+    docs = list(ingest(tmp_path))
+
+    assert [d["name"].rsplit("/", 1)[-1] for d in docs] == ["a.txt", "c.pdf", "b.docx"]
+    assert docs[0] == {
+        "name": str(tmp_path / "a.txt"),
+        "text": "Python Django REST APIs",
+        "error": None,
+    }
+    assert docs[1]["text"] is None and docs[1]["error"]
+    assert docs[2]["text"] == "Go and Kubernetes"
+
+
+def test_ingest_archives_in_process_pool(tmp_path):
+    with zipfile.ZipFile(tmp_path / "cvs.zip", "w") as zf:
+        for name, data in FILES.items():
+            zf.writestr(f"cvs/{name}", data)
+    with tarfile.open(tmp_path / "cvs.tar.gz", "w:gz") as tf:
+        for name, data in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+    docs = list(ingest([tmp_path / "cvs.zip", tmp_path / "cvs.tar.gz"], workers=2, max_pending=1))
+
+    names = [d["name"] for d in docs]
+    assert names == [f"cvs.zip:cvs/{n}" for n in FILES] + [f"cvs.tar.gz:{n}" for n in FILES]
+    assert [d["text"] for d in docs] == ["Python Django REST APIs", "Go and Kubernetes", None] * 2
+    assert [bool(d["error"]) for d in docs] == [False, False, True] * 2
+
+
+def test_ingest_glob_size_guard_and_bad_archive(tmp_path):
+    (tmp_path / "a.txt").write_bytes(FILES["a.txt"])
+    (tmp_path / "big.txt").write_bytes(b"x" * 200)
+    (tmp_path / "broken.zip").write_bytes(b"nope")
+
+    docs = list(ingest([str(tmp_path / "*.txt"), tmp_path / "broken.zip"], max_file_bytes=100))
+
+    assert docs[0]["text"] == "Python Django REST APIs"
+    assert "larger than 100 bytes" in docs[1]["error"]
+    assert docs[2]["name"].endswith("broken.zip") and "BadZipFile" in docs[2]["error"]
+
+
+def test_resume_pool_cli_accepts_archives(tmp_path, fake_encoder, capsys):
+    with zipfile.ZipFile(tmp_path / "cvs.zip", "w") as zf:
+        for name, data in FILES.items():
+            zf.writestr(name, data)
+
+    resume_pool_main(["--jd-id", "backend", str(tmp_path / "cvs.zip"), "--top-k", "5"])
+
+    captured = capsys.readouterr()
+    assert "cvs.zip:a.txt" in captured.out and "cvs.zip:b.docx" in captured.out
+    assert "skipped cvs.zip:c.pdf" in captured.err
+
+
+def test_ingest_corrupt_archive_member_is_one_error_row(tmp_path):
+    texts = {"a.txt": b"Python Django " * 50, "b.txt": b"Go Kubernetes " * 50}
+    path = tmp_path / "cvs.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("a.txt", texts["a.txt"])
+        zf.writestr("bad.txt", b"Rust " * 200)
+        zf.writestr("b.txt", texts["b.txt"])
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo("bad.txt")
+    data = bytearray(path.read_bytes())
+    start = info.header_offset + 30 + len(info.filename) + len(info.extra)
+    data[start : start + info.compress_size] = b"\xff" * info.compress_size
+    path.write_bytes(bytes(data))
+
+    docs = list(ingest(path))
+
+    assert [d["name"] for d in docs] == ["cvs.zip:a.txt", "cvs.zip:bad.txt", "cvs.zip:b.txt"]
+    assert docs[0]["text"].startswith("Python Django") and docs[2]["text"].startswith("Go")
+    assert docs[1]["text"] is None and docs[1]["error"]
@@ -0,0 +1,79 @@
+import numpy as np
+
+from src import score_embed
+from src.jd_index import JDIndex
+
+JD = {
+    "id": "backend",
+    "title": "Backend SDE (Django/REST)",
+    "skills": ["python", "django", "docker"],
+    "text": "We build REST APIs in Python and Django. Docker and Linux are a plus.",
+}
+
+
+def _index(root):
+    return JDIndex(
+        root,
+        "fake-model",
+        embed_fn=score_embed._embed_text,
+        encode_fn=score_embed._encode_sentences,
+        split_fn=score_embed._split_sentences,
+    )
+
+
+def test_index_reuses_entry_across_instances(fake_encoder, tmp_path):
+    first = _index(tmp_path)
+    entry = first.get(JD)
+    assert first.builds == 1
+    assert entry.sentence_matrix.shape[0] == len(entry.sentences) == 2
+
+    # a fresh process (new instance) loads the memory-mapped arrays instead of encoding
+    n_encoded = len(fake_encoder.encoded)
+    second = _index(tmp_path)
+    again = second.get(JD)
+    assert second.builds == 0
+    assert len(fake_encoder.encoded) == n_encoded
+    assert isinstance(again.vector, np.memmap)
+    assert np.allclose(again.vector, entry.vector)
+
+
+def test_index_rebuilds_when_text_changes(fake_encoder, tmp_path):
+    idx = _index(tmp_path)
+    idx.get(JD)
+    changed = dict(JD, text="We build data pipelines with pandas.")
+    entry = idx.get(changed)
+    assert idx.builds == 2
+    assert entry.sentences == ["We build data pipelines with pandas."]
+    assert len(list(idx.dir.glob("backend-*.npy"))) == 2  # stale arrays removed
+
+
+def test_compute_embed_scores_encodes_only_resume(fake_encoder):
+    score_embed.compute_embed_scores("Python and Django developer.", JD)
+    fake_encoder.encoded.clear()
+    out = score_embed.compute_embed_scores("Docker on Linux.", JD)
+    assert fake_encoder.encoded == ["docker on linux"]
+    assert out["top_matching_jd_sentences"][0]["sentence"].startswith("Docker")
+
+
+def test_jd_index_is_separate_per_chunking_mode(fake_encoder, monkeypatch):
+    words = score_embed._get_jd_index()
+    words.get(JD)
+
+    monkeypatch.setenv("EMBED_CHUNKING", "tokens")
+    tokens = score_embed._get_jd_index()
+    assert tokens is not words and tokens.dir != words.dir
+    tokens.get(JD)
+    assert tokens.builds == 1  # not served from the word-chunked vectors
+
+
+def test_instances_sharing_a_directory_keep_each_others_entries(fake_encoder, tmp_path):
+    jd_a, jd_b, jd_x = (dict(JD, id=i, text=f"{i} builds APIs.") for i in ("a", "b", "x"))
+    i1, i2 = _index(tmp_path), _index(tmp_path)
+    i1.get(jd_x)
+    i2.get(jd_a)
+    i1.get(jd_b)  # must not drop i2's entry for `a`
+
+    fresh = _index(tmp_path)
+    fresh.build([jd_a, jd_b, jd_x])
+    assert fresh.builds == 0
+    assert len(list(fresh.dir.glob("*.npy"))) == 6  # no orphaned arrays
@@ -0,0 +1,80 @@
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+from src.jd_search import JDSearch, search_terms
+
+JDS = json.loads(Path("data/jds.json").read_text(encoding="utf-8"))
+BACKEND_RESUME = "Built RESTful services with DRF and PSQL, deployed on Amazon Web Services."
+
+
+def _bm25(index, query_terms, k1=1.2, b=0.75):
+    """Reference BM25 straight from the formula over the stored term frequencies."""
+    docs = {jd_id: index._doc_terms[slot] for jd_id, slot in index._slot.items()}
+    n = len(docs)
+    avgdl = sum(sum(t.values()) for t in docs.values()) / n
+    out = {}
+    for jd_id, terms in docs.items():
+        dl, score = sum(terms.values()), 0.0
+        for term in set(query_terms):
+            tf = terms.get(term, 0)
+            if tf:
+                df = sum(1 for t in docs.values() if term in t)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+        if score:
+            out[jd_id] = score
+    return out
+
+
+def test_search_terms_are_alias_aware():
+    terms = search_terms(BACKEND_RESUME)
+    assert {"skill:django", "skill:postgres", "skill:aws", "skill:rest"} <= set(terms)
+    assert "skill:pytorch" in search_terms("", ["PyTorch"])
+    # listed skills go through the alias map too, so they meet the resume's terms
+    assert {"skill:postgres", "skill:rest"} <= set(search_terms("", ["PostgreSQL", "REST APIs"]))
+
+
+def test_jd_search_matches_reference_bm25_and_ranks_backend_first():
+    index = JDSearch(JDS)
+    hits = index.search(BACKEND_RESUME, k=3)
+
+    assert hits[0][0] == "backend"
+    expected = _bm25(index, search_terms(BACKEND_RESUME))
+    assert {jd_id: pytest.approx(score, rel=1e-5) for jd_id, score in hits} == expected
+    assert [jd["id"] for jd in index.candidates(BACKEND_RESUME, k=1)] == ["backend"]
+    assert index.get("frontend")["id"] == "frontend"
+
+
+def test_jd_search_add_remove_and_persistence(tmp_path):
+    index = JDSearch(JDS)
+    extra = {"id": "devops", "title": "DevOps", "skills": ["docker", "aws"], "text": "Docker AWS."}
+    index.add(extra)
+    assert len(index) == 4 and "devops" in index
+
+    assert index.remove("backend") and not index.remove("backend")
+    ids = [jd_id for jd_id, _ in index.search(BACKEND_RESUME, k=10)]
+    assert "backend" not in ids and "devops" in ids
+    assert dict(index.search(BACKEND_RESUME, k=10)) == pytest.approx(
+        _bm25(index, search_terms(BACKEND_RESUME))
+    )
+
+    index.save(tmp_path / "jd_search.json")
+    loaded = JDSearch.load(tmp_path / "jd_search.json")
+    assert loaded.search(BACKEND_RESUME, k=10) == pytest.approx(index.search(BACKEND_RESUME, k=10))
+    assert loaded.get("devops") == extra and loaded.get("backend") is None
+
+
+def test_jd_search_reuses_removed_slots():
+    index = JDSearch(JDS)
+    extra = {"id": "devops", "title": "DevOps", "skills": ["docker", "aws"], "text": "Docker AWS."}
+    for _ in range(5):
+        index.add(extra)
+        assert index.remove("devops")
+    index.add(extra)
+    assert len(index._ids) == len(JDS) + 1
+    assert dict(index.search(BACKEND_RESUME, k=10)) == pytest.approx(
+        _bm25(index, search_terms(BACKEND_RESUME))
+    )
@@ -0,0 +1,36 @@
+import json
+
+from src.genai.jsonstream import JSONObjectScanner, extract_json_object
+
+PAYLOAD = {
+    "suggestions": [
+        {"type": "add_bullet", "proposed": 'Built {REST} APIs, "fast"', "meta": {"k": [1, 2]}},
+        {"type": "summary_tweak", "proposed": "Backend engineer \\ Python"},
+    ],
+    "notes": ["n {1}"],
+    "guardrails": [],
+}
+
+
+def test_scanner_yields_items_as_they_close_and_stops_at_object_end():
+    text = "Sure! ```json\n" + json.dumps(PAYLOAD) + "\n``` trailing {junk}"
+    scanner = JSONObjectScanner()
+    seen = []
+    for i in range(0, len(text), 3):  # token-sized chunks
+        seen.extend(scanner.feed(text[i : i + 3]))
+        if scanner.done:
+            break
+    assert seen == PAYLOAD["suggestions"]
+    assert scanner.result() == PAYLOAD
+    assert i < len(text) - len("\n``` trailing {junk}") + 3
+
+
+def test_scanner_ignores_arrays_under_other_keys():
+    scanner = JSONObjectScanner()
+    assert scanner.feed(json.dumps({"notes": [{"a": 1}], "suggestions": []})) == []
+    assert scanner.done
+
+
+def test_extract_json_object_skips_unparseable_braces():
+    assert extract_json_object("see {placeholder} then " + json.dumps(PAYLOAD)) == PAYLOAD
+    assert extract_json_object("no json here") is None
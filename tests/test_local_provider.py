@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.genai import local_provider
+from src.genai.local_provider import LocalProvider
+
+PAYLOAD = {
+    "suggestions": [
+        {
+            "type": "add_bullet",
+            "target_section": "experience",
+            "proposed": "Built Django REST APIs.",
+            "rationale": "JD asks for REST.",
+            "needs_evidence": False,
+        }
+    ],
+    "notes": ["ok"],
+    "guardrails": [],
+}
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        srv = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        srv.requests += 1
+        if body.get("stream"):
+            return self._stream()
+        srv.clients.add(self.client_address)
+        if srv.fail_next > 0:
+            srv.fail_next -= 1
+            status, body = 503, b"{}"
+        else:
+            status, body = 200, json.dumps({"response": json.dumps(PAYLOAD)}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self):
+        # NDJSON tokens: the JSON object, then a long tail the client should never wait for
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        text = json.dumps(PAYLOAD) + " and some commentary" * 20
+        try:
+            for i in range(0, len(text), 4):
+                token = text[i : i + 4]
+                self.wfile.write((json.dumps({"response": token, "done": False}) + "\n").encode())
+                self.wfile.flush()
+                if i > len(json.dumps(PAYLOAD)):
+                    time.sleep(0.05)
+            self.wfile.write(b'{"response": "", "done": true}\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client hung up once it had the object
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+    srv.daemon_threads = True
+    srv.requests, srv.clients, srv.fail_next = 0, set(), 0
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setenv("GENAI_LOCAL_URL", f"http://127.0.0.1:{srv.server_address[1]}/api/generate")
+    monkeypatch.setattr(local_provider, "_SESSIONS", {})
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_local_provider_reuses_one_connection(ollama):
+    for _ in range(3):
+        assert LocalProvider(stream=False).generate_json("sys", "user") == PAYLOAD
+    assert ollama.requests == 3
+    assert len(ollama.clients) == 1
+
+
+def test_local_provider_retries_5xx_then_succeeds(ollama):
+    ollama.fail_next = 2
+    provider = LocalProvider(retries=2, backoff=0.01, stream=False)
+    assert provider.generate_json("sys", "user") == PAYLOAD
+    assert ollama.requests == 3
+
+
+def test_local_provider_gives_up_after_bounded_retries(ollama):
+    ollama.fail_next = 5
+    with pytest.raises(requests.HTTPError):
+        LocalProvider(retries=1, backoff=0.01, stream=False).generate_json("sys", "user")
+    assert ollama.requests == 2
+
+
+def test_local_provider_retries_connection_errors(monkeypatch):
+    monkeypatch.setattr(local_provider, "_SESSIONS", {})
+    monkeypatch.setenv("GENAI_LOCAL_URL", "http://127.0.0.1:9/api/generate")
+    provider = LocalProvider(retries=2, backoff=0.01, connect_timeout=0.5)
+    calls = []
+    real_post = provider.session.post
+    monkeypatch.setattr(
+        provider.session, "post", lambda *a, **k: calls.append(k["timeout"]) or real_post(*a, **k)
+    )
+    with pytest.raises(requests.ConnectionError):
+        provider.generate_json("sys", "user")
+    assert calls == [(0.5, provider.read_timeout)] * 3
+
+
+def test_local_provider_streams_and_stops_at_object_end(ollama):
+    t0 = time.perf_counter()
+    events = list(LocalProvider().stream_json("sys", "user"))
+    elapsed = time.perf_counter() - t0
+
+    assert events == [("suggestion", PAYLOAD["suggestions"][0]), ("result", PAYLOAD)]
+    assert elapsed < 1.0  # the ~4s commentary tail is never read
+
+
+def test_local_provider_generate_json_streams_by_default(ollama):
+    assert LocalProvider().generate_json("sys", "user") == PAYLOAD
+
+
+def test_stream_improvements_yields_enriched_suggestions(ollama, fake_encoder):
+    from src.genai.suggest import stream_improvements
+
+    jd = {"id": "b", "title": "Backend", "skills": ["python", "django"], "text": "Django REST."}
+    events = list(stream_improvements("Python developer.", jd, LocalProvider()))
+
+    kinds = [k for k, _ in events]
+    assert kinds == ["suggestion", "result"]
+    assert "est_lift" in events[0][1]
+    assert events[1][1]["suggestions"] == [events[0][1]]
+    assert events[1][1]["notes"] == ["ok"]
+
+
+def test_stream_improvements_respects_stream_off(ollama, fake_encoder, monkeypatch):
+    from src.genai.suggest import stream_improvements
+
+    provider = LocalProvider(stream=False)
+
+    def no_stream(*args, **kwargs):
+        raise AssertionError("stream_json used with stream=False")
+
+    monkeypatch.setattr(provider, "stream_json", no_stream)
+    jd = {"id": "b", "title": "Backend", "skills": ["python", "django"], "text": "Django REST."}
+    events = list(stream_improvements("Python developer.", jd, provider))
+
+    assert [k for k, _ in events] == ["suggestion", "result"]
+    assert events[1][1]["notes"] == ["ok"]
@@ -0,0 +1,33 @@
+import json
+
+from src.score_embed import _get_jd_index, compute_embed_scores, rank_jds
+
+RESUME = (
+    "Backend engineer building REST APIs with Python, Django and PostgreSQL. "
+    "Containerized services with Docker on Linux; Git workflows."
+)
+
+
+def test_rank_jds_matches_pairwise_scores(fake_encoder):
+    jds = json.load(open("data/jds.json"))
+    ranked = rank_jds(RESUME, jds, top_k=len(jds))
+
+    assert [r["jd_id"] for r in ranked][0] == "backend"
+    scores = [r["overall_score"] for r in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+    by_id = {jd["id"]: jd for jd in jds}
+    for r in ranked:
+        single = compute_embed_scores(RESUME, by_id[r["jd_id"]])
+        assert r["overall_score"] == single["overall_score"]
+        assert r["matched_skills"] == single["matched_skills"]
+        assert r["missing_skills"] == single["missing_skills"]
+
+
+def test_rank_jds_embeds_resume_once(fake_encoder):
+    jds = json.load(open("data/jds.json"))
+    _get_jd_index().build(jds)  # warm the JD index
+    fake_encoder.encoded.clear()
+    top = rank_jds(RESUME, jds, top_k=2)
+    assert len(top) == 2
+    assert len(fake_encoder.encoded) == 1
@@ -0,0 +1,70 @@
+import time
+
+from src.genai.llm import MockProvider
+from src.genai.response_cache import ResponseCache, get_response_cache, response_key
+from src.genai.suggest import generate_improvements
+
+JD = {
+    "id": "backend",
+    "title": "Backend SDE (Django/REST)",
+    "skills": ["python", "django", "docker", "aws"],
+    "text": "We build RESTful APIs using Python and Django. Docker and AWS preferred.",
+}
+RESUME = "Backend engineer with Python and Django. Built APIs; familiar with Git."
+
+
+class CountingProvider(MockProvider):
+    model = "mock-1"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_json(self, system, user, **kwargs):
+        self.calls += 1
+        return super().generate_json(system, user, **kwargs)
+
+
+def test_response_key_covers_provider_model_temperature_and_prompts():
+    p = CountingProvider()
+    base = response_key(p, "sys", "user", 0.2)
+    assert base == response_key(CountingProvider(), "sys", "user", 0.2)
+    assert base != response_key(MockProvider(), "sys", "user", 0.2)
+    assert base != response_key(p, "sys", "user", 0.7)
+    assert base != response_key(p, "sys2", "user", 0.2)
+    assert base != response_key(p, "sys", "user2", 0.2)
+
+
+def test_response_cache_ttl_and_size_bound(tmp_path):
+    cache = ResponseCache(tmp_path / "r.sqlite", ttl_seconds=60, max_entries=2)
+    for k in "abc":
+        cache.put(k, {"k": k})
+        time.sleep(0.01)
+    assert cache.get("a") is None  # evicted (least recently used)
+    assert cache.get("c") == {"k": "c"}
+    assert cache.stats()["entries"] == 2
+
+    cache.ttl = 0.0
+    assert cache.get("b") is None  # expired
+    assert cache.stats()["entries"] == 1
+
+
+def test_generate_improvements_hit_skips_provider(fake_encoder):
+    provider = CountingProvider()
+    first = generate_improvements(RESUME, JD, provider)
+    second = generate_improvements(RESUME, JD, provider)
+
+    assert provider.calls == 1
+    assert second["suggestions"] == first["suggestions"]
+    assert all("est_lift" in s for s in second["suggestions"])
+    assert get_response_cache().stats()["hits"] == 1
+
+    generate_improvements(RESUME + " Also Docker.", JD, provider)
+    assert provider.calls == 2
+
+
+def test_response_cache_can_be_disabled(fake_encoder, monkeypatch):
+    monkeypatch.setenv("GENAI_CACHE", "0")
+    provider = CountingProvider()
+    generate_improvements(RESUME, JD, provider)
+    generate_improvements(RESUME, JD, provider)
+    assert provider.calls == 2
@@ -0,0 +1,31 @@
+import json
+
+from src.resume_pool import rank_resume_pool
+from src.score_embed import compute_embed_scores
+
+
+def test_pool_top_k_matches_pairwise_scoring(fake_encoder, tmp_path):
+    jd = json.load(open("data/jds.json"))[0]
+    pool = [
+        "Python Django REST APIs, PostgreSQL, Docker, Linux, Git, AWS.",
+        "Graphic designer with Photoshop and Illustrator.",
+        "Backend developer: Django, SQL, Git.",
+        "",
+    ]
+    sample = tmp_path / "resume.txt"
+    sample.write_text("Built REST APIs in Django on Linux with Docker.", encoding="utf-8")
+    pool.append(sample)
+
+    out = rank_resume_pool(pool, jd, top_k=3, batch_size=2, block_size=2)
+    results = out["results"]
+
+    assert out["stats"]["n_resumes"] == 5
+    assert out["stats"]["resumes_per_sec"] > 0
+    assert len(results) == 3
+    assert results[0]["resume_index"] == 0
+    assert "Graphic" not in " ".join(r["resume_text_preview"] for r in results)
+    assert any(r["resume_name"].endswith("resume.txt") for r in results)
+
+    for r in results:
+        text = r["resume_text_preview"]
+        assert abs(r["overall_score"] - compute_embed_scores(text, jd)["overall_score"]) < 0.02
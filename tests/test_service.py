@@ -0,0 +1,135 @@
+import json
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.batching import MicroBatcher
+from src.service import ScoringService, make_server
+
+
+def test_micro_batcher_coalesces_concurrent_submits():
+    sizes = []
+
+    def fn(items):
+        sizes.append(len(items))
+        return [x * 2 for x in items]
+
+    batcher = MicroBatcher(fn, max_batch=8, max_wait_ms=50)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(batcher, range(16)))
+    batcher.close()
+
+    assert results == [x * 2 for x in range(16)]
+    assert sum(sizes) == 16 and len(sizes) < 16 and max(sizes) <= 8
+
+
+def test_micro_batcher_propagates_errors():
+    def fn(items):
+        raise RuntimeError("encoder down")
+
+    batcher = MicroBatcher(fn, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher("x", timeout=5)
+    batcher.close()
+
+
+def test_micro_batcher_fails_every_future_on_short_results():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch=4, max_wait_ms=50)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(batcher, i, 5) for i in range(4)]
+        errors = [f.exception(timeout=10) for f in futures]
+    batcher.close()
+    assert all(isinstance(e, ValueError) and "results for" in str(e) for e in errors)
+
+
+@pytest.fixture
+def server(fake_encoder):
+    service = ScoringService(json.load(open("data/jds.json")), max_wait_ms=20)
+    srv = make_server(service, port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}", service
+    srv.shutdown()
+    srv.server_close()
+    service.close()
+
+
+def _post(url, body):
+    req = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=10) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_match_and_rank_endpoints_return_wrapped_results(server):
+    base, service = server
+    resume = "Python Django REST APIs with PostgreSQL and Docker on Linux."
+
+    status, payload = _post(f"{base}/match", {"resume_text": resume, "jd_id": "backend"})
+    assert status == 200
+    assert payload["schema_version"] == "1.0.0" and payload["jd"]["id"] == "backend"
+    assert payload["backend"] == "embeddings:minilm-l6-v2"
+
+    status, ranked = _post(f"{base}/rank", {"resume_text": resume, "top_k": 2})
+    assert status == 200 and len(ranked["results"]) == 2
+    assert ranked["results"][0]["jd"]["title"]
+
+    status, err = _post(f"{base}/match", {"resume_text": resume, "jd_id": "nope"})
+    assert status == 400 and "Unknown jd_id" in err["error"]
+
+
+def test_concurrent_matches_share_encoder_batches(server):
+    base, service = server
+    bodies = [
+        {"resume_text": f"Engineer number {i} with Git.", "jd_id": "frontend"} for i in range(8)
+    ]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = [s for s, _ in pool.map(lambda b: _post(f"{base}/match", b), bodies)]
+    assert statuses == [200] * 8
+    stats = service.batcher.stats()
+    assert stats["items"] == 8 and stats["batches"] < 8
+
+
+def test_rank_endpoint_cascade_mode_reports_stats(server):
+    base, _ = server
+    body = {"resume_text": "Python Django REST APIs with PostgreSQL.", "top_k": 1}
+    status, ranked = _post(f"{base}/rank", dict(body, mode="cascade", keep_top=1, compare=True))
+
+    assert status == 200 and len(ranked["results"]) == 1
+    assert ranked["results"][0]["backend"] == "cascade:stub+minilm-l6-v2"
+    assert ranked["stats"]["jds_reranked"] == 1 and ranked["stats"]["jds_skipped"] == 2
+    assert "overlap_at_k" in ranked["stats"]
+
+
+def test_only_request_errors_map_to_400(server, monkeypatch):
+    base, service = server
+    body = {"resume_text": "Python Django REST APIs.", "top_k": "many"}
+    status, err = _post(f"{base}/rank", body)
+    assert status == 400 and "top_k" in err["error"]
+    status, err = _post(
+        f"{base}/rank", dict(body, top_k=1, mode="cascade", keep_top=1, keep_fraction=0.5)
+    )
+    assert status == 400 and "not both" in err["error"]
+
+    def broken(body):
+        raise ValueError("shapes (3,) and (4,) not aligned")
+
+    monkeypatch.setattr(service, "match", broken)
+    status, err = _post(f"{base}/match", {"resume_text": "x", "jd_id": "backend"})
+    assert status == 500 and err["error"].startswith("ValueError:")
+
+
+def test_improve_endpoint_uses_result_envelope(server, monkeypatch):
+    monkeypatch.setenv("GENAI_PROVIDER", "mock")
+    base, _ = server
+    body = {"resume_text": "Summary:\nPython developer with Django.", "jd_id": "backend"}
+    status, payload = _post(f"{base}/improve", body)
+
+    assert status == 200 and payload["schema_version"] == "1.0.0"
+    assert payload["backend"] == "genai:MockProvider" and payload["jd"]["id"] == "backend"
+    assert payload["improvements"]["suggestions"] and "gap_report" in payload["improvements"]
@@ -40,3 +40,29 @@ def test_aws_phrase():
     jd_skills = ["aws"]
     resume = "Deployed on Amazon Web Services with EC2."
     assert find_skills(resume, jd_skills, ALIASES) == ["aws"]
+
+
+def test_skills_starting_at_same_position_are_all_found():
+    aliases = dict(ALIASES, amazon=["Amazon"], django=["Django REST Framework"])
+    resume = "Shipped on Amazon Web Services using Django REST Framework."
+    assert find_skills(resume, ["aws", "amazon", "django", "rest"], aliases) == [
+        "aws",
+        "amazon",
+        "django",
+        "rest",
+    ]
+
+
+def test_matcher_is_compiled_once_and_matches_per_pattern_search():
+    from skills import _compile_patterns, get_skill_matcher
+
+    jd_skills = ["python", "git", "react", "postgres", "c++", "aws"]
+    assert get_skill_matcher(jd_skills, ALIASES) is get_skill_matcher(jd_skills, ALIASES)
+
+    resume = "Python dev; GitHub, React.js, PSQL; some C++; Amazon Web Services. digital"
+    expected = [
+        s
+        for s in jd_skills
+        if any(p.search(resume) for p in _compile_patterns(s, ALIASES.get(s, [])))
+    ]
+    assert find_skills(resume, jd_skills, ALIASES) == expected
@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.score_stub import _jaccard, _tokenize, compute_stub_scores
+from src.stub_matrix import StubMatrix
+
+JDS = json.loads(Path("data/jds.json").read_text(encoding="utf-8")) + [
+    {"id": "empty", "title": "Empty", "skills": [], "text": ""},
+    {"id": "odd", "title": "Odd", "skills": ["Rust", "rust", "COBOL"], "text": "Rust! Rust? go."},
+]
+RESUMES = [p.read_text(encoding="utf-8") for p in sorted(Path("examples").glob("*.txt"))] + [
+    "Python developer skilled in Django and REST APIs. Experience with SQL, Docker, Git.",
+    "",
+    "the and of",  # only stopwords
+    "Rust and COBOL, plus machine learning with PyTorch and pandas.",
+]
+
+
+def test_stub_matrix_scores_match_per_pair_backend():
+    got = StubMatrix(JDS, block_size=2).score(RESUMES, top_n=3)
+
+    assert len(got) == len(RESUMES) and all(len(row) == len(JDS) for row in got)
+    for resume, row in zip(RESUMES, got):
+        for jd, result in zip(JDS, row):
+            assert result == compute_stub_scores(resume, jd, top_n=3)
+
+
+def test_stub_matrix_overall_matches_scores():
+    matrix = StubMatrix(JDS)
+    expected = [[r["overall_score"] for r in row] for row in matrix.score(RESUMES, top_n=0)]
+    coverage = [[r["skills_coverage"] for r in row] for row in matrix.score(RESUMES, top_n=0)]
+    assert np.allclose(matrix.overall(RESUMES), expected, atol=0.005)
+    assert np.allclose(matrix.coverage(RESUMES), coverage, atol=5e-5)
+
+
+def test_stub_matrix_jaccard_and_sentences():
+    sm = StubMatrix(JDS)
+    jac = sm.jaccard(RESUMES)
+    expected = [[_jaccard(_tokenize(r), _tokenize(jd["text"])) for jd in JDS] for r in RESUMES]
+    assert np.array_equal(jac, np.array(expected))
+
+    sent = sm.sentence_jaccard(RESUMES[:1])
+    assert sent.shape == (1, len(sm.sentences)) and sm.sentence_offsets[-1] == len(sm.sentences)
+    assert sent[0, 0] == _jaccard(_tokenize(RESUMES[0]), _tokenize(sm.sentences[0]))
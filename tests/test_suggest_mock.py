@@ -20,3 +20,102 @@ def test_generate_improvements_mock_provider(monkeypatch):
     # Each suggestion should carry an est_lift delta added by orchestrator
     assert "est_lift" in item
     assert set(["semantic", "skills"]).issubset(item["est_lift"].keys())
+
+
+def test_agenerate_improvements_fans_out_concurrently(fake_encoder):
+    import asyncio
+    import time
+
+    from src.genai.llm import MockProvider
+    from src.genai.suggest import agenerate_improvements
+
+    class SlowProvider(MockProvider):
+        async def agenerate_json(self, system, user, **kwargs):
+            await asyncio.sleep(0.3)
+            return self.generate_json(system, user)
+
+    jd = {
+        "id": "backend",
+        "title": "Backend SDE (Django/REST)",
+        "skills": ["python", "django", "docker", "aws"],
+        "text": "We build RESTful APIs using Python and Django. Docker and AWS preferred.",
+    }
+    resumes = [f"Backend engineer {i} with Python and Django." for i in range(5)]
+
+    async def run_all():
+        provider = SlowProvider()
+        return await asyncio.gather(*(agenerate_improvements(r, jd, provider) for r in resumes))
+
+    t0 = time.perf_counter()
+    outs = asyncio.run(run_all())
+    assert time.perf_counter() - t0 < 1.2  # five 0.3 s LLM calls overlap
+    assert all(len(o["suggestions"]) == 2 for o in outs)
+    assert "est_lift" in outs[0]["suggestions"][0]
+    assert "aws" in outs[0]["gap_report"]["missing_skills"]
+
+
+class _CountingMock:
+    """MockProvider that records every prompt it sees."""
+
+    def __init__(self, drop_keys=()):
+        from src.genai.llm import MockProvider
+
+        self.inner = MockProvider()
+        self.drop_keys = set(drop_keys)
+        self.prompts = []
+
+    def generate_json(self, system, user, **kwargs):
+        self.prompts.append(user)
+        out = self.inner.generate_json(system, user, **kwargs)
+        if "pairs" in out:
+            for key in self.drop_keys:
+                out["pairs"][key] = {"suggestions": "not a list"}
+        return out
+
+
+def _pairs(n):
+    jd = {"id": "b", "title": "Backend", "skills": ["python", "django"], "text": "Django REST."}
+    return [(f"Summary:\nPython developer {i}.", jd) for i in range(n)]
+
+
+def test_batch_prompt_sends_schema_once_and_mock_answers_by_key():
+    from src.genai.analyzer import build_gap_report
+    from src.genai.llm import MockProvider
+    from src.genai.suggest import _format_batch_prompt, _validate_batch_response
+
+    ctx = [(r, jd, build_gap_report(r, jd)) for r, jd in _pairs(3)]
+    prompt = _format_batch_prompt(["p1", "p2", "p3"], ctx)
+    assert prompt.count("=== PAIR ") == 3 and prompt.count("CONSTRAINTS:") == 1
+    assert prompt.count('"needs_evidence": true | false') == 1
+
+    split = _validate_batch_response(MockProvider().generate_json("s", prompt), ["p1", "p2", "p3"])
+    assert sorted(split) == ["p1", "p2", "p3"]
+    # a pair whose suggestions are all rejected by _clean_suggestion is re-requested
+    payload = {"pairs": {k: dict(v) for k, v in split.items()}}
+    payload["pairs"]["p2"]["suggestions"] = [{"type": "bogus"}, "not a dict"]
+    assert set(_validate_batch_response(payload, ["p1", "p2", "p3"])) == {"p1", "p3"}
+
+
+def test_generate_improvements_batch_packs_pairs(fake_encoder):
+    from src.genai.suggest import generate_improvements_batch
+
+    provider = _CountingMock()
+    out = generate_improvements_batch(_pairs(5), provider, pairs_per_call=4)
+    assert len(provider.prompts) == 2
+    assert len(out) == 5
+    assert all(o["suggestions"] and "est_lift" in o["suggestions"][0] for o in out)
+    assert all(o["prompt_tokens"] > 0 for o in out)
+
+
+def test_malformed_pairs_fall_back_to_single_calls(fake_encoder):
+    from src.genai.suggest import generate_improvements_batch
+
+    provider = _CountingMock(drop_keys=["p2"])
+    out = generate_improvements_batch(_pairs(3), provider, pairs_per_call=3)
+    assert len(provider.prompts) == 2  # one batch call + one retry for p2
+    assert "=== PAIR" not in provider.prompts[1] and "developer 1." in provider.prompts[1]
+    assert all(o["suggestions"] for o in out)
+
+    # every pair is now cached under its single-pair prompt
+    generate_improvements_batch(_pairs(3), provider, pairs_per_call=3)
+    assert len(provider.prompts) == 2
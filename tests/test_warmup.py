@@ -0,0 +1,48 @@
+import threading
+
+from src import score_embed
+
+
+def test_background_warm_up_loads_model_and_builds_jd_index(fake_encoder, monkeypatch):
+    monkeypatch.setattr(score_embed, "_READY", threading.Event())
+    monkeypatch.setattr(score_embed, "_WARMUP_THREAD", None)
+    assert score_embed.readiness()["ready"] is False
+
+    t = score_embed.warm_up("data/jds.json", background=True)
+    t.join(timeout=30)
+
+    assert score_embed.is_ready()
+    assert score_embed.readiness() == {
+        "ready": True,
+        "warming_up": False,
+        "backend": "torch",
+        "error": None,
+    }
+    assert "warm-up" in fake_encoder.encoded
+    assert score_embed._get_jd_index().builds == 3
+    assert score_embed.warm_up("data/jds.json", background=True) is None  # idempotent
+
+
+def test_failed_warm_up_is_reported(monkeypatch):
+    def boom():
+        raise OSError("no model")
+
+    monkeypatch.setattr(score_embed, "_READY", threading.Event())
+    monkeypatch.setattr(score_embed, "_WARMUP_ERROR", None)
+    monkeypatch.setattr(score_embed, "_get_model", boom)
+    score_embed.warm_up()
+    state = score_embed.readiness()
+    assert state["ready"] is False and "no model" in state["error"]
+
+
+def test_model_loaded_after_failed_warm_up_reports_ready(monkeypatch):
+    encoder = object()
+    monkeypatch.setattr(score_embed, "_READY", threading.Event())
+    monkeypatch.setattr(score_embed, "_WARMUP_ERROR", "OSError: no model")
+    monkeypatch.setattr(score_embed, "_MODEL", None)
+    monkeypatch.setattr(score_embed, "_MODEL_BACKEND", None)
+    monkeypatch.setattr(score_embed, "load_encoder", lambda backend, name: encoder)
+
+    assert score_embed._get_model() is encoder  # e.g. the first request after the failure
+    state = score_embed.readiness()
+    assert state["ready"] is True and state["error"] is None